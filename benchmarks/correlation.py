@@ -0,0 +1,51 @@
+"""Compare the correlation of a spectrum with a line model against `np.correlate`.
+
+The spectra are about as long as the FS sweeps, and the models are as long
+as the model signal resampled onto the sweep mesh gets.
+"""
+
+import sys
+from pathlib import Path
+from timeit import timeit
+
+import numpy as np
+from numpy.typing import NDArray
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from psk_viewer.detection import correlate
+
+
+def main() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    for points in (100_000, 1_000_000, 4_000_000):
+        data: NDArray[np.float64] = rng.normal(size=points)
+        for taps in (15, 300, 3000):
+            model: NDArray[np.float64] = np.sin(np.linspace(0.0, 4.0 * np.pi, taps))
+
+            expected: NDArray[np.float64] = np.correlate(data, model, "same")
+            actual: NDArray[np.float64] = correlate(data, model)
+            np.testing.assert_allclose(
+                actual, expected, rtol=0.0, atol=1e-9 * np.max(np.abs(expected))
+            )
+
+            repeat: int = 3
+            legacy_time: float = (
+                timeit(
+                    lambda d=data, m=model: np.correlate(d, m, "same"),
+                    number=repeat,
+                )
+                / repeat
+            )
+            new_time: float = (
+                timeit(lambda d=data, m=model: correlate(d, m), number=repeat) / repeat
+            )
+            print(
+                f"{points:>9} points, {taps:>5} taps: "
+                f"{legacy_time:8.3f} s → {new_time:8.3f} s "
+                f"({legacy_time / new_time:6.1f}× faster)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare the time to import the data readers with and without Qt.
+
+Every import is done in a fresh interpreter, so that nothing is imported beforehand.
+The Qt modules imported along are counted to check the readers stay Qt-free.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+
+SOURCE_DIR: Path = Path(__file__).parents[1] / "src"
+
+PROBE: str = """
+import sys
+from time import perf_counter
+
+start = perf_counter()
+import {module}
+duration = perf_counter() - start
+print(duration, sum(name.split(".")[0] in {qt_packages!r} for name in sys.modules))
+"""
+QT_PACKAGES: frozenset[str] = frozenset(
+    {"qtpy", "qtawesome", "pyqtgraph", "PyQt5", "PyQt6", "PySide2", "PySide6"}
+)
+
+
+def import_time(module: str) -> tuple[float, int]:
+    """Import the module in a fresh interpreter.
+
+    :return: The import time and the number of the Qt modules imported.
+    """
+    output: str = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            PROBE.format(module=module, qt_packages=set(QT_PACKAGES)),
+        ],
+        env={**os.environ, "PYTHONPATH": str(SOURCE_DIR)},
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    duration, qt_modules = output.split()
+    return float(duration), int(qt_modules)
+
+
+def main() -> None:
+    repeat: int = 7
+    for module in (
+        "psk_viewer.data_reader",
+        "psk_viewer.data_reader, psk_viewer.detection",
+        "psk_viewer.utils",
+    ):
+        # the first run warms up the disk cache and compiles the bytecode
+        import_time(module)
+        results: list[tuple[float, int]] = [import_time(module) for _ in range(repeat)]
+        print(
+            f"{module:<45}: {median(duration for duration, _ in results):6.3f} s, "
+            f"{results[0][1]:>3} Qt modules imported"
+        )
+
+
+if __name__ == "__main__":
+    main()
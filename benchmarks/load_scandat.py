@@ -0,0 +1,209 @@
+"""Compare the `.scandat` parser against the former line-by-line one.
+
+Files of every header variant are generated in a temporary directory,
+parsed with both implementations, and the results are checked to match.
+"""
+
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from timeit import timeit
+
+import numpy as np
+from numpy.typing import NDArray
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "src"))
+
+from psk_viewer.data_reader import load_data_scandat
+
+
+def legacy_load_data_scandat(
+    filename: Path,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], float]:
+    def value_after(key: str) -> float:
+        return float(
+            lines[
+                lines.index(next(filter(lambda line: line.startswith(key), lines))) + 1
+            ]
+        )
+
+    with open(filename) as f_in:
+        lines: list[str] = f_in.readlines()
+
+    if lines[0].startswith("*****"):
+        min_frequency = value_after("F(start) [MHz]:") * 1e3
+        frequency_step = value_after("F(stept) [MHz]:") * 1e3
+        frequency_jump = value_after("F(jump) [MHz]:") * 1e3
+        bias_offset = value_after("U - shift:")
+        cell_length = value_after("Length of Cell:")
+        lines = lines[
+            lines.index(next(filter(lambda line: line.startswith("Finish"), lines)))
+            + 1 : -2
+        ]
+        y = np.array([float(line.split()[0]) for line in lines]) * 1e-3
+        bias = np.array([bias_offset - float(line.split()[1]) for line in lines])
+    elif lines[0].startswith("   Spectrometer(PhSw)-2014   "):
+        min_frequency = float(lines[14]) * 1e3
+        frequency_step = float(lines[16]) * 1e3
+        frequency_jump = float(lines[2]) * 1e3
+        cell_length = float(lines[25])
+        bias_offset = float(lines[26])
+        lines = lines[32:]
+        if lines[-1] == "0":
+            lines = lines[:-2]
+        y = np.array([float(line) for line in lines[::2]]) * 1e-3
+        bias = np.array([bias_offset - float(line) for line in lines[1::2]])
+    elif lines[0].startswith("   Spectrometer(PhSw)   "):
+        min_frequency = float(lines[12]) * 1e3
+        frequency_step = float(lines[14]) * 1e3
+        frequency_jump = float(lines[2]) * 1e3
+        cell_length = float(lines[23])
+        bias_offset = float(lines[24])
+        lines = lines[30:]
+        if lines[-1].split()[-1] == "0":
+            lines = lines[:-1]
+        y = np.array([float(line.split()[0]) for line in lines]) * 1e-3
+        bias = np.array([bias_offset - float(line.split()[1]) for line in lines])
+    else:
+        min_frequency = float(lines[13]) * 1e3
+        frequency_step = float(lines[15]) * 1e3
+        frequency_jump = float(lines[2]) * 1e3
+        cell_length = float(lines[24])
+        bias_offset = float(lines[25])
+        lines = lines[31:]
+        y = np.array([float(line) for line in lines[::2]]) * 1e-3
+        bias = np.array([bias_offset - float(line) for line in lines[1::2]])
+    x = np.arange(y.size, dtype=float) * frequency_step + min_frequency
+    return x, y, y / bias / cell_length / 5.0, frequency_jump
+
+
+def header_lines(count: int, values: dict[int, str]) -> list[str]:
+    return [values.get(index, f"parameter {index}") for index in range(count)]
+
+
+def write_stars(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    with open(filename, "w") as f_out:
+        f_out.write("*****\n")
+        f_out.writelines(
+            f"{key}\n{value}\n"
+            for key, value in (
+                ("F(start) [MHz]:", "118000.0"),
+                ("F(stept) [MHz]:", "0.01"),
+                ("F(jump) [MHz]:", "0.6"),
+                ("U - shift:", "2.5"),
+                ("Length of Cell:", "100"),
+            )
+        )
+        f_out.write("Finish\n")
+        f_out.writelines(f"{a:.6f}\t{b:.6f}\n" for a, b in zip(y, bias, strict=True))
+        f_out.write("End\n0\n")
+
+
+def write_2014(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    lines: list[str] = header_lines(
+        32,
+        {
+            0: "   Spectrometer(PhSw)-2014   ",
+            2: "0.6",
+            14: "118000.0",
+            16: "0.01",
+            25: "100",
+            26: "2.5",
+        },
+    )
+    for a, b in zip(y, bias, strict=True):
+        lines.extend((f"{a:.6f}", f"{b:.6f}"))
+    lines.extend(("1.0", "0"))
+    filename.write_text("\n".join(lines))
+
+
+def write_phsw(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    lines: list[str] = header_lines(
+        30,
+        {
+            0: "   Spectrometer(PhSw)   ",
+            2: "0.6",
+            12: "118000.0",
+            14: "0.01",
+            23: "100",
+            24: "2.5",
+        },
+    )
+    lines.extend(f"{a:.6f} {b:.6f}" for a, b in zip(y, bias, strict=True))
+    lines.append("1.0 0")
+    filename.write_text("\n".join(lines) + "\n")
+
+
+def write_legacy(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    lines: list[str] = header_lines(
+        31,
+        {
+            0: "   Spectrometer   ",
+            2: "0.6",
+            13: "118000.0",
+            15: "0.01",
+            24: "100",
+            25: "2.5",
+        },
+    )
+    for a, b in zip(y, bias, strict=True):
+        lines.extend((f"{a:.6f}", f"{b:.6f}"))
+    filename.write_text("\n".join(lines) + "\n")
+
+
+def main() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    writers: dict[
+        str, Callable[[Path, NDArray[np.float64], NDArray[np.float64]], None]
+    ] = {
+        "*****": write_stars,
+        "Spectrometer(PhSw)-2014": write_2014,
+        "Spectrometer(PhSw)": write_phsw,
+        "legacy": write_legacy,
+    }
+    with TemporaryDirectory() as temp_dir:
+        for points in (10_000, 1_000_000, 4_000_000):
+            y: NDArray[np.float64] = rng.normal(size=points) * 100.0
+            bias: NDArray[np.float64] = rng.uniform(0.5, 1.5, size=points)
+            for variant, writer in writers.items():
+                filename: Path = Path(temp_dir) / "scan.scandat"
+                writer(filename, y, bias)
+
+                expected = legacy_load_data_scandat(filename)
+                actual = load_data_scandat(filename)
+                for a, b in zip(
+                    (actual.frequency, actual.voltage, actual.absorption, actual.jump),
+                    expected,
+                    strict=True,
+                ):
+                    np.testing.assert_array_equal(a, b)
+
+                repeat: int = 3
+                legacy_time: float = (
+                    timeit(
+                        lambda f=filename: legacy_load_data_scandat(f), number=repeat
+                    )
+                    / repeat
+                )
+                new_time: float = (
+                    timeit(lambda f=filename: load_data_scandat(f), number=repeat)
+                    / repeat
+                )
+                print(
+                    f"{variant:>24} {points:>9} points: "
+                    f"{legacy_time:8.3f} s → {new_time:8.3f} s "
+                    f"({legacy_time / new_time:4.1f}× faster)"
+                )
+
+
+if __name__ == "__main__":
+    main()
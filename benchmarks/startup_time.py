@@ -0,0 +1,118 @@
+"""Measure the time from the interpreter start to the first window shown.
+
+The application is started in fresh interpreters the way `psk_viewer.main` does it,
+with `-X importtime` on to list the imports that take the most time.
+The settings are only read, for the window is never closed.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+SOURCE_DIR: Path = Path(__file__).parents[1] / "src"
+
+PROBE: str = """
+import os
+import sys
+from time import perf_counter
+
+start = perf_counter()
+
+from qtpy.QtWidgets import QApplication
+
+from psk_viewer import _make_old_qt_compatible_again
+
+app = QApplication(sys.argv)
+_make_old_qt_compatible_again()
+
+from psk_viewer.window import FrequencyDomainWindow, Window
+
+imported = perf_counter()
+window = Window(None)
+if isinstance(window, FrequencyDomainWindow):
+    window.load_catalog()
+constructed = perf_counter()
+window.show()
+app.processEvents()
+shown = perf_counter()
+print(imported - start, constructed - imported, shown - constructed, flush=True)
+# skip the teardown
+os._exit(0)
+"""
+
+IMPORT_TIME_LINE: re.Pattern[str] = re.compile(
+    r"import time:\s*(?P<self>\d+) \|\s*(?P<cumulative>\d+) \|(?P<indent> +)(?P<name>\S+)"
+)
+
+
+def start_up(env: dict[str, str]) -> tuple[float, list[float], dict[str, float]]:
+    """Start the application once.
+
+    :return: The time from the interpreter start to the window shown,
+        the durations of the stages of the startup,
+        and the cumulative import times of the outer modules.
+    """
+    start: float = perf_counter()
+    process: subprocess.CompletedProcess[str] = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        env=env,
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    total: float = perf_counter() - start
+    stages: list[float] = list(map(float, process.stdout.split()))
+    imports: dict[str, float] = {}
+    line: str
+    for line in process.stderr.splitlines():
+        match: re.Match[str] | None = IMPORT_TIME_LINE.match(line)
+        # the top-level imports and the ones they make directly
+        if match is not None and len(match["indent"]) <= 3:
+            imports[match["name"]] = int(match["cumulative"]) * 1e-6
+    return total, stages, imports
+
+
+def main() -> None:
+    ap: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("-n", "--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=15, help="the imports to list")
+    ap.add_argument(
+        "--offscreen", action="store_true", help="do not display the windows"
+    )
+    args: argparse.Namespace = ap.parse_args()
+
+    env: dict[str, str] = {**os.environ, "PYTHONPATH": str(SOURCE_DIR)}
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    # the first run warms up the disk cache and compiles the bytecode
+    start_up(env)
+    runs: list[tuple[float, list[float], dict[str, float]]] = [
+        start_up(env) for _ in range(args.repeat)
+    ]
+
+    print(
+        f"time to the first window: {median(total for total, _, _ in runs):.3f} s "
+        f"(median of {args.repeat})"
+    )
+    stage: str
+    for index, stage in enumerate(("imports", "construction", "showing")):
+        print(f"  {stage:<13}{median(stages[index] for _, stages, _ in runs):.3f} s")
+    print("the slowest imports:")
+    names: set[str] = set().union(*(imports for _, _, imports in runs))
+    import_times: dict[str, float] = {
+        name: median(imports.get(name, 0.0) for _, _, imports in runs) for name in names
+    }
+    for name in sorted(import_times, key=import_times.__getitem__, reverse=True)[
+        : args.top
+    ]:
+        print(f"  {name:<50}{import_times[name]:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
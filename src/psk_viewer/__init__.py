@@ -15,6 +15,11 @@ except ImportError:
     __version__ = ""
 
 
+# https://www.reddit.com/r/learnpython/comments/4kjie3/how_to_include_gui_images_with_pyinstaller/d3gjmom
+def resource_path(relative_path: str | Path) -> Path:
+    return Path(getattr(sys, "_MEIPASS", Path(__file__).parent)) / relative_path
+
+
 def _make_old_qt_compatible_again() -> None:
     from packaging.version import Version
     from qtpy import PYQT_VERSION, PYSIDE2, QT6
@@ -193,10 +198,17 @@ windows = []
 def main() -> int:
     import argparse
 
+    if sys.argv[1:2] == ["find-lines"]:
+        from .batch import main as find_lines
+
+        return find_lines(sys.argv[2:])
+
     ap: argparse.ArgumentParser = argparse.ArgumentParser(
         allow_abbrev=True,
         description="IPM RAS PSK and FS spectrometer files viewer.\n"
         f"Find more at https://github.com/{__author__}/{__original_name__}.",
+        epilog="Run `%(prog)s find-lines --help` "
+        "to find the lines in many files without the GUI.",
     )
     if __version__:
         ap.add_argument(
@@ -0,0 +1,390 @@
+import argparse
+import sys
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from contextlib import suppress
+from os import cpu_count
+from pathlib import Path
+from time import perf_counter
+from typing import Final, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = ["find_lines", "main"]
+
+# the files to look for in the directories, the `.csv` data going with the `.conf` files
+DATA_FILE_PATTERNS: Final[tuple[str, ...]] = ("*.scandat", "*.fmd", "*.conf")
+FOUND_LINES_SUFFIX: Final[str] = ".lines.csv"
+# the defaults of the GUI
+DEFAULT_THRESHOLD: Final[float] = 12.0
+# the values of `display/unit` in the settings, as `PlotDataItem` has them
+VOLTAGE_DATA: Final[str] = "voltage_data"
+GAMMA_DATA: Final[str] = "gamma_data"
+CSV_SEPARATORS: Final[dict[str, str]] = {
+    "comma": ",",
+    "tab": "\t",
+    "semicolon": ";",
+    "space": " ",
+}
+
+
+class Options(NamedTuple):
+    threshold: float
+    show_gamma: bool
+    cell_length: float
+    output_dir: Path | None
+    csv_separator: str
+    workers: int
+
+
+class FileReport(NamedTuple):
+    filename: Path
+    lines_count: int = 0
+    loading_time: float = 0.0
+    detection_time: float = 0.0
+    error: str = ""
+
+
+def find_lines(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    fs: bool,
+    threshold: float,
+    model_signal: NDArray[np.float64],
+    workers: int = 1,
+) -> NDArray[np.int64]:
+    """Find the lines the way “Find Lines Automatically” does.
+
+    :param x: The frequencies of the spectrum.
+    :param y: The voltage or the absorption.
+    :param fs: Whether the spectrum is from the FS spectrometer,
+        so that it gets correlated with the line model first.
+    :param threshold: The search threshold as set in the GUI.
+    :param model_signal: The line model.
+    :param workers: The number of threads to process the segments of the spectrum in.
+    :return: The indices of the lines found.
+    """
+    from .detection import PeakSelector, correlation, resampled_model_signal
+
+    if x.size < 2 or y.size < 2:
+        return np.empty(0, dtype=np.int64)
+    if fs:
+        if model_signal.size < 2:
+            return np.empty(0, dtype=np.int64)
+        y = correlation(
+            resampled_model_signal(model_signal, x[1] - x[0]), x, y, workers=workers
+        )
+    return PeakSelector(x, y, workers=workers).select(threshold=1.0 / threshold)
+
+
+def data_files(paths: Sequence[Path], recursive: bool) -> Iterator[Path]:
+    """List the files given and the data files in the directories given."""
+    for path in paths:
+        if not path.is_dir():
+            yield path
+            continue
+        yield from sorted(
+            file
+            for pattern in DATA_FILE_PATTERNS
+            for file in (path.rglob(pattern) if recursive else path.glob(pattern))
+            if file.is_file()
+        )
+
+
+def save_found_lines(
+    filename: Path,
+    f: NDArray[np.float64],
+    v: NDArray[np.float64],
+    g: NDArray[np.float64] | None,
+    sep: str,
+) -> None:
+    """Write the found lines table with the same headers as the GUI saves."""
+    names: list[str] = ["Frequency", "Voltage"]
+    units: list[str] = ["MHz", "mV"]
+    columns: list[NDArray[np.float64]] = [f * 1e-6, v * 1e3]
+    fmt: list[str] = ["%.3f", "%.4f"]
+    if g is not None:
+        names.append("Absorption")
+        units.append("cm⁻¹")
+        columns.append(g)
+        fmt.append("%.4e")
+    # noinspection PyTypeChecker
+    np.savetxt(
+        filename,
+        np.column_stack(columns),
+        delimiter=sep,
+        header=sep.join(names) + "\n" + sep.join(units),
+        fmt=fmt,
+        encoding="utf-8",
+    )
+
+
+def gui_settings() -> tuple[float, bool]:
+    """Get the search threshold and whether the lines are looked for in the absorption, as set in the GUI.
+
+    Only `QSettings` is used, so neither a display nor the GUI modules are needed.
+    """
+    threshold: float = DEFAULT_THRESHOLD
+    show_gamma: bool = False
+    try:
+        from qtpy.QtCore import QSettings
+    except ImportError:
+        return threshold, show_gamma
+
+    # the same file the GUI stores its settings into
+    settings: QSettings = QSettings("SavSoft", "Spectrometer Viewer")
+    with suppress(TypeError, ValueError):
+        threshold = float(settings.value("lineSearch/threshold", threshold, float))
+    if not threshold > 0.0:
+        threshold = DEFAULT_THRESHOLD
+    with suppress(TypeError, ValueError):
+        show_gamma = settings.value("display/unit", VOLTAGE_DATA, str) == GAMMA_DATA
+    return threshold, show_gamma
+
+
+def process_file(
+    filename: Path, options: Options, model_signal: NDArray[np.float64]
+) -> FileReport:
+    """Load the file, find the lines in it, and save them next to the file.
+
+    The data are not taken from the cache of the GUI and not stored there,
+    for a batch of files would push the spectra viewed recently out of it.
+    Whatever fails, the failure is reported for the file, and the other files get processed.
+    """
+    try:
+        return _process_file(filename, options, model_signal)
+    except Exception as ex:  # noqa: BLE001 - a file breaking the search must not stop the batch
+        return FileReport(filename, error=f"{type(ex).__name__}: {ex}")
+
+
+def _process_file(
+    filename: Path, options: Options, model_signal: NDArray[np.float64]
+) -> FileReport:
+    from .data_reader import DataMode, SpectrometerData, stream_data
+
+    def ask_cell_length(cell_length: float) -> float:
+        if options.cell_length <= 0.0:
+            raise ValueError(
+                f"Invalid cell length: {cell_length} cm; specify it with `--cell-length`"
+            )
+        return options.cell_length
+
+    start_time: float = perf_counter()
+    try:
+        snapshots: Iterator[tuple[SpectrometerData, float]] | None = stream_data(
+            filename, ask_cell_length=ask_cell_length, use_cache=False
+        )
+        if snapshots is None:
+            return FileReport(filename, error="Unsupported file type")
+        # only the complete data are needed
+        last_snapshot: deque[tuple[SpectrometerData, float]] = deque(
+            snapshots, maxlen=1
+        )
+    except (OSError, LookupError, ValueError) as ex:
+        return FileReport(filename, error=str(ex))
+    loading_time: float = perf_counter() - start_time
+
+    if not last_snapshot:
+        return FileReport(filename, loading_time=loading_time, error="No data")
+    _, f, g, v, _, data_mode = last_snapshot[0][0]
+    if data_mode not in (DataMode.FS, DataMode.PSK, DataMode.PSK_WITH_JUMP):
+        return FileReport(filename, loading_time=loading_time, error="No spectrum")
+    if options.show_gamma and data_mode == DataMode.FS:
+        return FileReport(
+            filename, loading_time=loading_time, error="No absorption in FS data"
+        )
+
+    start_time = perf_counter()
+    found_lines: NDArray[np.int64] = find_lines(
+        f,
+        g if options.show_gamma else v,
+        fs=data_mode == DataMode.FS,
+        threshold=options.threshold,
+        model_signal=model_signal,
+        workers=options.workers,
+    )
+    detection_time: float = perf_counter() - start_time
+
+    output_dir: Path = options.output_dir or filename.parent
+    try:
+        save_found_lines(
+            output_dir / (filename.stem + FOUND_LINES_SUFFIX),
+            f[found_lines],
+            v[found_lines],
+            g[found_lines] if g.size else None,
+            sep=options.csv_separator,
+        )
+    except OSError as ex:
+        return FileReport(
+            filename,
+            found_lines.size,
+            loading_time,
+            detection_time,
+            error=str(ex),
+        )
+    return FileReport(filename, found_lines.size, loading_time, detection_time)
+
+
+def print_report(report: FileReport) -> None:
+    if report.error:
+        print(f"{report.filename}: {report.error}", file=sys.stderr)
+    else:
+        print(
+            f"{report.filename}: {report.lines_count} lines, "
+            f"loaded in {report.loading_time:.3f} s, "
+            f"searched in {report.detection_time:.3f} s"
+        )
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Find the lines in the files given without the GUI, saving them into tables.
+
+    The search threshold and the data to look for the lines in are taken from the settings of the GUI,
+    unless given in the command line.
+
+    :param args: The command line arguments after the subcommand.
+    :return: The exit code: 0 if all the files are processed, 1 otherwise.
+    """
+    from . import resource_path
+
+    ap: argparse.ArgumentParser = argparse.ArgumentParser(
+        prog=f"{Path(sys.argv[0]).name} find-lines",
+        description="Find the lines automatically in many files, without the GUI. "
+        f"For every file, the lines found are saved into the `*{FOUND_LINES_SUFFIX}` "
+        "file next to the data file.",
+    )
+    ap.add_argument(
+        "path",
+        type=Path,
+        nargs=argparse.ONE_OR_MORE,
+        help="the data files or the directories with them",
+    )
+    ap.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="look for the data files in the subdirectories too",
+    )
+    ap.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        help="the search threshold (default: as set in the GUI)",
+    )
+    data_type = ap.add_mutually_exclusive_group()
+    data_type.add_argument(
+        "--voltage",
+        dest="show_gamma",
+        action="store_false",
+        default=None,
+        help="look for the lines in the voltage (default: as set in the GUI)",
+    )
+    data_type.add_argument(
+        "--absorption",
+        dest="show_gamma",
+        action="store_true",
+        help="look for the lines in the absorption (default: as set in the GUI)",
+    )
+    ap.add_argument(
+        "-l",
+        "--cell-length",
+        type=float,
+        default=0.0,
+        help="the cell length [cm] for the files with an invalid one",
+    )
+    ap.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        help="the directory to save the tables into instead",
+    )
+    ap.add_argument(
+        "-s",
+        "--separator",
+        choices=CSV_SEPARATORS,
+        default="tab",
+        help="the separator of the values in the tables (default: %(default)s)",
+    )
+    ap.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=cpu_count() or 1,
+        help="the number of files processed simultaneously (default: %(default)s)",
+    )
+    parsed_args: argparse.Namespace = ap.parse_args(args)
+    if parsed_args.threshold is not None and parsed_args.threshold <= 0.0:
+        ap.error("the threshold must be positive")
+    if parsed_args.jobs < 1:
+        ap.error("the number of jobs must be positive")
+    if parsed_args.output_dir is not None:
+        parsed_args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    model_signal: NDArray[np.float64]
+    try:
+        model_signal = np.fromiter(
+            map(
+                float,
+                resource_path("averaged fs signal filtered.csv").read_text().split(),
+            ),
+            dtype=np.float64,
+        )
+    except (OSError, BlockingIOError):
+        model_signal = np.empty(0)
+
+    threshold: float
+    show_gamma: bool
+    threshold, show_gamma = gui_settings()
+    if parsed_args.threshold is not None:
+        threshold = parsed_args.threshold
+    if parsed_args.show_gamma is not None:
+        show_gamma = parsed_args.show_gamma
+
+    filenames: list[Path] = list(data_files(parsed_args.path, parsed_args.recursive))
+    jobs: int = max(1, min(parsed_args.jobs, len(filenames)))
+    options: Options = Options(
+        threshold=threshold,
+        show_gamma=show_gamma,
+        cell_length=parsed_args.cell_length,
+        output_dir=parsed_args.output_dir,
+        csv_separator=CSV_SEPARATORS[parsed_args.separator],
+        # share the processor cores left by the files processed simultaneously
+        workers=max(1, (cpu_count() or 1) // jobs),
+    )
+
+    start_time: float = perf_counter()
+    reports: list[FileReport] = []
+    if jobs == 1:
+        for filename in filenames:
+            reports.append(process_file(filename, options, model_signal))
+            print_report(reports[-1])
+    else:
+        executor: Executor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures: list[Future[FileReport]] = [
+                executor.submit(process_file, filename, options, model_signal)
+                for filename in filenames
+            ]
+            future: Future[FileReport]
+            for future in as_completed(futures):
+                reports.append(future.result())
+                print_report(reports[-1])
+    total_time: float = perf_counter() - start_time
+
+    succeeded: list[FileReport] = [report for report in reports if not report.error]
+    print(
+        f"{len(succeeded)} of {len(reports)} files processed in {total_time:.3f} s, "
+        f"{sum(report.lines_count for report in succeeded)} lines found"
+    )
+    if succeeded:
+        print(
+            "loading: "
+            f"{sum(report.loading_time for report in succeeded):.3f} s total, "
+            f"{max(report.loading_time for report in succeeded):.3f} s max; "
+            "searching: "
+            f"{sum(report.detection_time for report in succeeded):.3f} s total, "
+            f"{max(report.detection_time for report in succeeded):.3f} s max"
+        )
+    return int(len(succeeded) != len(reports))
@@ -0,0 +1,106 @@
+from threading import Condition
+from typing import Final
+
+import numpy as np
+from qtpy.QtCore import QObject, QThread, Signal, Slot
+
+from .catalog_index import CatalogIndex
+
+__all__ = ["CatalogAnnotator"]
+
+
+class CatalogAnnotator(QThread):
+    """Match the frequencies of the table rows against the catalog in a separate thread.
+
+    The rows requested last are matched first, for they are likely the ones being shown.
+    The matches are reported via `annotated` in the thread the annotator belongs to.
+    The thread starts on the first request and runs until `stop` is called.
+    """
+
+    CHUNK_SIZE: Final[int] = 64
+
+    # the generation of the requests, the rows, and the substances near each row
+    annotated: Signal = Signal(int, object, object, name="annotated")
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self.setObjectName("catalog annotator")
+        self._condition: Condition = Condition()
+        # the frequencies [MHz] of the rows, the latest requests last
+        self._requests: dict[int, float] = {}
+        self._generation: int = 0
+        self._index: CatalogIndex = CatalogIndex()
+        self._max_distance: float = 0.0
+        self._stopped: bool = False
+
+    @property
+    def generation(self) -> int:
+        """The number that changes when the pending requests get cancelled."""
+        return self._generation
+
+    def reset(self, index: CatalogIndex, max_distance: float) -> None:
+        """Cancel the pending requests and match the next ones with other parameters.
+
+        :param index: The catalog lines to match the rows against.
+        :param max_distance: The largest distance [MHz] to the lines to consider.
+        """
+        with self._condition:
+            self._index = index
+            self._max_distance = max_distance
+            self._cancel()
+
+    def cancel(self) -> None:
+        """Drop the pending requests and ignore the matches being made."""
+        with self._condition:
+            self._cancel()
+
+    def _cancel(self) -> None:
+        self._requests.clear()
+        self._generation += 1
+
+    def request(self, row: int, frequency: float) -> None:
+        """Ask to match a row, moving it ahead of the other requests if already asked.
+
+        :param row: The row of the table.
+        :param frequency: The frequency [MHz] of the row.
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            self._requests.pop(row, None)
+            self._requests[row] = frequency
+            self._condition.notify()
+        if not self.isRunning():
+            self.start(QThread.Priority.LowPriority)
+
+    @Slot()
+    def stop(self) -> None:
+        """Drop the pending requests and wait for the thread to finish."""
+        with self._condition:
+            self._stopped = True
+            self._cancel()
+            self._condition.notify()
+        self.requestInterruption()
+        self.wait()
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._requests and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation: int = self._generation
+                index: CatalogIndex = self._index
+                max_distance: float = self._max_distance
+                requests: list[tuple[int, float]] = [
+                    self._requests.popitem()
+                    for _ in range(min(self.CHUNK_SIZE, len(self._requests)))
+                ]
+            rows: list[int] = [row for row, _ in requests]
+            substances: list[list[tuple[float, object]]] = index.all_substances(
+                np.array([frequency for _, frequency in requests]), max_distance
+            )
+            if self.isInterruptionRequested():
+                return
+            self.annotated.emit(generation, rows, substances)
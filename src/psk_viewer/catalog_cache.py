@@ -0,0 +1,175 @@
+import json
+import os
+from collections.abc import Sequence
+from contextlib import suppress
+from hashlib import sha1
+from os import PathLike
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Final
+
+import numpy as np
+
+from .catalog_index import CatalogIndex
+from .data_cache import CATALOG_SUFFIX, cache_dir, prune_cache, read_record
+
+__all__ = ["cache_catalog", "cached_catalog", "load_catalog"]
+
+CATALOG_FORMAT_VERSION: Final[int] = 2
+
+
+def _sources_stamp(
+    sources: Sequence[str | PathLike[str]],
+) -> list[tuple[str, int, int]] | None:
+    stamp: list[tuple[str, int, int]] = []
+    for source in sources:
+        try:
+            stat: os.stat_result = os.stat(source)
+        except OSError:
+            return None
+        stamp.append((str(Path(source).resolve()), stat.st_size, stat.st_mtime_ns))
+    return stamp
+
+
+def _entry_fields(entry: object, lines_field: str) -> dict[str, object] | None:
+    """Get the fields of the entry but its lines, if they all are stored in JSON as they are."""
+    fields: dict[str, object] = {}
+    for slot in type(entry).__slots__:
+        if slot == lines_field:
+            continue
+        value: object = getattr(entry, slot)
+        # tuples and other objects would get back as something else
+        if value is not None and type(value) not in (bool, int, float, str):
+            return None
+        fields[slot] = value
+    return fields
+
+
+def _cache_file(stamp: list[tuple[str, int, int]]) -> Path:
+    key: str = sha1(
+        "\n".join(sorted(path for path, *_ in stamp)).encode(errors="replace")
+    ).hexdigest()
+    return cache_dir() / (key + CATALOG_SUFFIX)
+
+
+def cached_catalog(sources: Sequence[str | PathLike[str]]) -> CatalogIndex | None:
+    """Get the catalog compiled earlier, if the source files have not changed since.
+
+    The lines are memory-mapped, so they are read-only.
+    """
+    try:
+        # noinspection PyPackageRequirements
+        from pycatsearch.utils import LINES, CatalogEntryType
+    except ImportError:
+        return None
+
+    stamp: list[tuple[str, int, int]] | None = _sources_stamp(sources)
+    if not stamp:
+        return None
+    path: Path = _cache_file(stamp)
+    try:
+        with open(path, "rb") as f_in:
+            meta: dict[str, object] = json.loads(
+                np.lib.format.read_array(f_in).tobytes()
+            )
+            if meta.get("version") != CATALOG_FORMAT_VERSION or sorted(
+                tuple(s) for s in meta.get("sources", [])
+            ) != sorted(stamp):
+                return None
+            frequencies, intensities, entry_ids = (
+                read_record(f_in, path) for _ in range(3)
+            )
+        fields: set[str] = set(CatalogEntryType.__slots__) - {LINES}
+        if any(set(entry) != fields for entry in meta["entries"]):
+            # stored by another version of `pycatsearch`
+            return None
+        index: CatalogIndex = CatalogIndex.from_arrays(
+            entries=[CatalogEntryType(**entry) for entry in meta["entries"]],
+            frequencies=frequencies,
+            intensities=intensities,
+            entry_ids=entry_ids,
+            sources=[Path(source) for source in meta["loaded"]],
+        )
+    except (OSError, ValueError, TypeError, LookupError):
+        return None
+    if not (frequencies.shape == intensities.shape == entry_ids.shape) or (
+        entry_ids.size
+        and not (0 <= entry_ids.min() <= entry_ids.max() < len(index.entries))
+    ):
+        return None
+    with suppress(OSError):
+        # mark the catalog as recently used
+        os.utime(path)
+    return index
+
+
+def cache_catalog(sources: Sequence[str | PathLike[str]], index: CatalogIndex) -> None:
+    """Store the compiled catalog to be picked up by `cached_catalog` later.
+
+    Failing to store the catalog is not an error: the catalog gets loaded again then.
+
+    :param sources: The files the catalog has been asked to be loaded from.
+    :param index: The catalog compiled.
+    """
+    try:
+        # noinspection PyPackageRequirements
+        from pycatsearch.utils import LINES
+    except ImportError:
+        return
+
+    stamp: list[tuple[str, int, int]] | None = _sources_stamp(sources)
+    if not stamp:
+        return
+    entries: list[dict[str, object] | None] = [
+        _entry_fields(entry, LINES) for entry in index.entries
+    ]
+    if None in entries:
+        return
+    path: Path = _cache_file(stamp)
+    meta: bytes = json.dumps(
+        {
+            "version": CATALOG_FORMAT_VERSION,
+            "sources": stamp,
+            "loaded": [str(source) for source in index.sources],
+            "entries": entries,
+        }
+    ).encode()
+    temp_path: Path | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f_out:
+            temp_path = Path(f_out.name)
+            np.lib.format.write_array(f_out, np.frombuffer(meta, dtype=np.uint8))
+            np.lib.format.write_array(f_out, index.frequencies.astype(np.float64))
+            np.lib.format.write_array(f_out, index.intensities.astype(np.float64))
+            np.lib.format.write_array(f_out, index.entry_ids.astype(np.intp))
+        # replacing keeps the catalog mapped by the earlier readers intact
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError):
+        if temp_path is not None:
+            with suppress(OSError):
+                temp_path.unlink()
+        return
+    prune_cache(keep=path)
+
+
+def load_catalog(sources: Sequence[str | PathLike[str]]) -> CatalogIndex:
+    """Load the catalog from the files or from its compiled form if the files are unchanged.
+
+    The names of the entries are left to be made in the GUI thread.
+
+    :param sources: The catalog files.
+    :return: The catalog compiled.
+    :raises ImportError: If `pycatsearch` is not available.
+    """
+    # noinspection PyPackageRequirements
+    from pycatsearch.catalog import Catalog
+
+    if (index := cached_catalog(sources)) is not None:
+        return index
+
+    catalog: Catalog = Catalog(*sources)
+    index = CatalogIndex(catalog.catalog.values(), sources=catalog.sources)
+    if len(index):
+        cache_catalog(sources, index)
+    return index
@@ -0,0 +1,177 @@
+import copy
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = ["CatalogIndex"]
+
+
+class CatalogIndex:
+    """The lines of all the catalog entries in flat arrays sorted by frequency.
+
+    The index is built once for a catalog, so that looking for the substances
+    near a frequency takes a binary search and a few array operations
+    instead of filtering the whole catalog.
+    """
+
+    def __init__(
+        self, entries: Iterable[Any] = (), sources: Iterable[Path] = ()
+    ) -> None:
+        """Collect the lines of the entries.
+
+        :param entries: The catalog entries, like `pycatsearch.catalog.Catalog.catalog.values()`.
+            Each has the `lines` with the `frequency` [MHz] and the `intensity` [log10(nm²×MHz)].
+        :param sources: The files the catalog is loaded from.
+        """
+        self.sources: list[Path] = list(sources)
+        # the names of the entries to display, if made already
+        self.names: list[str] = []
+        # the entries without their lines
+        self.entries: list[object] = []
+        frequencies: list[NDArray[np.float64]] = []
+        intensities: list[NDArray[np.float64]] = []
+        entry_ids: list[NDArray[np.intp]] = []
+        for entry in entries:
+            lines: list[Any] = entry.lines
+            if not lines:
+                continue
+            frequencies.append(
+                np.fromiter(
+                    (line.frequency for line in lines),
+                    dtype=np.float64,
+                    count=len(lines),
+                )
+            )
+            intensities.append(
+                np.fromiter(
+                    (line.intensity for line in lines),
+                    dtype=np.float64,
+                    count=len(lines),
+                )
+            )
+            entry_ids.append(np.full(len(lines), len(self.entries), dtype=np.intp))
+            key: Any = copy.copy(entry)
+            key.lines = []
+            self.entries.append(key)
+
+        self.frequencies: NDArray[np.float64] = np.concatenate(
+            frequencies or [np.empty(0)]
+        )
+        order: NDArray[np.intp] = np.argsort(self.frequencies, kind="stable")
+        self.frequencies = self.frequencies[order]
+        self.intensities: NDArray[np.float64] = np.concatenate(
+            intensities or [np.empty(0)]
+        )[order]
+        self.entry_ids: NDArray[np.intp] = np.concatenate(
+            entry_ids or [np.empty(0, dtype=np.intp)]
+        )[order]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        entries: list[object],
+        frequencies: NDArray[np.float64],
+        intensities: NDArray[np.float64],
+        entry_ids: NDArray[np.intp],
+        sources: Iterable[Path] = (),
+    ) -> "CatalogIndex":
+        """Make an index of the arrays collected earlier, without copying them.
+
+        :param entries: The entries without their lines.
+        :param frequencies: The frequencies [MHz] of the lines, sorted ascending.
+        :param intensities: The intensities [log10(nm²×MHz)] of the lines.
+        :param entry_ids: The indices of the entries the lines belong to.
+        :param sources: The files the catalog is loaded from.
+        """
+        index: CatalogIndex = cls(sources=sources)
+        index.entries = entries
+        index.frequencies = frequencies
+        index.intensities = intensities
+        index.entry_ids = entry_ids
+        return index
+
+    def __len__(self) -> int:
+        return self.frequencies.size
+
+    def substances(
+        self, frequency: float, max_distance: float
+    ) -> list[tuple[float, object]]:
+        """Find the entries with lines close to the frequency.
+
+        An entry weighs the more the stronger its lines are and the closer they are.
+
+        :param frequency: The frequency [MHz] to look near.
+        :param max_distance: The largest distance [MHz] to the lines to consider.
+        :return: The weights and the entries without their lines,
+            the heaviest first, the ones of the same weight in the catalog order.
+        """
+        return self.all_substances(np.array([frequency]), max_distance)[0]
+
+    def all_substances(
+        self, frequencies: NDArray[np.float64], max_distance: float
+    ) -> list[list[tuple[float, object]]]:
+        """Find the entries with lines close to each of the frequencies at once.
+
+        :param frequencies: The frequencies [MHz] to look near, in any order.
+        :param max_distance: The largest distance [MHz] to the lines to consider.
+        :return: The substances near every frequency as `substances` finds them.
+        """
+        # the lines within the distance make a slice of the sorted lines for each frequency
+        starts: NDArray[np.intp] = np.searchsorted(
+            self.frequencies, frequencies - max_distance, side="left"
+        )
+        counts: NDArray[np.intp] = np.maximum(
+            np.searchsorted(self.frequencies, frequencies + max_distance, side="right")
+            - starts,
+            0,
+        )
+        # list the pairs of a frequency and a line near it
+        pair_frequencies: NDArray[np.intp] = np.repeat(
+            np.arange(frequencies.size), counts
+        )
+        pair_lines: NDArray[np.intp] = (
+            np.arange(pair_frequencies.size)
+            - np.repeat(np.cumsum(counts) - counts, counts)
+            + np.repeat(starts, counts)
+        )
+
+        offsets: NDArray[np.float64] = (
+            self.frequencies[pair_lines] - frequencies[pair_frequencies]
+        )
+        # an exact match outweighs anything
+        line_weights: NDArray[np.float64] = np.full(offsets.shape, np.inf)
+        off_line: NDArray[np.bool_] = offsets != 0.0
+        line_weights[off_line] = (
+            10.0 ** self.intensities[pair_lines[off_line]] / offsets[off_line] ** 2
+        )
+
+        # sum the weights of the lines of an entry near a frequency
+        groups: NDArray[np.intp]
+        pair_groups: NDArray[np.intp]
+        groups, pair_groups = np.unique(
+            pair_frequencies * len(self.entries) + self.entry_ids[pair_lines],
+            return_inverse=True,
+        )
+        weights: NDArray[np.float64] = np.bincount(
+            pair_groups, weights=line_weights, minlength=groups.size
+        )
+        group_frequencies: NDArray[np.intp]
+        group_entries: NDArray[np.intp]
+        group_frequencies, group_entries = np.divmod(groups, max(1, len(self.entries)))
+        # the heaviest first, the groups being sorted by the entry already
+        order: NDArray[np.intp] = np.lexsort((-weights, group_frequencies))
+
+        substances: list[list[tuple[float, object]]] = [
+            [] for _ in range(frequencies.size)
+        ]
+        for weight, frequency_index, entry_index in zip(
+            weights[order].tolist(),
+            group_frequencies[order].tolist(),
+            group_entries[order].tolist(),
+            strict=True,
+        ):
+            substances[frequency_index].append((weight, self.entries[entry_index]))
+        return substances
@@ -0,0 +1,136 @@
+from collections.abc import Iterable
+from os import PathLike
+from pathlib import Path
+from tarfile import TarError
+from typing import ClassVar, Final
+
+from qtpy.QtCore import QCoreApplication, QObject, QThread, Signal, Slot
+
+from .catalog_cache import load_catalog
+from .catalog_index import CatalogIndex
+from .utils import best_name
+
+__all__ = ["CatalogService"]
+
+# what loading a catalog fails with: missing `pycatsearch`, unreadable or broken files
+_LOAD_ERRORS: Final[tuple[type[Exception], ...]] = (
+    EOFError,
+    ImportError,
+    LookupError,
+    OSError,
+    TarError,
+    TypeError,
+    ValueError,
+)
+
+
+class _CatalogLoader(QThread):
+    def __init__(self, sources: list[Path], parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._sources: list[Path] = sources
+        self._result: CatalogIndex | None = None
+        self._error: Exception | None = None
+
+    def run(self) -> None:
+        try:
+            self._result = load_catalog(self._sources)
+        except _LOAD_ERRORS as ex:
+            self._error = ex
+
+    def result(self) -> CatalogIndex | None:
+        """Get the catalog, re-raising the error that occurred while loading."""
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class CatalogService(QObject):
+    """Load the catalogs once for the whole application and share them among the windows.
+
+    The catalogs are loaded in a separate thread.
+    Every window is told via `catalog_loaded` when a catalog is ready,
+    and the windows that use the same files get the same `CatalogIndex`.
+    """
+
+    _instance: ClassVar["CatalogService | None"] = None
+
+    # the files asked for and the catalog loaded from them
+    catalog_loaded: Signal = Signal(frozenset, object, name="catalog_loaded")
+    # the files asked for and the error, if any
+    catalog_failed: Signal = Signal(frozenset, str, name="catalog_failed")
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._catalogs: dict[frozenset[Path], CatalogIndex] = {}
+        self._loaders: dict[frozenset[Path], _CatalogLoader] = {}
+
+        # a thread running when the application object gets destroyed aborts the process
+        app: QCoreApplication | None = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.wait)
+
+    @classmethod
+    def instance(cls) -> "CatalogService":
+        """Get the service of the application, starting it if needed."""
+        if cls._instance is None:
+            cls._instance = cls(QCoreApplication.instance())
+        return cls._instance
+
+    @staticmethod
+    def key(sources: Iterable[str | PathLike[str]]) -> frozenset[Path]:
+        """Get the key the catalog of the files is known by, whatever the order of the files."""
+        return frozenset(map(Path, sources))
+
+    def catalog(self, sources: Iterable[str | PathLike[str]]) -> CatalogIndex | None:
+        """Get the catalog of the files if it is loaded already.
+
+        :param sources: The catalog files.
+        :return: The catalog or `None` if it is not loaded (yet).
+        """
+        return self._catalogs.get(CatalogService.key(sources))
+
+    @Slot()
+    def wait(self) -> None:
+        """Block until the catalogs being loaded are loaded.
+
+        The loading cannot be interrupted, so quitting waits for it to end.
+        """
+        loader: _CatalogLoader
+        for loader in list(self._loaders.values()):
+            loader.wait()
+
+    def load(self, sources: Iterable[str | PathLike[str]]) -> None:
+        """Start loading the catalog of the files unless it is loaded or being loaded.
+
+        When done, either `catalog_loaded` or `catalog_failed` is emitted.
+
+        :param sources: The catalog files.
+        """
+        key: frozenset[Path] = CatalogService.key(sources)
+        if not key or key in self._catalogs or key in self._loaders:
+            return
+        loader: _CatalogLoader = _CatalogLoader(sorted(key), self)
+
+        @Slot()
+        def on_loader_finished() -> None:
+            del self._loaders[key]
+            loader.deleteLater()
+            catalog_index: CatalogIndex | None
+            try:
+                catalog_index = loader.result()
+            except _LOAD_ERRORS as ex:
+                self.catalog_failed.emit(key, str(ex))
+                return
+            if catalog_index is None or not len(catalog_index):
+                self.catalog_failed.emit(key, "")
+            else:
+                # `best_name` fills a memo shared with the GUI, hence not in the loader
+                catalog_index.names = [
+                    best_name(entry) for entry in catalog_index.entries
+                ]
+                self._catalogs[key] = catalog_index
+                self.catalog_loaded.emit(key, catalog_index)
+
+        self._loaders[key] = loader
+        loader.finished.connect(on_loader_finished)
+        loader.start()
@@ -0,0 +1,199 @@
+import json
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import suppress
+from hashlib import sha1
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+from . import __original_name__
+from .data_reader import DataMode, SpectrometerData
+
+__all__ = [
+    "cache_data",
+    "cache_dir",
+    "cached_data",
+    "clear_cache",
+    "prune_cache",
+    "read_record",
+]
+
+CACHE_FORMAT_VERSION: Final[int] = 1
+CACHE_SIZE_LIMIT: Final[int] = 2 << 30  # bytes
+CACHE_SUFFIX: Final[str] = ".cache"
+# the compiled catalogs share the directory and the size limit with the spectra
+CATALOG_SUFFIX: Final[str] = ".catalog"
+
+
+def cache_dir() -> Path:
+    """Get the user cache directory for the parsed spectra and the compiled catalogs."""
+    base: Path
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / __original_name__
+
+
+def _source_files(filename: Path) -> list[Path]:
+    """List the files the data of `filename` are read from."""
+    suffix: str = filename.suffix.casefold()
+    if suffix in (".csv", ".conf"):
+        return [filename.with_suffix(".csv"), filename.with_suffix(".conf")]
+    if suffix in (".fmd", ".frd"):
+        return [filename.with_suffix(".fmd"), filename.with_suffix(".frd")]
+    return [filename]
+
+
+def _sources_stamp(filename: Path) -> list[tuple[str, int, int]] | None:
+    stamp: list[tuple[str, int, int]] = []
+    for source in _source_files(filename):
+        try:
+            stat: os.stat_result = source.stat()
+        except OSError:
+            return None
+        stamp.append((str(source), stat.st_size, stat.st_mtime_ns))
+    return stamp
+
+
+def _cache_file(filename: Path) -> Path:
+    key: str = sha1(str(filename.resolve()).encode(errors="replace")).hexdigest()
+    return cache_dir() / (key + CACHE_SUFFIX)
+
+
+def read_record(f_in: BinaryIO, path: Path) -> NDArray[np.float64]:
+    """Map the next `.npy` record of the file at `path` opened as `f_in` into memory."""
+    version: tuple[int, int] = np.lib.format.read_magic(f_in)
+    shape: tuple[int, ...]
+    fortran_order: bool
+    dtype: np.dtype
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f_in)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f_in)
+    offset: int = f_in.tell()
+    size: int = int(np.prod(shape)) * dtype.itemsize
+    f_in.seek(size, os.SEEK_CUR)
+    if not size:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def cached_data(filename: Path) -> SpectrometerData | None:
+    """Get the data of `filename` parsed earlier, if the source files have not changed since.
+
+    The arrays are memory-mapped, so they are read-only.
+    """
+    stamp: list[tuple[str, int, int]] | None = _sources_stamp(filename)
+    if stamp is None:
+        return None
+    path: Path = _cache_file(filename)
+    try:
+        with open(path, "rb") as f_in:
+            meta: dict[str, object] = json.loads(
+                np.lib.format.read_array(f_in).tobytes()
+            )
+            if (
+                meta.get("version") != CACHE_FORMAT_VERSION
+                or [tuple(s) for s in meta.get("sources", [])] != stamp
+                or meta.get("mode") not in DataMode.__members__
+            ):
+                return None
+            frequency, voltage, absorption, time = (
+                read_record(f_in, path) for _ in range(4)
+            )
+    except (OSError, ValueError, TypeError):
+        return None
+    with suppress(OSError):
+        # mark the entry as recently used
+        os.utime(path)
+    return SpectrometerData(
+        filename,
+        frequency,
+        voltage,
+        absorption,
+        time,
+        DataMode[meta["mode"]],
+    )
+
+
+def cache_data(data: SpectrometerData) -> None:
+    """Store the parsed data to be picked up by `cached_data` later.
+
+    Failing to store the data is not an error: the data get parsed again then.
+    """
+    if data.mode == DataMode.unknown:
+        return
+    stamp: list[tuple[str, int, int]] | None = _sources_stamp(data.filename)
+    if stamp is None:
+        return
+    path: Path = _cache_file(data.filename)
+    meta: bytes = json.dumps(
+        {
+            "version": CACHE_FORMAT_VERSION,
+            "sources": stamp,
+            "mode": data.mode.name,
+        }
+    ).encode()
+    temp_path: Path | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f_out:
+            temp_path = Path(f_out.name)
+            np.lib.format.write_array(f_out, np.frombuffer(meta, dtype=np.uint8))
+            for array in (data.frequency, data.voltage, data.absorption, data.time):
+                np.lib.format.write_array(f_out, np.asarray(array, dtype=np.float64))
+        # replacing keeps the data mapped by the earlier readers intact
+        os.replace(temp_path, path)
+    except OSError:
+        if temp_path is not None:
+            with suppress(OSError):
+                temp_path.unlink()
+        return
+    prune_cache(keep=path)
+
+
+def _cache_entries() -> Iterator[tuple[Path, os.stat_result]]:
+    with suppress(OSError):
+        for path in cache_dir().iterdir():
+            if path.suffix in (CACHE_SUFFIX, CATALOG_SUFFIX):
+                with suppress(OSError):
+                    yield path, path.stat()
+
+
+def prune_cache(keep: Path) -> None:
+    """Remove the least recently used entries that exceed `CACHE_SIZE_LIMIT`.
+
+    :param keep: The entry just stored, to be kept anyway.
+    """
+    entries: list[tuple[Path, os.stat_result]] = sorted(
+        _cache_entries(), key=lambda entry: entry[1].st_mtime_ns, reverse=True
+    )
+    total_size: int = 0
+    for path, stat in entries:
+        total_size += stat.st_size
+        if total_size > CACHE_SIZE_LIMIT and path != keep:
+            with suppress(OSError):
+                # might fail on Windows while the file is mapped
+                path.unlink()
+
+
+def clear_cache() -> None:
+    """Remove the parsed spectra and the compiled catalogs."""
+    for path, _ in _cache_entries():
+        with suppress(OSError):
+            path.unlink()
@@ -0,0 +1,92 @@
+from collections.abc import Callable, Iterator
+from math import inf
+from os import PathLike
+from time import monotonic
+from typing import Final
+
+from qtpy.QtCore import QObject, QThread, Qt, Signal, Slot
+
+from .data_reader import SpectrometerData, stream_data
+
+__all__ = ["DataLoader"]
+
+
+class DataLoader(QThread):
+    """Read the data in a separate thread, reporting the data loaded so far.
+
+    The cell length is asked for via `ask_cell_length` in the thread the loader belongs to.
+    """
+
+    REPORT_INTERVAL: Final[float] = 0.25  # seconds
+
+    data_loaded: Signal = Signal(object, name="data_loaded")
+    progress_changed: Signal = Signal(float, name="progress_changed")
+    _cell_length_requested: Signal = Signal(float, name="cell_length_requested")
+
+    def __init__(
+        self,
+        filename: str | PathLike[str],
+        ask_cell_length: Callable[[float], float],
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._ask_cell_length: Callable[[float], float] = ask_cell_length
+        self._cell_length: float = 0.0
+        self._stream: Iterator[tuple[SpectrometerData, float]] | None = stream_data(
+            filename, ask_cell_length=self._request_cell_length
+        )
+        self._supported: bool = self._stream is not None
+        self._result: SpectrometerData | None = None
+        self._error: Exception | None = None
+
+        self._cell_length_requested.connect(
+            self._on_cell_length_requested,
+            Qt.ConnectionType.BlockingQueuedConnection,
+        )
+
+    @property
+    def supported(self) -> bool:
+        return self._supported
+
+    def _request_cell_length(self, cell_length: float) -> float:
+        # blocks until the slot returns
+        self._cell_length_requested.emit(cell_length)
+        return self._cell_length
+
+    @Slot(float)
+    def _on_cell_length_requested(self, cell_length: float) -> None:
+        self._cell_length = self._ask_cell_length(cell_length)
+
+    def run(self) -> None:
+        if self._stream is None:
+            return
+        last_report: float = -inf
+        data: SpectrometerData
+        progress: float
+        try:
+            for data, progress in self._stream:
+                if self.isInterruptionRequested():
+                    return
+                self._result = data
+                if monotonic() - last_report >= self.REPORT_INTERVAL:
+                    last_report = monotonic()
+                    self.data_loaded.emit(data)
+                    self.progress_changed.emit(progress)
+        except (OSError, LookupError, ValueError) as ex:
+            # what reading a broken file fails with
+            self._error = ex
+        except BaseException:
+            # do not give the data read partially out as complete
+            self._result = None
+            raise
+        finally:
+            # close the files being read
+            self._stream = None
+
+    def result(self) -> SpectrometerData | None:
+        """Get the complete data, re-raising the error that occurred while loading."""
+        if self._error is not None:
+            raise self._error
+        if self.isInterruptionRequested():
+            return None
+        return self._result
@@ -0,0 +1,749 @@
+import enum
+from collections.abc import Callable, Iterable, Iterator
+from io import BytesIO
+from os import PathLike, fstat
+from pathlib import Path
+from typing import BinaryIO, Final, NamedTuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = [
+    "DataMode",
+    "FSData",
+    "PSKData",
+    "SpectrometerData",
+    "XValues",
+    "load_data",
+    "load_data_csv",
+    "load_data_fs",
+    "load_data_scandat",
+    "stream_data",
+]
+
+VOLTAGE_GAIN: Final[float] = 5.0
+DATA_CHUNK_SIZE: Final[int] = 1 << 22  # bytes
+
+
+class DataMode(enum.Enum):
+    unknown = enum.auto()
+    FS = enum.auto()
+    PSK = enum.auto()
+    PSK_WITH_JUMP = enum.auto()
+    TIME_DOMAIN = enum.auto()
+
+
+class FSData(NamedTuple):
+    frequency: NDArray[np.double] = np.empty(0, dtype=np.double)
+    voltage: NDArray[np.double] = np.empty(0, dtype=np.double)
+
+
+class XValues(enum.Enum):
+    unknown = enum.auto()
+    time = enum.auto()
+    frequency = enum.auto()
+
+
+class PSKData(NamedTuple):
+    frequency: NDArray[np.double] = np.empty(0, dtype=np.double)
+    voltage: NDArray[np.double] = np.empty(0, dtype=np.double)
+    absorption: NDArray[np.double] = np.empty(0, dtype=np.double)
+    time: NDArray[np.double] = np.empty(0, dtype=np.double)
+    jump: float = np.nan
+    mode: XValues = XValues.unknown
+
+
+class SpectrometerData(NamedTuple):
+    filename: Path
+    frequency: NDArray[np.double] = np.empty(0, dtype=np.double)
+    voltage: NDArray[np.double] = np.empty(0, dtype=np.double)
+    absorption: NDArray[np.double] = np.empty(0, dtype=np.double)
+    time: NDArray[np.double] = np.empty(0, dtype=np.double)
+    mode: DataMode = DataMode.unknown
+
+
+def _first_line(text: bytes) -> bytes:
+    line_end: int = text.find(b"\n")
+    return text if line_end < 0 else text[:line_end]
+
+
+def _last_line(text: bytes) -> bytes:
+    """Get the last line of the text the way `readlines()[-1]` does, sans the line end."""
+    line_end: int = len(text) - text.endswith(b"\n")
+    return text[text.rfind(b"\n", 0, line_end) + 1 : line_end]
+
+
+def _drop_last_lines(text: bytes, count: int) -> bytes:
+    """Remove the last lines of the text the way `readlines()[:-count]` does."""
+    line_end: int = len(text) - text.endswith(b"\n")
+    for _ in range(count):
+        line_end = text.rfind(b"\n", 0, line_end)
+        if line_end < 0:
+            return b""
+    return text[:line_end]
+
+
+def _line_blocks(
+    f_in: BinaryIO, trim: Callable[[bytes], bytes] | None = None
+) -> Iterator[bytes]:
+    """Read the rest of the file by blocks of whole lines.
+
+    :param f_in: The file to read.
+    :param trim: The function to remove the trailing lines from the last block.
+        It gets at least the last two lines of the file.
+    :return: The blocks of about `DATA_CHUNK_SIZE` bytes.
+    """
+    pending: bytes = b""
+    chunk: bytes
+    while chunk := f_in.read(DATA_CHUNK_SIZE):
+        pending += chunk
+        # hold back the incomplete line along with two more for `trim` to see
+        complete: int = len(_drop_last_lines(pending, 3))
+        if complete:
+            yield pending[: complete + 1]
+            pending = pending[complete + 1 :]
+    yield trim(pending) if trim is not None else pending
+
+
+def _parse_values(text: bytes) -> NDArray[np.float64]:
+    """Parse whitespace-separated numbers in a single vectorized pass.
+
+    :raises ValueError: If the text contains anything but the numbers.
+    """
+    import warnings
+
+    with warnings.catch_warnings():
+        # `np.fromstring` warns instead of raising when it meets a non-number
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+        except DeprecationWarning as ex:
+            raise ValueError(str(ex)) from None
+
+
+def _rows(
+    blocks: Iterable[bytes], columns: int | None = None
+) -> Iterator[NDArray[np.float64]]:
+    """Parse the numeric block of a file portion by portion.
+
+    :param blocks: The consecutive parts of the numeric block.
+    :param columns: The number of values per row; if omitted, it is taken from the first line.
+    :return: The parsed values as 2D arrays, a row per a data row.
+    :raises ValueError: If the block contains anything but the numbers,
+        or if the values do not form complete rows.
+    """
+    leftover: NDArray[np.float64] = np.empty(0)
+    block: bytes
+    for block in blocks:
+        if columns is None:
+            if not block.strip():
+                continue
+            columns = len(_first_line(block.lstrip()).split())
+        values: NDArray[np.float64] = _parse_values(block)
+        if leftover.size:
+            # a row might span two blocks when its values are on separate lines
+            values = np.concatenate((leftover, values))
+        complete: int = values.size - values.size % columns
+        leftover = values[complete:]
+        if complete:
+            yield values[:complete].reshape(-1, columns)
+    if leftover.size:
+        raise ValueError(
+            f"Expected {columns} values per row, but got {leftover.size} extra values"
+        )
+
+
+def _joined(chunks: Iterable[PSKData], jump: float, mode: XValues) -> PSKData:
+    """Join the data loaded by portions."""
+    parts: list[PSKData] = list(chunks)
+    if not parts:
+        return PSKData(jump=jump, mode=mode)
+    if len(parts) == 1:
+        return parts[0]
+    return PSKData(
+        frequency=np.concatenate([part.frequency for part in parts]),
+        voltage=np.concatenate([part.voltage for part in parts]),
+        absorption=np.concatenate([part.absorption for part in parts]),
+        time=np.concatenate([part.time for part in parts]),
+        jump=jump,
+        mode=mode,
+    )
+
+
+class _FSHeader(NamedTuple):
+    min_frequency: float
+    max_frequency: float
+
+
+def _read_fs_header(filename: Path) -> _FSHeader | None:
+    min_frequency: float = np.nan
+    max_frequency: float = np.nan
+    if (filename_fmd := filename.with_suffix(".fmd")).exists():
+        with open(filename_fmd) as f_in:
+            line: str
+            for line in f_in:
+                if line and not line.startswith("*"):
+                    t = list(map(lambda w: w.strip(), line.split(":", maxsplit=1)))
+                    if len(t) > 1:
+                        if t[0].lower() == "FStart [GHz]".lower():
+                            min_frequency = float(t[1]) * 1e6
+                        elif t[0].lower() == "FStop [GHz]".lower():
+                            max_frequency = float(t[1]) * 1e6
+    else:
+        return None
+    if (
+        not np.isnan(min_frequency)
+        and not np.isnan(max_frequency)
+        and filename.with_suffix(".frd").exists()
+    ):
+        return _FSHeader(min_frequency, max_frequency)
+    return None
+
+
+def _fs_chunks(f_in: BinaryIO) -> Iterator[NDArray[np.float64]]:
+    block: bytes
+    for block in _line_blocks(f_in):
+        if block.strip():
+            yield np.loadtxt(BytesIO(block), usecols=(0,), ndmin=1) * 1e-3
+
+
+def load_data_fs(filename: Path) -> FSData:
+    header: _FSHeader | None = _read_fs_header(filename)
+    if header is None:
+        return FSData()
+    with open(filename.with_suffix(".frd"), "rb") as f_in:
+        parts: list[NDArray[np.float64]] = list(_fs_chunks(f_in))
+    y: NDArray[np.float64] = np.concatenate(parts) if parts else np.empty(0)
+    x: NDArray[np.float64] = np.linspace(
+        header.min_frequency,
+        header.max_frequency,
+        num=y.size,
+        endpoint=False,
+        dtype=np.float64,
+    )
+    return FSData(x, y)
+
+
+class _ScandatHeader(NamedTuple):
+    min_frequency: float
+    frequency_step: float
+    frequency_jump: float
+    bias_offset: float
+    cell_length: float
+    # the number of values per data row, if it is fixed
+    columns: int | None
+    # removes the trailing lines that are not data
+    trim: Callable[[bytes], bytes] | None
+
+
+def _read_scandat_header(f_in: BinaryIO) -> _ScandatHeader:
+    """Read the header of a `.scandat` file, leaving the file at the start of the data."""
+    first_line: bytes = f_in.readline()
+    lines: list[bytes]
+
+    if first_line.startswith(b"*****"):
+        # the values follow the lines with the keys
+        keys: tuple[bytes, ...] = (
+            b"F(start) [MHz]:",
+            b"F(stept) [MHz]:",
+            b"F(jump) [MHz]:",
+            b"U - shift:",
+            b"Length of Cell:",
+        )
+        header: dict[bytes, bytes] = {}
+        key: bytes = b""
+        line: bytes
+        while line := f_in.readline():
+            if key:
+                header.setdefault(key, line)
+            if line.startswith(b"Finish"):
+                break
+            key = next(filter(line.startswith, keys), b"")
+        return _ScandatHeader(
+            min_frequency=float(header[b"F(start) [MHz]:"]) * 1e3,
+            frequency_step=float(header[b"F(stept) [MHz]:"]) * 1e3,
+            frequency_jump=float(header[b"F(jump) [MHz]:"]) * 1e3,
+            bias_offset=float(header[b"U - shift:"]),
+            cell_length=float(header[b"Length of Cell:"]),
+            columns=None,
+            trim=lambda text: _drop_last_lines(text, 2),
+        )
+    if first_line.startswith(b"   Spectrometer(PhSw)-2014   "):
+        lines = [first_line, *(f_in.readline() for _ in range(31))]
+        return _ScandatHeader(
+            min_frequency=float(lines[14]) * 1e3,
+            frequency_step=float(lines[16]) * 1e3,
+            frequency_jump=float(lines[2]) * 1e3,
+            cell_length=float(lines[25]),
+            bias_offset=float(lines[26]),
+            # the voltage and the bias values alternate line by line
+            columns=2,
+            trim=lambda text: (
+                _drop_last_lines(text, 2)
+                if text == b"0" or text.endswith(b"\n0")
+                else text
+            ),
+        )
+    if first_line.startswith(b"   Spectrometer(PhSw)   "):
+        lines = [first_line, *(f_in.readline() for _ in range(29))]
+        return _ScandatHeader(
+            min_frequency=float(lines[12]) * 1e3,
+            frequency_step=float(lines[14]) * 1e3,
+            frequency_jump=float(lines[2]) * 1e3,
+            cell_length=float(lines[23]),
+            bias_offset=float(lines[24]),
+            columns=None,
+            trim=lambda text: (
+                _drop_last_lines(text, 1)
+                if _last_line(text).split()[-1:] == [b"0"]
+                else text
+            ),
+        )
+    lines = [first_line, *(f_in.readline() for _ in range(30))]
+    return _ScandatHeader(
+        min_frequency=float(lines[13]) * 1e3,
+        frequency_step=float(lines[15]) * 1e3,
+        frequency_jump=float(lines[2]) * 1e3,
+        cell_length=float(lines[24]),
+        bias_offset=float(lines[25]),
+        # the voltage and the bias values alternate line by line
+        columns=2,
+        trim=None,
+    )
+
+
+def _valid_cell_length(
+    cell_length: float, ask_cell_length: Callable[[float], float] | None
+) -> float:
+    if cell_length > 0.0:
+        return cell_length
+    if ask_cell_length is None:
+        raise ValueError(f"Invalid cell length: {cell_length} cm")
+    return ask_cell_length(cell_length)
+
+
+def _scandat_chunks(
+    f_in: BinaryIO, header: _ScandatHeader, cell_length: float
+) -> Iterator[PSKData]:
+    start: int = 0
+    data: NDArray[np.float64]
+    for data in _rows(_line_blocks(f_in, header.trim), header.columns):
+        y: NDArray[np.float64] = data[:, 0] * 1e-3
+        bias: NDArray[np.float64] = header.bias_offset - data[:, 1]
+        x: NDArray[np.float64] = (
+            np.arange(start, start + y.size, dtype=float) * header.frequency_step
+            + header.min_frequency
+        )
+        start += y.size
+        yield PSKData(
+            frequency=x,
+            voltage=y,
+            absorption=y / bias / cell_length / VOLTAGE_GAIN,
+            jump=header.frequency_jump,
+            mode=XValues.frequency,
+        )
+
+
+def load_data_scandat(
+    filename: Path, ask_cell_length: Callable[[float], float] | None = None
+) -> PSKData:
+    """Load the data from a `.scandat` file.
+
+    :param filename: The file to load the data from.
+    :param ask_cell_length: The function to get a valid cell length
+        instead of the invalid one found in the file.
+    :return: The data loaded.
+    :raises ValueError: If the cell length is invalid and `ask_cell_length` is omitted.
+    """
+    with open(filename, "rb") as f_in:
+        header: _ScandatHeader = _read_scandat_header(f_in)
+        return _joined(
+            _scandat_chunks(
+                f_in, header, _valid_cell_length(header.cell_length, ask_cell_length)
+            ),
+            jump=header.frequency_jump,
+            mode=XValues.frequency,
+        )
+
+
+def _digit_lines(text: bytes) -> bytes:
+    """Keep only the lines that start with a digit."""
+    buffer: NDArray[np.uint8] = np.frombuffer(text, dtype=np.uint8)
+    line_starts: NDArray[np.intp] = np.flatnonzero(buffer == ord("\n")) + 1
+    line_starts = np.concatenate(([0], line_starts[line_starts < buffer.size]))
+    first_bytes: NDArray[np.uint8] = buffer[line_starts]
+    good: NDArray[np.bool_] = (first_bytes >= ord("0")) & (first_bytes <= ord("9"))
+    if np.all(good):
+        return text
+    line_ends: NDArray[np.intp] = np.append(line_starts[1:], buffer.size)
+    # +1 where a good line starts and −1 where it ends
+    marks: NDArray[np.int8] = np.zeros(buffer.size + 1, dtype=np.int8)
+    marks[line_starts[good]] = 1
+    marks[line_ends[good]] -= 1
+    return buffer[np.cumsum(marks[:-1], dtype=np.int8).astype(np.bool_)].tobytes()
+
+
+def time_to_seconds(s: str) -> float:
+    r: float = 0.0
+    for p in s.split(":"):
+        r = r * 60.0 + float(p)
+    return r
+
+
+class _CSVHeader(NamedTuple):
+    jump: float
+    mode: XValues
+    frequency_column: int
+    voltage_column: int
+    absorption_column: int
+    time_column: int
+
+
+def _read_csv_header(filename: Path) -> _CSVHeader | None:
+    """Read the header of the `.csv` data and the `.conf` file going with it.
+
+    :raises ValueError: If the files lack the required fields.
+    """
+    if not (
+        (filename_csv := filename.with_suffix(".csv")).exists()
+        and (filename_conf := filename.with_suffix(".conf")).exists()
+    ):
+        return None
+    try:
+        lines: list[str]
+        with open(filename_conf) as f_in:
+            lines = f_in.readlines()
+            mode: XValues = (
+                XValues.frequency
+                if "frequency trend" in lines[0].casefold()
+                else XValues.time
+            )
+            frequency_jump: float = (
+                float(
+                    next(
+                        filter(
+                            lambda line: line.startswith("F(jump) [MHz]:"),
+                            lines,
+                        )
+                    ).split()[-1]
+                )
+                * 1e3
+            )
+        first_line: bytes
+        with open(filename_csv, "rb") as f_in:
+            first_line = f_in.readline()
+        header: list[str] = (
+            first_line.decode(errors="replace").split()
+            if not first_line[:1].isdigit()
+            else []
+        )
+        if header:
+            time_column = header.index(
+                next(filter(lambda title: title.casefold().startswith("time"), header))
+            )
+            frequency_column = header.index(
+                next(
+                    filter(
+                        lambda title: title.casefold().startswith("frequency"), header
+                    )
+                )
+            )
+            voltage_column = header.index(
+                next(
+                    filter(
+                        lambda title: title.casefold().startswith("amplitude"), header
+                    )
+                )
+            )
+            absorption_column = header.index(
+                next(filter(lambda title: title.casefold().startswith("gamma"), header))
+            )
+        else:
+            # as the last resort
+            frequency_column = 1
+            voltage_column = 2
+            absorption_column = 4
+            time_column = -1
+        return _CSVHeader(
+            jump=frequency_jump,
+            mode=mode,
+            frequency_column=frequency_column,
+            voltage_column=voltage_column,
+            absorption_column=absorption_column,
+            time_column=time_column,
+        )
+    except StopIteration:
+        raise ValueError(f"Invalid header of {filename}") from None
+
+
+def _csv_chunks(f_in: BinaryIO, header: _CSVHeader) -> Iterator[PSKData]:
+    usecols: tuple[int, ...] = ()
+    time_parts: int = 0
+    text: bytes
+    for text in _line_blocks(f_in):
+        # the header and the comments get skipped here
+        text = _digit_lines(text)
+        if not text:
+            continue
+        if not usecols:
+            first_line: list[bytes] = _first_line(text).split()
+            # make the column indices non-negative
+            time_column: int = header.time_column % len(first_line)
+            frequency_column: int = header.frequency_column % len(first_line)
+            voltage_column: int = header.voltage_column % len(first_line)
+            absorption_column: int = header.absorption_column % len(first_line)
+            # split the time values at the colons into separate columns
+            time_parts = first_line[time_column].count(b":") + 1
+            usecols = (
+                *(
+                    column + time_parts - 1 if column > time_column else column
+                    for column in (frequency_column, voltage_column, absorption_column)
+                ),
+                *range(time_column, time_column + time_parts),
+            )
+        text = text.translate(bytes.maketrans(b":", b" "))
+        columns: NDArray[np.double] = np.loadtxt(
+            BytesIO(text), usecols=usecols, ndmin=2
+        )
+        del text
+        frequency: NDArray[np.double] = columns[:, 0] * 1e6
+        voltage: NDArray[np.double] = columns[:, 1] * 1e-3
+        absorption: NDArray[np.double] = columns[:, 2].copy()
+        # the same sequence of operations as in `time_to_seconds`
+        time: NDArray[np.double] = np.zeros(columns.shape[0])
+        for part in range(3, 3 + time_parts):
+            time *= 60.0
+            time += columns[:, part]
+        del columns
+        yield PSKData(
+            frequency=frequency,
+            voltage=voltage,
+            absorption=absorption,
+            time=time,
+            jump=header.jump,
+            mode=header.mode,
+        )
+
+
+def load_data_csv(filename: Path) -> PSKData:
+    header: _CSVHeader | None = _read_csv_header(filename)
+    if header is None:
+        return PSKData()
+    with open(filename.with_suffix(".csv"), "rb") as f_in:
+        return _joined(_csv_chunks(f_in, header), jump=header.jump, mode=header.mode)
+
+
+def _data_mode(data: PSKData) -> DataMode:
+    f, v, _, t, jump, m = data
+    if m == XValues.frequency and f.size and v.size:
+        return DataMode.PSK_WITH_JUMP if jump > 0.0 else DataMode.PSK
+    if m == XValues.time and t.size and v.size:
+        return DataMode.TIME_DOMAIN
+    return DataMode.unknown
+
+
+def load_data(
+    filename: str | PathLike[str],
+    ask_cell_length: Callable[[float], float] | None = None,
+) -> SpectrometerData | None:
+    """Load the data from any supported file.
+
+    :param filename: The file to load the data from.
+    :param ask_cell_length: The function to get a valid cell length
+        instead of the invalid one found in a `.scandat` file.
+        Without it, an invalid cell length raises `ValueError`.
+    :return: The data loaded or `None` for an unsupported file.
+    """
+    v: NDArray[np.float64]
+    f: NDArray[np.float64]
+    g: NDArray[np.float64] = np.empty(0)
+    t: NDArray[np.float64] = np.empty(0)
+    data_mode: DataMode = DataMode.unknown
+    if not isinstance(filename, Path):
+        filename = Path(filename)
+
+    from .data_cache import cache_data, cached_data
+
+    if (data := cached_data(filename)) is not None:
+        return data
+
+    psk_data: PSKData
+    if filename.suffix.casefold() == ".scandat":
+        psk_data = load_data_scandat(filename, ask_cell_length)
+        f, v, g, t, *_ = psk_data
+        data_mode = _data_mode(psk_data)
+    elif filename.suffix.casefold() in (".csv", ".conf"):
+        psk_data = load_data_csv(filename)
+        f, v, g, t, *_ = psk_data
+        data_mode = _data_mode(psk_data)
+    elif filename.suffix.casefold() in (".fmd", ".frd"):
+        f, v = load_data_fs(filename)
+        if f.size and v.size:
+            data_mode = DataMode.FS
+    else:
+        return None
+
+    data = SpectrometerData(filename, f, g, v, t, data_mode)
+    cache_data(data)
+    return data
+
+
+def _accumulated(
+    chunks: Iterable[tuple[NDArray[np.float64], ...]],
+) -> Iterator[tuple[NDArray[np.float64], ...]]:
+    """Yield the concatenation of the chunks received so far.
+
+    The arrays grow geometrically, so that the total copying stays linear.
+    The last item holds arrays of the exact size.
+    """
+    buffers: list[NDArray[np.float64]] = []
+    sizes: list[int] = []
+    chunk: tuple[NDArray[np.float64], ...]
+    for chunk in chunks:
+        if not buffers:
+            buffers = [np.empty(0) for _ in chunk]
+            sizes = [0] * len(chunk)
+        index: int
+        values: NDArray[np.float64]
+        for index, values in enumerate(chunk):
+            end: int = sizes[index] + values.size
+            if end > buffers[index].size:
+                grown: NDArray[np.float64] = np.empty(max(end, 2 * buffers[index].size))
+                grown[: sizes[index]] = buffers[index][: sizes[index]]
+                buffers[index] = grown
+            buffers[index][sizes[index] : end] = values
+            sizes[index] = end
+        yield tuple(buffer[:size] for buffer, size in zip(buffers, sizes, strict=True))
+    if any(buffer.size != size for buffer, size in zip(buffers, sizes, strict=True)):
+        yield tuple(
+            buffer[:size].copy() for buffer, size in zip(buffers, sizes, strict=True)
+        )
+
+
+def stream_data(
+    filename: str | PathLike[str],
+    ask_cell_length: Callable[[float], float] | None = None,
+    use_cache: bool = True,
+) -> Iterator[tuple[SpectrometerData, float]] | None:
+    """Load the data portion by portion.
+
+    Nothing is read until the iteration starts, so it might go in a separate thread.
+    Every item is the data loaded so far along with the loaded fraction of the file,
+    the last item holding the same data as `load_data` returns.
+
+    :param filename: The file to load the data from.
+    :param ask_cell_length: The function to get a valid cell length
+        instead of the invalid one found in a `.scandat` file.
+        Without it, an invalid cell length raises `ValueError`.
+    :param use_cache: Whether to take the data from the cache and to store them there.
+    :return: The iterator over the data loaded so far or `None` for an unsupported file.
+    """
+    if not isinstance(filename, Path):
+        filename = Path(filename)
+    if filename.suffix.casefold() not in (".scandat", ".csv", ".conf", ".fmd", ".frd"):
+        return None
+
+    from .data_cache import cache_data, cached_data
+
+    def psk_snapshots(
+        f_in: BinaryIO, chunks: Iterator[PSKData], jump: float, m: XValues
+    ) -> Iterator[tuple[SpectrometerData, float]]:
+        file_size: int = max(1, fstat(f_in.fileno()).st_size)
+        data: SpectrometerData = SpectrometerData(filename)
+        f: NDArray[np.float64]
+        v: NDArray[np.float64]
+        g: NDArray[np.float64]
+        t: NDArray[np.float64]
+        for f, v, g, t in _accumulated(
+            (chunk.frequency, chunk.voltage, chunk.absorption, chunk.time)
+            for chunk in chunks
+        ):
+            data = SpectrometerData(
+                filename, f, g, v, t, _data_mode(PSKData(f, v, g, t, jump, m))
+            )
+            yield data, min(1.0, f_in.tell() / file_size)
+        if data.mode == DataMode.unknown:
+            yield data, 1.0
+        if use_cache:
+            cache_data(data)
+
+    def fs_snapshots(
+        f_in: BinaryIO, header: _FSHeader
+    ) -> Iterator[tuple[SpectrometerData, float]]:
+        file_size: int = max(1, fstat(f_in.fileno()).st_size)
+        v: NDArray[np.float64] = np.empty(0)
+        for (v,) in _accumulated((chunk,) for chunk in _fs_chunks(f_in)):
+            progress: float = min(1.0, f_in.tell() / file_size)
+            # the frequency step is unknown until the whole file is read
+            expected_size: float = v.size / max(progress, 1.0 / file_size)
+            yield (
+                SpectrometerData(
+                    filename,
+                    np.arange(v.size)
+                    * ((header.max_frequency - header.min_frequency) / expected_size)
+                    + header.min_frequency,
+                    np.empty(0),
+                    v,
+                    np.empty(0),
+                    DataMode.FS,
+                ),
+                progress,
+            )
+        f: NDArray[np.float64] = np.linspace(
+            header.min_frequency,
+            header.max_frequency,
+            num=v.size,
+            endpoint=False,
+            dtype=np.float64,
+        )
+        data: SpectrometerData = SpectrometerData(
+            filename,
+            f,
+            np.empty(0),
+            v,
+            np.empty(0),
+            DataMode.FS if f.size and v.size else DataMode.unknown,
+        )
+        yield data, 1.0
+        if use_cache:
+            cache_data(data)
+
+    def snapshots() -> Iterator[tuple[SpectrometerData, float]]:
+        if use_cache and (data := cached_data(filename)) is not None:
+            yield data, 1.0
+            return
+
+        f_in: BinaryIO
+        if filename.suffix.casefold() == ".scandat":
+            with open(filename, "rb") as f_in:
+                scandat_header: _ScandatHeader = _read_scandat_header(f_in)
+                cell_length: float = _valid_cell_length(
+                    scandat_header.cell_length, ask_cell_length
+                )
+                yield from psk_snapshots(
+                    f_in,
+                    _scandat_chunks(f_in, scandat_header, cell_length),
+                    jump=scandat_header.frequency_jump,
+                    m=XValues.frequency,
+                )
+        elif filename.suffix.casefold() in (".csv", ".conf"):
+            csv_header: _CSVHeader | None = _read_csv_header(filename)
+            if csv_header is None:
+                yield SpectrometerData(filename), 1.0
+                return
+            with open(filename.with_suffix(".csv"), "rb") as f_in:
+                yield from psk_snapshots(
+                    f_in,
+                    _csv_chunks(f_in, csv_header),
+                    jump=csv_header.jump,
+                    m=csv_header.mode,
+                )
+        else:
+            fs_header: _FSHeader | None = _read_fs_header(filename)
+            if fs_header is None:
+                yield SpectrometerData(filename), 1.0
+                return
+            with open(filename.with_suffix(".frd"), "rb") as f_in:
+                yield from fs_snapshots(f_in, fs_header)
+
+    return snapshots()
@@ -1,11 +1,37 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import pairwise
+from threading import Lock, Thread
 from typing import Final, cast
 
 import numpy as np
 from numpy.typing import NDArray
 
-__all__ = ["LINE_WIDTH", "correlation", "peaks_positions"]
+__all__ = [
+    "LINE_WIDTH",
+    "PeakSelector",
+    "butter_sos",
+    "correlate",
+    "correlation",
+    "island_maxima",
+    "peaks_positions",
+    "resampled_model_signal",
+    "rolling_std",
+    "warm_up",
+]
 
 LINE_WIDTH: Final[float] = 2.6e6
+# the step of the line model samples
+MODEL_SIGNAL_STEP: Final[float] = 0.1
+# the shortest data to be split for the parallel processing
+MIN_SEGMENT_SIZE: Final[int] = 1 << 18
+# the order and the cut-off frequencies relative to the Nyquist frequency
+# of the filter applied before the correlation: a high-pass at 0.5% of the sampling rate
+FILTER_BAND: Final[tuple[int, float, float]] = (5, 0.01, np.inf)
+
+_warm_up_lock: Lock = Lock()
+_warm_up_thread: Thread | None = None
 
 
 def remove_spikes(sequence: NDArray[np.bool], iterations: int = 1) -> NDArray[np.bool]:
@@ -16,80 +42,382 @@ def remove_spikes(sequence: NDArray[np.bool], iterations: int = 1) -> NDArray[np
     return ndimage.binary_dilation(sequence, iterations=1)
 
 
+@lru_cache(maxsize=16)
+def butter_sos(order: int, low: float, high: float) -> NDArray[np.float64]:
+    """Design a Butterworth filter once for the given band, in the second-order sections.
+
+    :param order: The order of the filter.
+    :param low: The lower cut-off frequency relative to the Nyquist frequency.
+    :param high: The upper cut-off frequency relative to the Nyquist frequency.
+    :return: The second-order sections of the filter, shared among the callers.
+    """
+    from scipy.signal import butter
+
+    sos: NDArray[np.float64]
+    if low > 0.0 and high < 1.0:
+        sos = cast(
+            NDArray[np.float64],
+            cast(object, butter(order, [low, high], btype="bandpass", output="sos")),
+        )
+    elif low > 0.0 and high >= 1.0:
+        sos = cast(
+            NDArray[np.float64],
+            cast(object, butter(order, low, btype="highpass", output="sos")),
+        )
+    elif low <= 0.0 and high < 1.0:
+        sos = cast(
+            NDArray[np.float64],
+            cast(object, butter(order, high, btype="lowpass", output="sos")),
+        )
+    else:
+        raise ValueError
+    return sos
+
+
+@lru_cache(maxsize=16)
+def settling_length(order: int, low: float, high: float) -> int:
+    """Get the number of samples the response of a `butter_sos` filter fades out in.
+
+    Filtering that many samples before a segment of data gives the same result
+    for the segment as filtering the data from the start does, to the round-off error.
+    """
+    from scipy.signal import sosfilt
+
+    sos: NDArray[np.float64] = butter_sos(order, low, high)
+    length: int = 1024
+    while True:
+        impulse: NDArray[np.float64] = np.zeros(length)
+        impulse[0] = 1.0
+        response: NDArray[np.float64] = np.abs(sosfilt(sos, impulse))
+        significant: NDArray[np.intp] = np.flatnonzero(
+            response > np.finfo(np.float64).eps * np.max(response)
+        )
+        if significant[-1] < length // 2:
+            return int(significant[-1]) + 1
+        length *= 2
+
+
+def in_segments(
+    function: Callable[[int, int], NDArray[np.float64]], size: int, workers: int
+) -> NDArray[np.float64]:
+    """Call `function(start, stop)` for the consecutive segments of `range(size)` and join the results.
+
+    The segments depend on `size` only, not on `workers`,
+    so the result is the same to the bit however many threads process the segments.
+    The segments are processed in `workers` threads, since NumPy and SciPy release the GIL.
+    The data shorter than `2 * MIN_SEGMENT_SIZE` are not split.
+    """
+    count: int = max(1, size // MIN_SEGMENT_SIZE)
+    if count == 1:
+        return function(0, size)
+    bounds: list[tuple[int, int]] = list(
+        pairwise(size * index // count for index in range(count + 1))
+    )
+    if workers <= 1:
+        return np.concatenate([function(*segment) for segment in bounds])
+    with ThreadPoolExecutor(max_workers=min(workers, count)) as executor:
+        return np.concatenate(
+            list(executor.map(lambda segment: function(*segment), bounds))
+        )
+
+
+def correlate(
+    data: NDArray[np.float64], model: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    """Get the same as `np.correlate(data, model, "same")` does, but faster.
+
+    For a long model, the correlation is computed via FFT by overlapping blocks.
+    """
+    from scipy.signal import choose_conv_method, oaconvolve
+
+    if model.size > data.size or choose_conv_method(data, model, mode="same") != "fft":
+        return np.correlate(data, model, "same")
+    # for real data, the correlation is the convolution with the reversed model
+    start: int = (model.size - 1) // 2
+    return cast(
+        NDArray[np.float64],
+        oaconvolve(data, model[::-1], mode="full")[start : start + data.size],
+    )
+
+
+def resampled_model_signal(
+    model_y: NDArray[np.float64], step: float
+) -> NDArray[np.float64]:
+    """Re-scale the model signal to the frequency mesh of the given step."""
+    x_model: NDArray[np.float64] = (
+        np.arange(model_y.size, dtype=np.float64) * MODEL_SIGNAL_STEP
+    )
+    x_model_new: NDArray[np.float64] = np.arange(x_model[0], x_model[-1], step)
+    return np.interp(x_model_new, x_model, model_y)
+
+
 def correlation(
     model_y: NDArray[np.float64],
     another_x: NDArray[np.float64],
     another_y: NDArray[np.float64],
+    workers: int = 1,
 ) -> NDArray[np.float64]:
-    from scipy.signal import butter, sosfilt
-
-    def butter_bandpass_filter(
-        data: NDArray[np.float64], low_cut: float, high_cut: float, order: int = 5
-    ) -> NDArray[np.float64]:
-        def butter_bandpass() -> NDArray[np.float64]:
-            nyq: float = 0.5 * fs
-            low: float = low_cut / nyq
-            high: float = high_cut / nyq
-            if low > 0.0 and high < fs:
-                return cast(
-                    NDArray[np.float64],
-                    cast(
-                        object,
-                        butter(order, [low, high], btype="bandpass", output="sos"),
-                    ),
-                )
-            if low > 0.0 and high >= fs:
-                return cast(
-                    NDArray[np.float64],
-                    cast(object, butter(order, low, btype="highpass", output="sos")),
-                )
-            if low <= 0.0 and high < fs:
-                return cast(
-                    NDArray[np.float64],
-                    cast(object, butter(order, high, btype="lowpass", output="sos")),
-                )
-            raise ValueError
-
-        return cast(NDArray[np.float64], sosfilt(butter_bandpass(), data))
+    """Correlate the filtered data with the model.
+
+    :param model_y: The model signal on the frequency mesh of the data.
+    :param another_x: The frequencies of the data, equally spaced.
+    :param another_y: The data to correlate with the model.
+    :param workers: The number of threads to process the segments of long data in.
+    :return: The correlation normalized to zero mean and unit standard deviation.
+    """
+    from scipy.signal import sosfilt
+
+    def butter_bandpass_filter(data: NDArray[np.float64]) -> NDArray[np.float64]:
+        return cast(NDArray[np.float64], sosfilt(butter_sos(*FILTER_BAND), data))
+
+    def correlated_segment(start: int, stop: int) -> NDArray[np.float64]:
+        # the correlation near the edges of the segment depends on the data around it
+        data_start: int = max(0, start - model_y.size)
+        data_stop: int = min(another_y.size, stop + model_y.size)
+        # the filter needs the data before the segment to settle
+        filter_start: int = max(0, data_start - settling_length(*FILTER_BAND))
+        filtered: NDArray[np.float64] = butter_bandpass_filter(
+            another_y[filter_start:data_stop]
+        )[data_start - filter_start :]
+        return correlate(filtered, model_y)[start - data_start : stop - data_start]
 
     if another_y.size:
-        fs: float = 1.0 / (another_x[1] - another_x[0])
-        another_y_filtered: NDArray[np.float64] = butter_bandpass_filter(
-            another_y, low_cut=0.005 * fs, high_cut=np.inf, order=5
-        )
-        _corr: NDArray[np.float64] = np.correlate(another_y_filtered, model_y, "same")
+        _corr: NDArray[np.float64]
+        if model_y.size > another_y.size:
+            _corr = correlate(butter_bandpass_filter(another_y), model_y)
+        else:
+            _corr = in_segments(correlated_segment, another_y.size, workers)
         _corr -= np.mean(_corr)
         _corr /= np.std(_corr)
         return _corr
     return np.empty(0)
 
 
+def _rolling_sum(
+    values: NDArray[np.float64], window: int, compensated: bool
+) -> NDArray[np.float64]:
+    """Get the sums of `values` over the windows via the cumulative sum.
+
+    If `compensated`, the rounding errors of the cumulative sum are found and summed, too.
+    """
+    prefix: NDArray[np.float64] = np.empty(values.size + 1)
+    prefix[0] = 0.0
+    np.cumsum(values, out=prefix[1:])
+    sums: NDArray[np.float64] = prefix[window:] - prefix[:-window]
+    if compensated:
+        # the rounding error of every addition, found exactly
+        added: NDArray[np.float64] = np.subtract(prefix[1:], prefix[:-1])
+        errors: NDArray[np.float64] = np.subtract(prefix[1:], added)
+        np.subtract(prefix[:-1], errors, out=errors)
+        np.subtract(values, added, out=added)
+        errors += added
+        del added
+        np.cumsum(errors, out=prefix[1:])
+        sums += np.subtract(prefix[window:], prefix[:-window], out=errors[: sums.size])
+    return sums
+
+
+def _rolling_std(
+    data: NDArray[np.float64], window: int, compensated: bool, offset: float
+) -> NDArray[np.float64]:
+    """Get the rolling standard deviation of `data - offset` the way `rolling_std` describes."""
+    std: NDArray[np.float64] = np.full(data.size, np.nan)
+    if window > data.size:
+        return std
+
+    missing: NDArray[np.bool] = np.isnan(data)
+    any_missing: bool = bool(np.any(missing))
+    if any_missing and np.all(missing):
+        return std
+    values: NDArray[np.float64] = data - offset
+    if any_missing:
+        values[missing] = 0.0
+
+    variance: NDArray[np.float64] = _rolling_sum(values, window, compensated)
+    variance *= variance
+    variance /= window
+    np.square(values, out=values)
+    variance = np.subtract(
+        _rolling_sum(values, window, compensated), variance, out=variance
+    )
+    del values
+    variance /= window - 1
+    # the rounding errors might make the variance negative
+    np.maximum(variance, 0.0, out=variance)
+    if any_missing:
+        missing_count: NDArray[np.intp] = np.concatenate(([0], np.cumsum(missing)))
+        variance[missing_count[window:] > missing_count[:-window]] = np.nan
+
+    start: int = window // 2
+    np.sqrt(variance, out=std[start : start + variance.size])
+    return std
+
+
+def rolling_std(
+    data: NDArray[np.float64],
+    window: int,
+    compensated: bool = False,
+    workers: int = 1,
+) -> NDArray[np.float64]:
+    """Get the same as `pd.Series(data).rolling(window, center=True).std().to_numpy()` does.
+
+    The windows that do not fit into the data or contain NaNs give NaN.
+    The long data are processed in segments, the same for any number of `workers`.
+
+    :param data: The data to get the standard deviation of.
+    :param window: The number of the data points in a window.
+    :param compensated: Whether to sum the data up more accurately, but slower.
+    :param workers: The number of threads to process the segments of long data in.
+    :return: The standard deviation of the data in the window centered at each point.
+    """
+    if window < 2 or window > data.size:
+        return np.full(data.size, np.nan)
+    missing: NDArray[np.bool] = np.isnan(data)
+    any_missing: bool = bool(np.any(missing))
+    if any_missing and np.all(missing):
+        return np.full(data.size, np.nan)
+    # the standard deviation does not depend on the mean, but the rounding errors do,
+    # so every segment is shifted by the same value
+    offset: float = float(np.mean(data[~missing] if any_missing else data))
+
+    def segment_std(start: int, stop: int) -> NDArray[np.float64]:
+        data_start: int = max(0, start - window // 2)
+        data_stop: int = min(data.size, stop - window // 2 + window)
+        return _rolling_std(data[data_start:data_stop], window, compensated, offset)[
+            start - data_start : stop - data_start
+        ]
+
+    return in_segments(segment_std, data.size, workers)
+
+
+def island_maxima(
+    data: NDArray[np.float64], islands: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    """Find the first maximum of `data[start:stop]` for every `(start, stop)` island.
+
+    The maxima at the very starts of the islands are skipped.
+    Like `np.argmax`, the first NaN is considered to be the maximum.
+
+    :param data: The data to look for the maxima in.
+    :param islands: The sorted non-overlapping ranges of the data, an island per row.
+    :return: The indices of the maxima in the data.
+    """
+    if not islands.size:
+        return np.empty(0, dtype=np.int64)
+    starts: NDArray[np.int64] = islands[:, 0]
+    lengths: NDArray[np.int64] = islands[:, 1] - starts
+    maxima: NDArray[np.float64] = np.maximum.reduceat(data, islands.ravel())[::2]
+    # the islands joined together, and where each of them starts there
+    offsets: NDArray[np.int64] = np.cumsum(lengths) - lengths
+    joined: NDArray[np.float64] = data[
+        np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+    ]
+    joined_maxima: NDArray[np.float64] = np.repeat(maxima, lengths)
+    is_maximum: NDArray[np.bool] = (joined == joined_maxima) | (
+        np.isnan(joined) & np.isnan(joined_maxima)
+    )
+    maxima_positions: NDArray[np.intp] = np.flatnonzero(is_maximum)
+    # the first maximum of each island
+    first_maxima: NDArray[np.int64] = (
+        maxima_positions[np.searchsorted(maxima_positions, offsets)] - offsets
+    )
+    return (starts + first_maxima)[first_maxima != 0]
+
+
+class PeakSelector:
+    """The peaks of the data prepared to be selected by various thresholds.
+
+    The rolling standard deviation of the data and its sorted values are computed once,
+    so only the regions above the cut-off get found for each threshold.
+    """
+
+    def __init__(
+        self,
+        data_x: NDArray[np.float64],
+        data_y: NDArray[np.float64],
+        workers: int = 1,
+    ) -> None:
+        """Compute the rolling standard deviation of the data and sort it.
+
+        :param data_x: The frequencies of the data, equally spaced.
+        :param data_y: The data to look for the peaks in.
+        :param workers: The number of threads to process the segments of long data in.
+        """
+        self._data_y: NDArray[np.float64] = data_y
+        self._std: NDArray[np.float64]
+        if data_x.size < 2 or data_y.size < 2:
+            self._std = np.empty(0)
+        else:
+            self._std = rolling_std(
+                data_y,
+                int(round(LINE_WIDTH / (data_x[1] - data_x[0]))),
+                workers=workers,
+            )
+        # the table to get the quantiles from
+        self._sorted_std: NDArray[np.float64] = np.sort(self._std[~np.isnan(self._std)])
+
+    def cutoff(self, threshold: float) -> float:
+        """Get the same as `np.nanquantile(std, 1.0 - threshold)` does, but faster."""
+        quantile: float = 1.0 - threshold
+        if not (0.0 <= quantile <= 1.0):
+            raise ValueError("Quantiles must be in the range [0, 1]")
+        if not self._sorted_std.size:
+            return np.nan
+        # interpolate linearly exactly the way NumPy does
+        virtual_index: float = (self._sorted_std.size - 1) * quantile
+        previous_index: int = min(
+            int(np.floor(virtual_index)), self._sorted_std.size - 1
+        )
+        next_index: int = min(previous_index + 1, self._sorted_std.size - 1)
+        gamma: float = virtual_index - previous_index
+        previous_value: float = self._sorted_std[previous_index]
+        next_value: float = self._sorted_std[next_index]
+        difference: float = next_value - previous_value
+        if gamma >= 0.5:
+            return next_value - difference * (1 - gamma)
+        return previous_value + difference * gamma
+
+    def select(self, threshold: float = 0.0046228) -> NDArray[np.int64]:
+        """Find the peaks that stand out at the given threshold.
+
+        :param threshold: The share of the data to consider as the regions of peaks.
+        :return: The indices of the peaks in the data.
+        """
+        if self._std.size < 2:
+            # nothing to do
+            return np.empty(0, dtype=np.int64)
+
+        match: NDArray[np.bool] = np.asarray(self._std >= self.cutoff(threshold))
+        match = remove_spikes(match, iterations=8)
+        match[0] = match[-1] = False
+        islands: NDArray[np.int64] = np.argwhere(np.diff(match)).reshape(-1, 2)
+        return island_maxima(self._data_y, islands)
+
+
 def peaks_positions(
     data_x: NDArray[np.float64],
     data_y: NDArray[np.float64],
     threshold: float = 0.0046228,
 ) -> NDArray[np.int64]:
-    import pandas as pd  # type: ignore
+    return PeakSelector(data_x, data_y).select(threshold)
 
-    if data_x.size < 2 or data_y.size < 2:
-        # nothing to do
-        return np.empty(0, dtype=np.int64)
 
-    std: NDArray[np.float64] = (
-        pd.Series(data_y)
-        .rolling(int(round(LINE_WIDTH / (data_x[1] - data_x[0]))), center=True)
-        .std()
-        .to_numpy()
-    )
-    match: NDArray[np.bool] = np.asarray(std >= np.nanquantile(std, 1.0 - threshold))
-    match = remove_spikes(match, iterations=8)
-    match[0] = match[-1] = False
-    islands: NDArray[np.int64] = np.argwhere(np.diff(match)).reshape(-1, 2)
-    peaks: NDArray[np.int64] = np.array(
-        [
-            i[0] + np.argmax(data_y[i[0] : i[1]])
-            for i in islands
-            if (np.argmax(data_y[i[0] : i[1]]) not in (0, i[1] - i[0]))
-        ]
-    )
-    return peaks
+def warm_up() -> None:
+    """Import SciPy and design the filter for the line search in a background thread.
+
+    Importing SciPy takes a while, so the first search would stall for it otherwise.
+    The functions above import what they need anyway, so calling this is optional.
+    """
+
+    def prepare() -> None:
+        # noinspection PyUnresolvedReferences
+        import scipy.ndimage  # type: ignore  # noqa: F401
+
+        # imports `scipy.signal` as well
+        settling_length(*FILTER_BAND)
+
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = Thread(target=prepare, name="warm-up", daemon=True)
+            _warm_up_thread.start()
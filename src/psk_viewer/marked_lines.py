@@ -0,0 +1,144 @@
+from collections.abc import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = ["MarkedLines", "is_in_sorted"]
+
+
+def is_in_sorted(values: NDArray[np.float64], value: float) -> bool:
+    """Check whether the value is among the values sorted ascending."""
+    index: int = int(np.searchsorted(values, value))
+    return index < values.size and values[index] == value
+
+
+class MarkedLines:
+    """The frequencies of the marked lines, sorted ascending and without duplicates.
+
+    The frequencies are kept in a buffer that grows twice when filled,
+    so that marking the lines one by one does not reallocate it every time.
+    The lines are looked for with the binary search, for single and bulk changes alike,
+    but marking or unmarking a line shifts the frequencies after it,
+    so a change takes linear time, if in a single fast copy.
+    """
+
+    def __init__(self, frequencies: Iterable[float] | NDArray[np.float64] = ()) -> None:
+        self._buffer: NDArray[np.float64] = MarkedLines._sorted_unique(frequencies)
+        self._size: int = self._buffer.size
+
+    @staticmethod
+    def _sorted_unique(
+        frequencies: Iterable[float] | NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        if isinstance(frequencies, np.ndarray):
+            return np.unique(frequencies.astype(np.float64, copy=False))
+        return np.unique(np.fromiter(frequencies, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, frequency: float) -> bool:
+        return is_in_sorted(self._view(), frequency)
+
+    @property
+    def frequencies(self) -> NDArray[np.float64]:
+        """The frequencies marked, sorted ascending.
+
+        The array is a copy, so that the changes do not affect it.
+        """
+        return self._view().copy()
+
+    def _view(self) -> NDArray[np.float64]:
+        """Get the frequencies marked as a read-only view that gets outdated by the next change."""
+        frequencies: NDArray[np.float64] = self._buffer[: self._size]
+        frequencies.flags.writeable = False
+        return frequencies
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._buffer.size:
+            return
+        buffer: NDArray[np.float64] = np.empty(max(size, 2 * self._buffer.size))
+        buffer[: self._size] = self._buffer[: self._size]
+        self._buffer = buffer
+
+    def _replace(self, frequencies: NDArray[np.float64]) -> None:
+        self._reserve(frequencies.size)
+        self._buffer[: frequencies.size] = frequencies
+        self._size = frequencies.size
+
+    def _find(
+        self, frequencies: NDArray[np.float64]
+    ) -> tuple[NDArray[np.intp], NDArray[np.bool_]]:
+        """Find where the sorted frequencies are or should be in the buffer.
+
+        :return: The insertion indices and whether the frequencies are marked already.
+        """
+        marked: NDArray[np.float64] = self._view()
+        indices: NDArray[np.intp] = np.searchsorted(marked, frequencies)
+        found: NDArray[np.bool_] = indices < marked.size
+        found[found] = marked[indices[found]] == frequencies[found]
+        return indices, found
+
+    def add(self, frequency: float) -> bool:
+        """Mark a line.
+
+        :param frequency: The frequency of the line.
+        :return: Whether the line has not been marked before.
+        """
+        index: int = int(np.searchsorted(self._view(), frequency))
+        if index < self._size and self._buffer[index] == frequency:
+            return False
+        self._reserve(self._size + 1)
+        self._buffer[index + 1 : self._size + 1] = self._buffer[index : self._size]
+        self._buffer[index] = frequency
+        self._size += 1
+        return True
+
+    def update(
+        self, frequencies: Iterable[float] | NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Mark the lines.
+
+        :param frequencies: The frequencies of the lines, in any order.
+        :return: The frequencies not marked before, sorted ascending.
+        """
+        new_frequencies: NDArray[np.float64] = MarkedLines._sorted_unique(frequencies)
+        indices: NDArray[np.intp]
+        found: NDArray[np.bool_]
+        indices, found = self._find(new_frequencies)
+        new_frequencies = new_frequencies[~found]
+        if new_frequencies.size:
+            self._replace(np.insert(self._view(), indices[~found], new_frequencies))
+        return new_frequencies
+
+    def remove(self, frequency: float) -> bool:
+        """Unmark a line.
+
+        :param frequency: The frequency of the line.
+        :return: Whether the line has been marked.
+        """
+        index: int = int(np.searchsorted(self._view(), frequency))
+        if index == self._size or self._buffer[index] != frequency:
+            return False
+        self._buffer[index : self._size - 1] = self._buffer[index + 1 : self._size]
+        self._size -= 1
+        return True
+
+    def difference_update(
+        self, frequencies: Iterable[float] | NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Unmark the lines.
+
+        :param frequencies: The frequencies of the lines, in any order.
+        :return: The frequencies that have been marked, sorted ascending.
+        """
+        old_frequencies: NDArray[np.float64] = MarkedLines._sorted_unique(frequencies)
+        indices: NDArray[np.intp]
+        found: NDArray[np.bool_]
+        indices, found = self._find(old_frequencies)
+        if np.any(found):
+            self._replace(np.delete(self._view(), indices[found]))
+        return old_frequencies[found]
+
+    def clear(self) -> None:
+        self._size = 0
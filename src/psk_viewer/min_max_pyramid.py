@@ -0,0 +1,124 @@
+from collections.abc import Callable
+from typing import Final
+
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = ["MinMaxPyramid"]
+
+
+class MinMaxPyramid:
+    """A multi-resolution summary of a curve to display it at the screen resolution.
+
+    Every level holds the indices of the lowest and the highest points
+    in the consecutive bins of the curve, the bins of a level being `FACTOR` times
+    wider than the bins of the level below. So, narrow peaks are kept at any zoom.
+    The ends and the extremes of the whole curve are displayed at any zoom, too,
+    so that the plot knows the bounds of the data to fit the view to.
+    """
+
+    FACTOR: Final[int] = 4
+
+    def __init__(self, x: NDArray[np.float64], y: NDArray[np.float64]) -> None:
+        """Find the extreme points of the curve at every level.
+
+        :param x: The abscissas, sorted ascending.
+        :param y: The ordinates of the same size.
+        """
+        if x.shape != y.shape:
+            raise ValueError(
+                f"The data must be of the same shape, but the shapes are {x.shape} and {y.shape}"
+            )
+        self._x: NDArray[np.float64] = x
+        self._y: NDArray[np.float64] = y
+        # the bin width and the indices of the extreme points in each bin
+        self._levels: list[tuple[int, NDArray[np.intp], NDArray[np.intp]]] = []
+        # the indices of the points that keep the bounds of the curve
+        self._bounds: NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        if y.size:
+            self._bounds = np.array([0, y.size - 1], dtype=np.intp)
+            if not np.all(np.isnan(y)):
+                self._bounds = np.unique(
+                    np.concatenate((self._bounds, [np.nanargmin(y), np.nanargmax(y)]))
+                )
+
+        lowest: NDArray[np.intp] = np.arange(y.size)
+        highest: NDArray[np.intp] = lowest
+        lowest_y: NDArray[np.float64] = y
+        highest_y: NDArray[np.float64] = y
+        width: int = 1
+        while lowest.size > MinMaxPyramid.FACTOR:
+            lowest, lowest_y = MinMaxPyramid._reduced(lowest, lowest_y, np.argmin)
+            highest, highest_y = MinMaxPyramid._reduced(highest, highest_y, np.argmax)
+            width *= MinMaxPyramid.FACTOR
+            self._levels.append((width, lowest, highest))
+
+    @staticmethod
+    def _reduced(
+        indices: NDArray[np.intp],
+        values: NDArray[np.float64],
+        arg_extreme: Callable[..., NDArray[np.intp]],
+    ) -> tuple[NDArray[np.intp], NDArray[np.float64]]:
+        """Pick the extreme points of every `FACTOR` consecutive points listed."""
+        # repeat the last point to fill the last bin
+        padding: int = -indices.size % MinMaxPyramid.FACTOR
+        if padding:
+            indices = np.pad(indices, (0, padding), mode="edge")
+            values = np.pad(values, (0, padding), mode="edge")
+        bins: int = indices.size // MinMaxPyramid.FACTOR
+        picked: NDArray[np.intp] = arg_extreme(
+            values.reshape(bins, MinMaxPyramid.FACTOR), axis=1
+        )
+        picked += np.arange(0, indices.size, MinMaxPyramid.FACTOR)
+        return indices[picked], values[picked]
+
+    def __len__(self) -> int:
+        return self._x.size
+
+    def visible_data(
+        self, min_x: float, max_x: float, points: int
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Get the points to display the range of the curve from `min_x` to `max_x`.
+
+        The points outside the range are dropped, save for the ones adjacent to it,
+        so that the curve is drawn past the edges of the view,
+        and the ends and the extremes of the curve, so that its bounds are kept.
+
+        :param min_x: The lower bound of the visible range.
+        :param max_x: The upper bound of the visible range.
+        :param points: The number of bins, like the screen pixels, to fit the curve into.
+        :return: The abscissas and the ordinates of the points to display,
+            not more than `2 * FACTOR` per bin.
+        """
+        if not self._x.size:
+            return self._x, self._y
+        start: int = max(0, int(np.searchsorted(self._x, min_x, side="left")) - 1)
+        stop: int = min(
+            self._x.size, int(np.searchsorted(self._x, max_x, side="right")) + 1
+        )
+        points = max(1, points)
+
+        # the extremes of the bins make up two points per bin;
+        # the bins are the widest ones that fit into a pixel, so that no pixel loses its extremes
+        indices: NDArray[np.intp] = np.arange(start, stop)
+        level: tuple[int, NDArray[np.intp], NDArray[np.intp]] | None = None
+        for candidate in self._levels:
+            if candidate[0] * points > stop - start:
+                break
+            level = candidate
+        if level is not None:
+            width: int
+            lowest: NDArray[np.intp]
+            highest: NDArray[np.intp]
+            width, lowest, highest = level
+            first_bin: int = start // width
+            last_bin: int = -(-stop // width)
+            # keep the points of each bin in the order they go along the curve
+            indices = np.sort(
+                np.column_stack(
+                    (lowest[first_bin:last_bin], highest[first_bin:last_bin])
+                ),
+                axis=1,
+            ).ravel()
+        indices = np.union1d(indices, self._bounds)
+        return self._x[indices], self._y[indices]
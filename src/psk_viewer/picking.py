@@ -0,0 +1,64 @@
+import numpy as np
+from numpy.typing import NDArray
+
+__all__ = ["nearest_indices", "nearest_point"]
+
+
+def nearest_indices(
+    sorted_values: NDArray[np.float64], values: NDArray[np.float64]
+) -> NDArray[np.intp]:
+    """Find the values closest to the given ones among the values sorted ascending.
+
+    :param sorted_values: The non-empty array to look in, sorted ascending.
+    :param values: The values to look for.
+    :return: The indices of the closest values in `sorted_values`,
+        the lower one if two are equally close, the first one if several are equal.
+    """
+    if sorted_values.size < 2:
+        return np.zeros(np.shape(values), dtype=np.intp)
+    indices: NDArray[np.intp] = np.clip(
+        np.searchsorted(sorted_values, values), 1, sorted_values.size - 1
+    )
+    # step back where the value below is not farther than the one above
+    indices -= values - sorted_values[indices - 1] <= sorted_values[indices] - values
+    # the first of the equal values
+    return np.searchsorted(sorted_values, sorted_values[indices])
+
+
+def nearest_point(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    point_x: float,
+    point_y: float,
+    x_scale: float,
+    y_scale: float,
+    max_distance: float,
+) -> int | None:
+    """Find the point of a curve closest to the given one.
+
+    Only the points within `max_distance` along the abscissa are looked through,
+    found with the binary search, so a click on a long curve costs a little.
+
+    :param x: The abscissas of the curve, sorted ascending.
+    :param y: The ordinates of the curve.
+    :param point_x: The abscissa of the point to look near.
+    :param point_y: The ordinate of the point to look near.
+    :param x_scale: The span of the abscissas that makes a unit of the distance.
+    :param y_scale: The span of the ordinates that makes a unit of the distance.
+    :param max_distance: The largest distance to the point to consider.
+    :return: The index of the closest point or `None` if none is that close.
+    """
+    start: int = int(np.searchsorted(x, point_x - max_distance * x_scale, side="left"))
+    stop: int = int(np.searchsorted(x, point_x + max_distance * x_scale, side="right"))
+    if start >= stop:
+        return None
+    distance: NDArray[np.float64] = np.hypot(
+        (x[start:stop] - point_x) / x_scale,
+        (y[start:stop] - point_y) / y_scale,
+    )
+    # the gaps in the curve are not to be picked
+    np.nan_to_num(distance, copy=False, nan=np.inf)
+    closest: int = int(np.argmin(distance))
+    if not distance[closest] <= max_distance:
+        return None
+    return start + closest
@@ -1,27 +1,45 @@
+from contextlib import suppress
 from typing import Final
 
 import numpy as np
 from numpy.typing import NDArray
+from qtpy.QtCore import QObject, Signal
+
+from .min_max_pyramid import MinMaxPyramid
 
 __all__ = ["PlotDataItem"]
 
 
-class PlotDataItem:
+class PlotDataItem(QObject):
+    """The data of a plot line along with the way they are displayed.
+
+    Each item has its own jump and data types, and notifies when they change.
+    """
+
     TIME_DATA: Final[str] = "time_data"
     FREQUENCY_DATA: Final[str] = "frequency_data"
     GAMMA_DATA: Final[str] = "gamma_data"
     VOLTAGE_DATA: Final[str] = "voltage_data"
 
-    _jump: float = np.nan
-    _x_data_type: str = FREQUENCY_DATA
-    _y_data_type: str = VOLTAGE_DATA
+    jump_changed: Signal = Signal(float, name="jump_changed")
+    x_data_type_changed: Signal = Signal(str, name="x_data_type_changed")
+    y_data_type_changed: Signal = Signal(str, name="y_data_type_changed")
 
-    def __init__(self) -> None:
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._jump: float = np.nan
+        self._x_data_type: str = PlotDataItem.FREQUENCY_DATA
+        self._y_data_type: str = PlotDataItem.VOLTAGE_DATA
         self._time_data: NDArray[np.float64] = np.empty(0)
         self._frequency_data: NDArray[np.float64] = np.empty(0)
         self._voltage_data: NDArray[np.float64] = np.empty(0)
         self._gamma_data: NDArray[np.float64] = np.empty(0)
 
+        # the differentiated data along with the steps they are computed for
+        self._derived_data: dict[str, tuple[int, NDArray[np.float64]]] = {}
+        # the summary of the displayed data, built when the data are displayed
+        self._pyramid: MinMaxPyramid | None = None
+
     def __bool__(self) -> bool:
         return bool(
             self._frequency_data.size
@@ -76,11 +94,15 @@ class PlotDataItem:
         self._voltage_data = voltage_data
         self._gamma_data = gamma_data
         self._time_data = time_data
+        self._derived_data.clear()
+        self._pyramid = None
 
     def clear(self) -> None:
         self._frequency_data = np.empty(0)
         self._voltage_data = np.empty(0)
         self._gamma_data = np.empty(0)
+        self._derived_data.clear()
+        self._pyramid = None
         self.jump = np.nan
 
     @property
@@ -116,33 +138,39 @@ class PlotDataItem:
             return np.empty(0)
         return self._frequency_data[step:-step]
 
-    @property
-    def voltage_data(self) -> NDArray[np.float64]:
+    def _differentiated(
+        self, data_type: str, data: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Get `data[step:-step] - (data[2 * step:] + data[:-2 * step]) / 2`.
+
+        The result is computed once for a step and is read-only.
+        """
         if np.isnan(self._jump):
-            return self._voltage_data
+            return data
         step: int = int(round(self._jump / self.frequency_step))
-        if 2 * step >= self._voltage_data.size:
+        if 2 * step >= data.size:
             return np.empty(0)
         if step == 0:
-            return self._voltage_data
-        return (
-            self._voltage_data[step:-step]
-            - (self._voltage_data[2 * step :] + self._voltage_data[: -2 * step]) / 2.0
-        )
+            return data
+        with suppress(KeyError):
+            derived_step, derived_data = self._derived_data[data_type]
+            if derived_step == step:
+                return derived_data
+        # the same operations as in the formula, but without the temporary arrays
+        derived_data = np.add(data[2 * step :], data[: -2 * step])
+        derived_data /= 2.0
+        np.subtract(data[step:-step], derived_data, out=derived_data)
+        derived_data.flags.writeable = False
+        self._derived_data[data_type] = step, derived_data
+        return derived_data
+
+    @property
+    def voltage_data(self) -> NDArray[np.float64]:
+        return self._differentiated(PlotDataItem.VOLTAGE_DATA, self._voltage_data)
 
     @property
     def gamma_data(self) -> NDArray[np.float64]:
-        if np.isnan(self._jump):
-            return self._gamma_data
-        step: int = int(round(self._jump / self.frequency_step))
-        if 2 * step >= self._gamma_data.size:
-            return np.empty(0)
-        if step == 0:
-            return self._gamma_data
-        return (
-            self._gamma_data[step:-step]
-            - (self._gamma_data[2 * step :] + self._gamma_data[: -2 * step]) / 2.0
-        )
+        return self._differentiated(PlotDataItem.GAMMA_DATA, self._gamma_data)
 
     @property
     def frequency_span(self) -> float | np.float64:
@@ -173,33 +201,47 @@ class PlotDataItem:
 
     @property
     def jump(self) -> float:
-        return PlotDataItem._jump
+        return self._jump
 
     @jump.setter
     def jump(self, new_value: float) -> None:
         if new_value < 0.0:
             raise ValueError("Negative jump values are not allowed")
-        PlotDataItem._jump = new_value
+        if new_value == self._jump or (np.isnan(new_value) and np.isnan(self._jump)):
+            return
+        self._jump = new_value
+        # the data differentiated for another step are of no use anymore
+        self._derived_data.clear()
+        self._pyramid = None
+        self.jump_changed.emit(new_value)
 
     @property
     def x_data_type(self) -> str:
-        return PlotDataItem._x_data_type
+        return self._x_data_type
 
     @x_data_type.setter
     def x_data_type(self, new_value: str) -> None:
         if new_value not in (PlotDataItem.TIME_DATA, PlotDataItem.FREQUENCY_DATA):
             raise ValueError(f"Unknown data type: {new_value}")
-        PlotDataItem._x_data_type = new_value
+        if new_value == self._x_data_type:
+            return
+        self._x_data_type = new_value
+        self._pyramid = None
+        self.x_data_type_changed.emit(new_value)
 
     @property
     def y_data_type(self) -> str:
-        return PlotDataItem._y_data_type
+        return self._y_data_type
 
     @y_data_type.setter
     def y_data_type(self, new_value: str) -> None:
         if new_value not in (PlotDataItem.VOLTAGE_DATA, PlotDataItem.GAMMA_DATA):
             raise ValueError(f"Unknown data type: {new_value}")
-        PlotDataItem._y_data_type = new_value
+        if new_value == self._y_data_type:
+            return
+        self._y_data_type = new_value
+        self._pyramid = None
+        self.y_data_type_changed.emit(new_value)
 
     @property
     def x_data(self) -> NDArray[np.float64]:
@@ -216,3 +258,14 @@ class PlotDataItem:
         if self.y_data_type == PlotDataItem.GAMMA_DATA:
             return self.gamma_data
         raise ValueError(f"Unknown data type: {self.y_data_type}")
+
+    def visible_data(
+        self, min_x: float, max_x: float, points: int
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Get the data to display from `min_x` to `max_x` in about `points` pixels.
+
+        See `MinMaxPyramid.visible_data` for details.
+        """
+        if self._pyramid is None:
+            self._pyramid = MinMaxPyramid(self.x_data, self.y_data)
+        return self._pyramid.visible_data(min_x, max_x, points)
@@ -187,7 +187,12 @@
         <translation>Загрузка каталога прервана.</translation>
     </message>
     <message>
-        <location filename="../window/frequency_domain_window.py" line="694"/>
+        <location filename="../window/frequency_domain_window.py" line="422"/>
+        <source>Failed to load a catalog: {0}</source>
+        <translation>Не удалось загрузить каталог: {0}</translation>
+    </message>
+    <message>
+        <location filename="../window/frequency_domain_window.py" line="425"/>
         <source>Failed to load a catalog.</source>
         <translation>Не удалось загрузить каталог.</translation>
     </message>
@@ -196,6 +201,11 @@
         <source>Catalogs loaded.</source>
         <translation>Каталоги загружены.</translation>
     </message>
+    <message>
+        <location filename="../window/frequency_domain_window.py" line="1196"/>
+        <source>Saving {0}…</source>
+        <translation>Сохранение {0}…</translation>
+    </message>
     <message>
         <location filename="../window/frequency_domain_window.py" line="1207"/>
         <source>%s&#xa0;— Spectrometer Data Viewer</source>
@@ -712,6 +722,11 @@
         <source>Spectrometer Data Viewer</source>
         <translation>Программа просмотра файлов спектрометра</translation>
     </message>
+    <message>
+        <location filename="../window/time_domain_window.py" line="638"/>
+        <source>Saving {0}…</source>
+        <translation>Сохранение {0}…</translation>
+    </message>
     <message>
         <location filename="../window/time_domain_window.py" line="621"/>
         <source>%s&#xa0;— Spectrometer Data Viewer</source>
@@ -1326,12 +1341,12 @@ Enter a correct value [cm]:</source>
 <context>
     <name>WaitingScreen</name>
     <message>
-        <location filename="../widgets/waiting_screen.py" line="97"/>
+        <location filename="../widgets/waiting_screen.py" line="140"/>
         <source>Please wait…</source>
         <translation>Пожалуйста, подождите…</translation>
     </message>
     <message>
-        <location filename="../widgets/waiting_screen.py" line="105"/>
+        <location filename="../widgets/waiting_screen.py" line="153"/>
         <source>&amp;Cancel</source>
         <translation>&amp;Отмена</translation>
     </message>
@@ -1,8 +1,6 @@
-import enum
 import html
 import html.entities
 import re
-import sys
 import unicodedata
 from collections.abc import Collection, Iterable, Iterator
 from contextlib import contextmanager, suppress
@@ -10,13 +8,23 @@ from os import PathLike, linesep
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, BinaryIO, Final, NamedTuple, TypeVar
 
-import numpy as np
-from numpy.typing import NDArray
 from qtawesome import icon
 from qtpy.QtCore import QCoreApplication, Qt
 from qtpy.QtGui import QColor, QIcon, QPalette, QPixmap
 from qtpy.QtWidgets import QInputDialog, QWidget
 
+from . import data_reader, resource_path
+from .data_reader import (
+    DataMode,
+    FSData,
+    PSKData,
+    SpectrometerData,
+    XValues,
+    load_data_csv,
+    load_data_fs,
+    stream_data,
+)
+
 _translate = QCoreApplication.translate
 
 __all__ = [
@@ -25,6 +33,8 @@ __all__ = [
     "load_data_fs",
     "load_data_scandat",
     "load_data",
+    "stream_data",
+    "ask_cell_length",
     "resource_path",
     "superscript_number",
     "superscript_tag",
@@ -46,13 +56,6 @@ __all__ = [
     "best_name",
 ]
 
-VOLTAGE_GAIN: Final[float] = 5.0
-
-
-# https://www.reddit.com/r/learnpython/comments/4kjie3/how_to_include_gui_images_with_pyinstaller/d3gjmom
-def resource_path(relative_path: str | Path) -> Path:
-    return Path(getattr(sys, "_MEIPASS", Path(__file__).parent)) / relative_path
-
 
 IMAGE_EXT: str = ".svg"
 
@@ -388,185 +391,8 @@ def copy_to_clipboard(
     clipboard.setMimeData(mime_data, QClipboard.Mode.Clipboard)
 
 
-class DataMode(enum.Enum):
-    unknown = enum.auto()
-    FS = enum.auto()
-    PSK = enum.auto()
-    PSK_WITH_JUMP = enum.auto()
-    TIME_DOMAIN = enum.auto()
-
-
-class FSData(NamedTuple):
-    frequency: NDArray[np.double] = np.empty(0, dtype=np.double)
-    voltage: NDArray[np.double] = np.empty(0, dtype=np.double)
-
-
-class XValues(enum.Enum):
-    unknown = enum.auto()
-    time = enum.auto()
-    frequency = enum.auto()
-
-
-class PSKData(NamedTuple):
-    frequency: NDArray[np.double] = np.empty(0, dtype=np.double)
-    voltage: NDArray[np.double] = np.empty(0, dtype=np.double)
-    absorption: NDArray[np.double] = np.empty(0, dtype=np.double)
-    time: NDArray[np.double] = np.empty(0, dtype=np.double)
-    jump: float = np.nan
-    mode: XValues = XValues.unknown
-
-
-class SpectrometerData(NamedTuple):
-    filename: Path
-    frequency: NDArray[np.double] = np.empty(0, dtype=np.double)
-    voltage: NDArray[np.double] = np.empty(0, dtype=np.double)
-    absorption: NDArray[np.double] = np.empty(0, dtype=np.double)
-    time: NDArray[np.double] = np.empty(0, dtype=np.double)
-    mode: DataMode = DataMode.unknown
-
-
-def load_data_fs(filename: Path) -> FSData:
-    min_frequency: float = np.nan
-    max_frequency: float = np.nan
-    if (filename_fmd := filename.with_suffix(".fmd")).exists():
-        with open(filename_fmd) as f_in:
-            line: str
-            for line in f_in:
-                if line and not line.startswith("*"):
-                    t = list(map(lambda w: w.strip(), line.split(":", maxsplit=1)))
-                    if len(t) > 1:
-                        if t[0].lower() == "FStart [GHz]".lower():
-                            min_frequency = float(t[1]) * 1e6
-                        elif t[0].lower() == "FStop [GHz]".lower():
-                            max_frequency = float(t[1]) * 1e6
-    else:
-        return FSData()
-    if (
-        not np.isnan(min_frequency)
-        and not np.isnan(max_frequency)
-        and (filename_frd := filename.with_suffix(".frd")).exists()
-    ):
-        y: NDArray[np.float64] = np.loadtxt(filename_frd, usecols=(0,)) * 1e-3
-        x: NDArray[np.float64] = np.linspace(
-            min_frequency, max_frequency, num=y.size, endpoint=False, dtype=np.float64
-        )
-        return FSData(x, y)
-    return FSData()
-
-
-def load_data_scandat(filename: Path, parent: QWidget | None) -> PSKData:
-    with open(filename) as f_in:
-        lines: list[str] = f_in.readlines()
-
-    min_frequency: float
-    frequency_step: float
-    frequency_jump: float
-    x: NDArray[np.float64]
-    y: NDArray[np.float64]
-    bias_offset: float
-    bias: NDArray[np.float64]
-    cell_length: float
-
-    if lines[0].startswith("*****"):
-        min_frequency = (
-            float(
-                lines[
-                    lines.index(
-                        next(
-                            filter(
-                                lambda line: line.startswith("F(start) [MHz]:"), lines
-                            )
-                        )
-                    )
-                    + 1
-                ]
-            )
-            * 1e3
-        )
-        frequency_step = (
-            float(
-                lines[
-                    lines.index(
-                        next(
-                            filter(
-                                lambda line: line.startswith("F(stept) [MHz]:"), lines
-                            )
-                        )
-                    )
-                    + 1
-                ]
-            )
-            * 1e3
-        )
-        frequency_jump = (
-            float(
-                lines[
-                    lines.index(
-                        next(
-                            filter(
-                                lambda line: line.startswith("F(jump) [MHz]:"), lines
-                            )
-                        )
-                    )
-                    + 1
-                ]
-            )
-            * 1e3
-        )
-        bias_offset = float(
-            lines[
-                lines.index(
-                    next(filter(lambda line: line.startswith("U - shift:"), lines))
-                )
-                + 1
-            ]
-        )
-        cell_length = float(
-            lines[
-                lines.index(
-                    next(filter(lambda line: line.startswith("Length of Cell:"), lines))
-                )
-                + 1
-            ]
-        )
-        lines = lines[
-            lines.index(next(filter(lambda line: line.startswith("Finish"), lines)))
-            + 1 : -2
-        ]
-        y = np.array([float(line.split()[0]) for line in lines]) * 1e-3
-        bias = np.array([bias_offset - float(line.split()[1]) for line in lines])
-    elif lines[0].startswith("   Spectrometer(PhSw)-2014   "):
-        min_frequency = float(lines[14]) * 1e3
-        frequency_step = float(lines[16]) * 1e3
-        frequency_jump = float(lines[2]) * 1e3
-        cell_length = float(lines[25])
-        bias_offset = float(lines[26])
-        lines = lines[32:]
-        if lines[-1] == "0":
-            lines = lines[:-2]
-        y = np.array([float(line) for line in lines[::2]]) * 1e-3
-        bias = np.array([bias_offset - float(line) for line in lines[1::2]])
-    elif lines[0].startswith("   Spectrometer(PhSw)   "):
-        min_frequency = float(lines[12]) * 1e3
-        frequency_step = float(lines[14]) * 1e3
-        frequency_jump = float(lines[2]) * 1e3
-        cell_length = float(lines[23])
-        bias_offset = float(lines[24])
-        lines = lines[30:]
-        if lines[-1].split()[-1] == "0":
-            lines = lines[:-1]
-        y = np.array([float(line.split()[0]) for line in lines]) * 1e-3
-        bias = np.array([bias_offset - float(line.split()[1]) for line in lines])
-    else:
-        min_frequency = float(lines[13]) * 1e3
-        frequency_step = float(lines[15]) * 1e3
-        frequency_jump = float(lines[2]) * 1e3
-        cell_length = float(lines[24])
-        bias_offset = float(lines[25])
-        lines = lines[31:]
-        y = np.array([float(line) for line in lines[::2]]) * 1e-3
-        bias = np.array([bias_offset - float(line) for line in lines[1::2]])
-    x = np.arange(y.size, dtype=float) * frequency_step + min_frequency
+def ask_cell_length(parent: QWidget | None, cell_length: float) -> float:
+    """Ask the user for a valid cell length instead of `cell_length` if it is invalid."""
     ok: bool = True
     while cell_length <= 0.0 or not ok:
         cell_length, ok = QInputDialog.getDouble(
@@ -584,134 +410,23 @@ def load_data_scandat(filename: Path, parent: QWidget | None) -> PSKData:
             Qt.WindowType.Dialog,
             0.1,
         )
-    return PSKData(
-        frequency=x,
-        voltage=y,
-        absorption=y / bias / cell_length / VOLTAGE_GAIN,
-        jump=frequency_jump,
-        mode=XValues.frequency,
-    )
+    return cell_length
 
 
-def time_to_seconds(s: str) -> float:
-    r: float = 0.0
-    for p in s.split(":"):
-        r = r * 60.0 + float(p)
-    return r
-
-
-def load_data_csv(filename: Path) -> PSKData:
-    if (filename_csv := filename.with_suffix(".csv")).exists() and (
-        filename_conf := filename.with_suffix(".conf")
-    ).exists():
-        lines: list[str]
-        with open(filename_conf) as f_in:
-            lines = f_in.readlines()
-            mode: XValues = (
-                XValues.frequency
-                if "frequency trend" in lines[0].casefold()
-                else XValues.time
-            )
-            frequency_jump: float = (
-                float(
-                    next(
-                        filter(
-                            lambda line: line.startswith("F(jump) [MHz]:"),
-                            lines,
-                        )
-                    ).split()[-1]
-                )
-                * 1e3
-            )
-        with open(filename_csv) as f_in:
-            lines = f_in.readlines()
-        header: list[str] = lines[0].split() if not lines[0][0].isdigit() else []
-        if header:
-            time_column = header.index(
-                next(filter(lambda title: title.casefold().startswith("time"), header))
-            )
-            frequency_column = header.index(
-                next(
-                    filter(
-                        lambda title: title.casefold().startswith("frequency"), header
-                    )
-                )
-            )
-            voltage_column = header.index(
-                next(
-                    filter(
-                        lambda title: title.casefold().startswith("amplitude"), header
-                    )
-                )
-            )
-            absorption_column = header.index(
-                next(filter(lambda title: title.casefold().startswith("gamma"), header))
-            )
-        else:
-            # as the last resort
-            frequency_column = 1
-            voltage_column = 2
-            absorption_column = 4
-            time_column = -1
-        words: list[list[str]] = [
-            line.split()
-            for line in filter(lambda line: line[0].isdigit(), lines[bool(header) :])
-        ]
-        frequency: NDArray[np.double] = (
-            np.array([float(line[frequency_column]) for line in words]) * 1e6
-        )
-        time: NDArray[np.double] = np.array(
-            [time_to_seconds(line[time_column]) for line in words]
-        )
-        voltage: NDArray[np.double] = (
-            np.array([float(line[voltage_column]) for line in words]) * 1e-3
-        )
-        absorption: NDArray[np.double] = np.array(
-            [float(line[absorption_column]) for line in words]
-        )
-        return PSKData(
-            frequency=frequency,
-            voltage=voltage,
-            absorption=absorption,
-            time=time,
-            jump=frequency_jump,
-            mode=mode,
-        )
-    return PSKData()
+def load_data_scandat(filename: Path, parent: QWidget | None) -> PSKData:
+    """Load the data from a `.scandat` file, asking the user for a valid cell length if needed."""
+    return data_reader.load_data_scandat(
+        filename, lambda cell_length: ask_cell_length(parent, cell_length)
+    )
 
 
 def load_data(
     parent: QWidget | None, filename: str | PathLike[str]
 ) -> SpectrometerData | None:
-    v: NDArray[np.float64]
-    f: NDArray[np.float64]
-    g: NDArray[np.float64] = np.empty(0)
-    t: NDArray[np.float64] = np.empty(0)
-    jump: float
-    m: XValues
-    data_mode: DataMode = DataMode.unknown
-    if not isinstance(filename, Path):
-        filename = Path(filename)
-    if filename.suffix.casefold() == ".scandat":
-        f, v, g, t, jump, m = load_data_scandat(filename, parent)
-        if f.size and v.size:
-            data_mode = DataMode.PSK_WITH_JUMP if jump > 0.0 else DataMode.PSK
-        elif m == XValues.time and t.size and v.size:
-            data_mode = DataMode.TIME_DOMAIN
-    elif filename.suffix.casefold() in (".csv", ".conf"):
-        f, v, g, t, jump, m = load_data_csv(filename)
-        if m == XValues.frequency and f.size and v.size:
-            data_mode = DataMode.PSK_WITH_JUMP if jump > 0.0 else DataMode.PSK
-        elif m == XValues.time and t.size and v.size:
-            data_mode = DataMode.TIME_DOMAIN
-    elif filename.suffix.casefold() in (".fmd", ".frd"):
-        f, v = load_data_fs(filename)
-        if f.size and v.size:
-            data_mode = DataMode.FS
-    else:
-        return None
-
-    return SpectrometerData(filename, f, g, v, t, data_mode)
+    """Load the data from any supported file, asking the user for a valid cell length if needed."""
+    return data_reader.load_data(
+        filename, lambda cell_length: ask_cell_length(parent, cell_length)
+    )
 
 
 class HeaderWithUnit:
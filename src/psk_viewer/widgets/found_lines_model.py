@@ -1,7 +1,7 @@
 from collections.abc import Iterable, Sequence
 from contextlib import suppress
-from math import inf
 from pathlib import Path
+from typing import Final
 
 # noinspection PyPackageRequirements
 import numpy as np
@@ -18,6 +18,10 @@ from qtpy.QtCore import (
     Slot,
 )
 
+from ..catalog_annotator import CatalogAnnotator
+from ..catalog_index import CatalogIndex
+from ..marked_lines import MarkedLines
+from ..picking import nearest_indices
 from ..plot_data_item import PlotDataItem
 from ..utils import HeaderWithUnit, best_name
 from .data_model import DataModel
@@ -28,15 +32,23 @@ _translate = QCoreApplication.translate
 
 
 class FoundLinesModel(DataModel):
+    # shown in place of the substances until the rows get matched against the catalog
+    PLACEHOLDER: Final[str] = "\N{HORIZONTAL ELLIPSIS}"
+
     frequencies_removed: Signal = Signal(frozenset, name="frequencies_removed")
 
     def __init__(self, parent: QObject | None = None) -> None:
         super().__init__(parent)
-        self._catalog: object = None
+        self._catalog_index: CatalogIndex = CatalogIndex()
+        # the names of the catalog entries by their `id`, for the names take long to make
+        self._best_names: dict[int, str] = {}
         self._df: float = 0.6e6
-        self._frequencies: NDArray[np.float64] = np.empty(0)
+        self._frequencies: MarkedLines = MarkedLines()
+        # the rows sorted by the frequency and their frequencies, found when needed
+        self._rows_order: tuple[NDArray[np.intp], NDArray[np.float64]] | None = None
         self._log10_gamma: bool = False
         self._fancy_table_numbers: bool = False
+        self._annotator: CatalogAnnotator = CatalogAnnotator(self)
 
         self._header = [""] * 4
 
@@ -60,7 +72,58 @@ class FoundLinesModel(DataModel):
                 frequencies.add(self._numeric_data[row, 0])
             self.frequencies_removed.emit(frozenset(frequencies))
 
+        @Slot()
+        def on_model_rows_changed() -> None:
+            self._rows_order = None
+
+        @Slot(QModelIndex, int, int)
+        def on_model_rows_removed_from_order(
+            _parent: QModelIndex, start: int, end: int
+        ) -> None:
+            if self._rows_order is None:
+                return
+            # keep the order instead of sorting the rows again
+            rows: NDArray[np.intp]
+            frequencies: NDArray[np.float64]
+            rows, frequencies = self._rows_order
+            kept: NDArray[np.bool_] = (rows < start) | (rows > end)
+            rows = rows[kept]
+            rows[rows > end] -= end - start + 1
+            self._rows_order = rows, frequencies[kept]
+
+        @Slot()
+        def on_model_rows_moved() -> None:
+            # the rows requested are not where they were
+            self._annotator.cancel()
+
+        @Slot(int, object, object)
+        def on_rows_annotated(
+            generation: int,
+            rows: list[int],
+            substances: list[list[tuple[float, object]]],
+        ) -> None:
+            if generation != self._annotator.generation:
+                return
+            columns: range = range(self.data_column_count, self.columnCount())
+            row: int
+            row_substances: list[tuple[float, object]]
+            for row, row_substances in zip(rows, substances, strict=True):
+                for column in columns:
+                    self._store_substances((row, column), row_substances)
+            for row in rows:
+                self.dataChanged.emit(
+                    self.index(row, columns.start), self.index(row, columns.stop - 1)
+                )
+
         self.rowsAboutToBeRemoved.connect(on_model_rows_removed)
+        self.rowsInserted.connect(on_model_rows_changed)
+        self.rowsRemoved.connect(on_model_rows_removed_from_order)
+        self.rowsRemoved.connect(on_model_rows_moved)
+        self.modelReset.connect(on_model_rows_changed)
+        self.modelReset.connect(on_model_rows_moved)
+        self._annotator.annotated.connect(on_rows_annotated)
+        # the thread is not to outlive the model
+        self.destroyed.connect(self._annotator.stop)
 
     @property
     def log10_gamma(self) -> bool:
@@ -141,6 +204,7 @@ class FoundLinesModel(DataModel):
             return
         df = abs(df)
         self._df = df
+        self._annotator.reset(self._catalog_index, self._df * 1e-6)
         for roles in self._data.values():
             if Qt.ItemDataRole.BackgroundRole in roles:
                 del roles[Qt.ItemDataRole.BackgroundRole]
@@ -149,6 +213,38 @@ class FoundLinesModel(DataModel):
             self.createIndex(self.rowCount() - 1, self.columnCount() - 1),
         )
 
+    def _is_annotated(self, key: tuple[int, int]) -> bool:
+        return Qt.ItemDataRole.BackgroundRole in self._data.get(key, ())
+
+    def data(
+        self,
+        index: QModelIndex | QPersistentModelIndex,
+        role: Qt.ItemDataRole | int = Qt.ItemDataRole.DisplayRole,
+    ) -> object | None:
+        row: int = index.row()
+        key: tuple[int, int] = row, index.column()
+        if (
+            self.data_column_count <= index.column() < self.columnCount()
+            and 0 <= row < self.rowCount(available_count=True)
+            and role not in self._data.get(key, ())
+            and not self._is_annotated(key)
+            and len(self._catalog_index)
+        ):
+            if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+                # match the row in the background and show a placeholder meanwhile
+                self._annotator.request(row, np.real(self._numeric_data[row, 0]) * 1e-6)
+                if role == Qt.ItemDataRole.DisplayRole:
+                    return self.PLACEHOLDER
+                return None
+            if role not in (
+                Qt.ItemDataRole.UserRole,
+                Qt.ItemDataRole.ForegroundRole,
+                Qt.ItemDataRole.BackgroundRole,
+            ):
+                # the view asks for the other roles all the time, and there are no such data
+                return None
+        return super().data(index, role)
+
     def substitution_for_cell(
         self,
         index: QModelIndex | QPersistentModelIndex,
@@ -159,62 +255,82 @@ class FoundLinesModel(DataModel):
         with suppress(LookupError):
             return self._data[_key][role]
 
-        if not self.catalog_file_names:
-            return None
-        try:
-            # noinspection PyPackageRequirements
-            from pycatsearch.catalog import Catalog
-
-            # noinspection PyPackageRequirements
-            from pycatsearch.utils import LINES, CatalogEntryType, CatalogType
-        except ImportError:
-            return None
-
-        catalog: object = self._catalog
-        if not isinstance(catalog, Catalog):
+        if not len(self._catalog_index) or self._is_annotated(_key):
             return None
 
         frequency, *_ = content
-        frequency *= 1e-6
-        entries: CatalogType = catalog.filter(
-            min_frequency=frequency - self._df * 1e-6,
-            max_frequency=frequency + self._df * 1e-6,
+        substances: list[tuple[float, object]] = self._catalog_index.substances(
+            frequency * 1e-6, self._df * 1e-6
         )
-        substances: list[tuple[float, CatalogEntryType]] = []
-        for entry in entries.values():
-            key = CatalogEntryType()
-            for slot in entry.__slots__:
-                if slot != LINES:
-                    setattr(key, slot, getattr(entry, slot))
-            weight: float = sum(
-                (
-                    (10.0**line.intensity / (line.frequency - frequency) ** 2)
-                    if line.frequency != frequency
-                    else inf
-                )
-                for line in entry.lines
-            )
-            substances.append((weight, key))
-        if not substances:
-            return None
-        substances.sort(reverse=True, key=lambda s: s[0])
-        best_line_entry: CatalogEntryType = substances[0][1]
-        label: str = best_name(best_line_entry)
-        data: dict[Qt.ItemDataRole | int, object] = {
-            Qt.ItemDataRole.DisplayRole: label,
-            Qt.ItemDataRole.UserRole: label,
-            Qt.ItemDataRole.ForegroundRole: (label, best_line_entry),
-            Qt.ItemDataRole.BackgroundRole: [
-                (best_name(substance[1]), substance[1]) for substance in substances
-            ],
-        }
-        if _key not in self._data:
-            self._data[_key] = {}
+        return self._store_substances(_key, substances).get(role)
+
+    def _store_substances(
+        self, key: tuple[int, int], substances: list[tuple[float, object]]
+    ) -> dict[Qt.ItemDataRole | int, object]:
+        def entry_name(entry: object) -> str:
+            if id(entry) not in self._best_names:
+                self._best_names[id(entry)] = best_name(entry)
+            return self._best_names[id(entry)]
+
+        data: dict[Qt.ItemDataRole | int, object]
+        if substances:
+            best_line_entry: object = substances[0][1]
+            label: str = entry_name(best_line_entry)
+            data = {
+                Qt.ItemDataRole.DisplayRole: label,
+                Qt.ItemDataRole.UserRole: label,
+                Qt.ItemDataRole.ForegroundRole: (label, best_line_entry),
+                Qt.ItemDataRole.BackgroundRole: [
+                    (entry_name(substance[1]), substance[1]) for substance in substances
+                ],
+            }
+        else:
+            # nothing to show, yet the cell is not to be matched again
+            data = {Qt.ItemDataRole.BackgroundRole: []}
+        if key not in self._data:
+            self._data[key] = {}
         for _role, value in data.items():
             # preserve previously set values
-            if _role not in self._data[_key]:
-                self._data[_key][_role] = value
-        return data.get(role)
+            if _role not in self._data[key]:
+                self._data[key][_role] = value
+        return data
+
+    def annotate(self, rows: Iterable[int] | None = None) -> None:
+        """Match the frequencies of the rows against the catalog all at once.
+
+        The matches are stored the way `substitution_for_cell` stores them,
+        so that the table is converted into text or saved without matching
+        the rows one by one.
+
+        :param rows: The rows to annotate, all of them by default.
+        """
+        if not len(self._catalog_index) or not self._numeric_data.size:
+            return
+        columns: range = range(self.data_column_count, self.columnCount())
+        rows_count: int = self._numeric_data.shape[0]
+        rows_to_annotate: NDArray[np.intp] = np.fromiter(
+            (
+                row
+                for row in (range(rows_count) if rows is None else rows)
+                if 0 <= row < rows_count
+                and not all(self._is_annotated((row, column)) for column in columns)
+            ),
+            dtype=np.intp,
+        )
+        if not rows_to_annotate.size:
+            return
+        row: int
+        substances: list[tuple[float, object]]
+        for row, substances in zip(
+            rows_to_annotate.tolist(),
+            self._catalog_index.all_substances(
+                np.real(self._numeric_data[rows_to_annotate, 0]) * 1e-6,
+                self._df * 1e-6,
+            ),
+            strict=True,
+        ):
+            for column in columns:
+                self._store_substances((row, column), substances)
 
     def add_line(self, plot_data: PlotDataItem, frequency: float) -> None:
         self.add_lines(plot_data, [frequency])
@@ -224,18 +340,14 @@ class FoundLinesModel(DataModel):
         plot_data: PlotDataItem,
         frequency_values: Iterable[float],
     ) -> None:
-        frequency_values = [
-            frequency
-            for frequency in frequency_values
-            if frequency not in self._frequencies
-        ]
-        if not frequency_values:
+        new_frequencies: NDArray[np.float64] = self._frequencies.update(
+            frequency_values
+        )
+        if not new_frequencies.size:
             return
         frequency_indices: NDArray[np.long] = self.frequency_indices(
-            plot_data, frequency_values
+            plot_data, new_frequencies
         )
-        if not frequency_indices.size:
-            return
         new_data: NDArray[np.double]
         if plot_data.voltage_data.size == plot_data.gamma_data.size:
             new_data = np.column_stack(
@@ -253,25 +365,28 @@ class FoundLinesModel(DataModel):
                     np.ones_like(frequency_indices) * np.nan,
                 )
             )
-        self._frequencies = np.concatenate((self._frequencies, frequency_values))
         self._rows_loaded += frequency_indices.size
         self.extend_data(new_data)
 
     def remove_line(self, frequency: float) -> None:
-        for row in np.argwhere(self._numeric_data[:, 0] == frequency).ravel():
+        self._frequencies.remove(frequency)
+        if not self._numeric_data.size:
+            return
+        rows: NDArray[np.intp]
+        sorted_frequencies: NDArray[np.float64]
+        rows, sorted_frequencies = self._sorted_rows()
+        first: int = int(np.searchsorted(sorted_frequencies, frequency, side="left"))
+        last: int = int(np.searchsorted(sorted_frequencies, frequency, side="right"))
+        # from the last row not to shift the rest
+        for row in np.sort(rows[first:last])[::-1]:
             self.remove_row(row.item())
-        self._frequencies = self._frequencies[self._frequencies != frequency]
 
     def set_lines(
         self,
         plot_data: PlotDataItem,
         *frequencies: NDArray[np.double],
     ) -> None:
-        self._frequencies = np.concatenate(frequencies)
-        # avoid duplicates
-        self._frequencies = self._frequencies[
-            np.unique(self._frequencies, return_index=True)[1]
-        ]
+        self._frequencies = MarkedLines(np.concatenate(frequencies))
         self.refresh(plot_data)
 
     def frequency_indices(
@@ -280,9 +395,25 @@ class FoundLinesModel(DataModel):
         frequencies: Sequence[float] | NDArray[np.double] | None = None,
     ) -> NDArray[np.long]:
         if frequencies is None:
-            frequencies = self._frequencies
+            frequencies = self._frequencies.frequencies
         return np.searchsorted(plot_data.x_data, frequencies)
 
+    def _sorted_rows(self) -> tuple[NDArray[np.intp], NDArray[np.float64]]:
+        """Get the rows sorted by the frequency and their frequencies."""
+        if self._rows_order is None:
+            rows: NDArray[np.intp] = np.argsort(self._numeric_data[:, 0], kind="stable")
+            self._rows_order = rows, self._numeric_data[rows, 0]
+        return self._rows_order
+
+    def nearest_rows(self, frequencies: NDArray[np.float64]) -> NDArray[np.intp]:
+        """Find the rows with the frequencies closest to the given ones."""
+        if not self._numeric_data.size:
+            return np.empty(0, dtype=np.intp)
+        rows: NDArray[np.intp]
+        sorted_frequencies: NDArray[np.float64]
+        rows, sorted_frequencies = self._sorted_rows()
+        return rows[nearest_indices(sorted_frequencies, frequencies)]
+
     def refresh(self, plot_data: PlotDataItem) -> None:
         frequency_indices: NDArray[np.int64] = self.frequency_indices(plot_data)
         if not frequency_indices.size:
@@ -312,38 +443,19 @@ class FoundLinesModel(DataModel):
 
     @property
     def catalog_file_names(self) -> list[Path]:
-        try:
-            # noinspection PyPackageRequirements
-            from pycatsearch.catalog import Catalog
-        except ImportError:
-            return []
-        else:
-            if isinstance(self._catalog, Catalog):
-                return self._catalog.sources
-        return []
-
-    try:
-        # noinspection PyPackageRequirements,PyUnusedImports
-        from pycatsearch.catalog import Catalog
-    except ImportError:
-
-        @property
-        def catalog(_self) -> None:
-            return None
-    else:
-
-        @property
-        def catalog(self) -> Catalog | None:
-            if isinstance(self._catalog, FoundLinesModel.Catalog):
-                return self._catalog
-            return None
+        return self._catalog_index.sources
 
-    @catalog.setter
-    def catalog(self, catalog: object) -> None:
-        try:
-            # noinspection PyPackageRequirements
-            from pycatsearch.catalog import Catalog
-        except ImportError:
-            return
-        if isinstance(catalog, Catalog):
-            self._catalog = catalog
+    @property
+    def catalog_index(self) -> CatalogIndex:
+        return self._catalog_index
+
+    @catalog_index.setter
+    def catalog_index(self, catalog_index: CatalogIndex) -> None:
+        self._catalog_index = catalog_index
+        self._best_names = {
+            id(entry): name
+            for entry, name in zip(
+                catalog_index.entries, catalog_index.names, strict=False
+            )
+        }
+        self._annotator.reset(self._catalog_index, self._df * 1e-6)
@@ -140,6 +140,7 @@ class TableView(QTableView):
         if whole_table:
             while model.canFetchMore(QModelIndex()):
                 model.fetchMore(QModelIndex())
+            model.annotate()
             text_matrix = [
                 [
                     remove_html(model.formatted_item(row, column, force_plain=True))
@@ -152,6 +153,7 @@ class TableView(QTableView):
             si: QModelIndex
             rows: list[int] = sorted(set(si.row() for si in self.selectedIndexes()))
             cols: list[int] = sorted(set(si.column() for si in self.selectedIndexes()))
+            model.annotate(rows)
             text_matrix = [["" for _ in range(len(cols))] for _ in range(len(rows))]
             for si in self.selectedIndexes():
                 text_matrix[rows.index(si.row())][cols.index(si.column())] = (
@@ -159,9 +161,8 @@ class TableView(QTableView):
                         model.formatted_item(si.row(), si.column(), force_plain=True)
                     )
                 )
-        text: list[str] = [
-            self.settings.csv_separator.join(row_texts) for row_texts in text_matrix
-        ]
+        sep: str = self.settings.csv_separator
+        text: list[str] = [sep.join(row_texts) for row_texts in text_matrix]
         return self.settings.line_end.join(text)
 
     def stringify_table_html(
@@ -181,6 +182,7 @@ class TableView(QTableView):
         if whole_table:
             while model.canFetchMore(QModelIndex()):
                 model.fetchMore(QModelIndex())
+            model.annotate()
             text_matrix = [
                 [
                     tag(
@@ -212,6 +214,7 @@ class TableView(QTableView):
             si: QModelIndex
             rows: list[int] = sorted(set(si.row() for si in self.selectedIndexes()))
             cols: list[int] = sorted(set(si.column() for si in self.selectedIndexes()))
+            model.annotate(rows)
             text_matrix = [["" for _ in range(len(cols))] for _ in range(len(rows))]
             for si in self.selectedIndexes():
                 text_matrix[rows.index(si.row())][cols.index(si.column())] = tag(
@@ -233,10 +236,8 @@ class TableView(QTableView):
                         for column in cols
                     ],
                 )
-        text: list[str] = [
-            tag("tr", self.settings.csv_separator.join(row_texts))
-            for row_texts in text_matrix
-        ]
+        sep: str = self.settings.csv_separator
+        text: list[str] = [tag("tr", sep.join(row_texts)) for row_texts in text_matrix]
         text.insert(0, "<table>")
         text.append("</table>")
         return self.settings.line_end.join(text)
@@ -1,10 +1,20 @@
-from collections.abc import Callable, Mapping, Sequence
-from threading import Thread
-from typing import Any, Generic, TypeVar
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from inspect import isgeneratorfunction
+from typing import Any, ClassVar, Final, Generic, TypeVar
 
-from qtpy.QtCore import QCoreApplication, QMargins, QSize, Qt
+from qtpy.QtCore import (
+    QCoreApplication,
+    QEventLoop,
+    QMargins,
+    QObject,
+    QSize,
+    QThread,
+    Qt,
+    Signal,
+    Slot,
+)
 from qtpy.QtGui import QKeySequence, QTextDocument
-from qtpy.QtWidgets import QLabel, QPushButton, QVBoxLayout, QWidget
+from qtpy.QtWidgets import QLabel, QProgressBar, QPushButton, QVBoxLayout, QWidget
 
 __all__ = ["WaitingScreen"]
 
@@ -30,43 +40,77 @@ def _spinner(parent: QWidget | None = None) -> QWidget | None:
 
 _T = TypeVar("_T")
 
+# the cancelled functions that may still be running at once
+MAX_ABANDONED_THREADS: Final[int] = 2
+
+
+class _Thread(QThread, Generic[_T]):
+    progress_changed: Signal = Signal(float, name="progress_changed")
 
-class _Thread(Thread, Generic[_T]):
     def __init__(
         self,
-        target: Callable[..., _T] | None,
+        target: Callable[..., _T | Iterator[tuple[_T, float]]] | None,
         args: Sequence[object],
         kwargs: Mapping[str, object],
+        parent: QObject | None = None,
     ) -> None:
-        super().__init__(daemon=True)
+        super().__init__(parent)
 
-        self._target: Callable[..., _T] | None = target
+        self._target: Callable[..., _T | Iterator[tuple[_T, float]]] | None = target
         self._args: Sequence[Any] = args
         self._kwargs: Mapping[str, Any] = kwargs or dict()
 
         self._result: _T | None = None
+        self._error: Exception | None = None
 
     def result(self) -> _T | None:
+        """Get the result, re-raising the error that occurred while making it."""
+        if self._error is not None:
+            raise self._error
+        if self.isInterruptionRequested():
+            return None
         return self._result
 
     def run(self) -> None:
-        if self._target is not None:
-            try:
+        if self._target is None:
+            return
+        try:
+            if not isgeneratorfunction(self._target):
                 self._result = self._target(*self._args, **self._kwargs)
-            except Exception as ex:
-                if not isinstance(ex, (SystemExit, KeyboardInterrupt)):
-                    import sys
-                    import traceback
-
-                    traceback.print_tb(*sys.exc_info())
+                return
+            stream: Iterator[tuple[_T, float]] = self._target(
+                *self._args, **self._kwargs
+            )
+            progress: float
+            for self._result, progress in stream:
+                if self.isInterruptionRequested():
+                    break
+                self.progress_changed.emit(progress)
+            # stop the generator where it is
+            stream.close()
+        except Exception as ex:  # noqa: BLE001 - `result` re-raises it in the waiting thread
+            self._error = ex
 
 
 class WaitingScreen(QWidget, Generic[_T]):
+    """Run a function in a separate thread, waiting for it without blocking the events.
+
+    If the function is a generator that yields its result so far along with the progress,
+    a number from 0 to 1, the progress is displayed,
+    and cancelling stops the generator at the next `yield`.
+    Otherwise, cancelling only stops waiting for the function.
+    Not more than `MAX_ABANDONED_THREADS` of such functions may still run:
+    the next function starts when one of them finishes.
+    Quitting the application waits for them to finish.
+    """
+
+    _abandoned: ClassVar[set[_Thread[Any]]] = set()
+
     def __init__(
         self,
         parent: QWidget | None,
         label: str | QWidget,
-        target: Callable[..., _T] | None = None,
+        target: Callable[..., _T | Iterator[tuple[_T, float]]] | None = None,
         args: Sequence[Any] = (),
         kwargs: Mapping[str, Any] | None = None,
         margins: int | QMargins | None = None,
@@ -100,6 +144,11 @@ class WaitingScreen(QWidget, Generic[_T]):
         if spinner is not None:
             layout.addWidget(spinner)
         layout.addWidget(label)
+        self._progress_bar: QProgressBar = QProgressBar(self)
+        self._progress_bar.setRange(0, 100)
+        # shown when the progress is known
+        self._progress_bar.hide()
+        layout.addWidget(self._progress_bar)
         if cancellable:
             cancel_button: QPushButton = QPushButton(self)
             cancel_button.setText(self.tr("&Cancel"))
@@ -113,42 +162,101 @@ class WaitingScreen(QWidget, Generic[_T]):
         elif isinstance(margins, QMargins):
             layout.setContentsMargins(margins)
 
-        self._target: Callable[..., _T] | None = target
+        self._target: Callable[..., _T | Iterator[tuple[_T, float]]] | None = target
         self._args: Sequence[Any] = args
         self._kwargs: Mapping[str, Any] = kwargs or dict()
         self._thread: _Thread[_T] | None = None
+        self._loop: QEventLoop | None = None
         self._is_cancelled: bool = False
 
     @property
     def active(self) -> bool:
-        return self._thread is not None and self._thread.is_alive()
+        return self._thread is not None and self._thread.isRunning()
+
+    @Slot(float)
+    def _on_progress_changed(self, progress: float) -> None:
+        if self._thread is not None and not self._thread.isInterruptionRequested():
+            self._progress_bar.setValue(round(progress * self._progress_bar.maximum()))
+            self._progress_bar.show()
 
     def exec(self) -> _T | None:
+        """Run the function and wait for it to finish or to be cancelled.
+
+        :return: The result of the function or `None` if cancelled.
+        :raises Exception: The error that occurred in the function.
+        """
         self._is_cancelled = False
-        self._thread = _Thread(
+        self._progress_bar.hide()
+        self._loop = QEventLoop(self)
+        self.show()
+        # wait for the functions cancelled earlier not to pile up
+        while not self._is_cancelled:
+            for abandoned in WaitingScreen._abandoned:
+                abandoned.finished.connect(
+                    self._loop.quit, Qt.ConnectionType.UniqueConnection
+                )
+            if (
+                sum(
+                    not abandoned.isFinished() for abandoned in WaitingScreen._abandoned
+                )
+                < MAX_ABANDONED_THREADS
+            ):
+                break
+            self._loop.exec()
+        if self._is_cancelled:
+            self.hide()
+            self._loop.deleteLater()
+            self._loop = None
+            return None
+
+        thread: _Thread[_T] = _Thread(
             target=self._target,
             args=self._args,
             kwargs=self._kwargs,
+            # let the thread outlive the screen if the waiting is cancelled
+            parent=QCoreApplication.instance(),
         )
-        self.show()
-        self._thread.start()
-        while self.active:
-            QCoreApplication.processEvents()
-            QCoreApplication.sendPostedEvents()
-        if self._thread is not None:
-            self._thread.join()
-            self.hide()
-            result: _T = self._thread.result()
-            self._thread = None
-            return result
+        self._thread = thread
+        thread.progress_changed.connect(self._on_progress_changed)
+        thread.finished.connect(self._loop.quit)
+        thread.start()
+        self._loop.exec()
         self.hide()
-        return None
+        self._loop.deleteLater()
+        self._loop = None
+        self._thread = None
 
+        if self._is_cancelled:
+            # the thread is still running, maybe
+            if thread.isFinished():
+                thread.deleteLater()
+            else:
+                WaitingScreen._abandoned.add(thread)
+                # a thread running when the application object gets destroyed aborts the process
+                if (app := QCoreApplication.instance()) is not None:
+                    app.aboutToQuit.connect(thread.wait)
+
+                @Slot()
+                def on_abandoned_finished() -> None:
+                    WaitingScreen._abandoned.discard(thread)
+                    thread.deleteLater()
+
+                thread.finished.connect(on_abandoned_finished)
+            return None
+        thread.wait()
+        try:
+            return thread.result()
+        finally:
+            thread.deleteLater()
+
+    @Slot()
     def stop(self) -> None:
-        if self.active:
-            self._thread.join(0.0)
-            self._thread = None
-            self._is_cancelled = True
+        if self._loop is None:
+            return
+        if self._thread is not None:
+            self._thread.requestInterruption()
+        self._is_cancelled = True
+        self._loop.quit()
 
     def is_cancelled(self) -> bool:
         return self._is_cancelled
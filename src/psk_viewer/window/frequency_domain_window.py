@@ -1,6 +1,5 @@
 import importlib.util
 import mimetypes
-import sys
 from collections.abc import Callable, Collection, Iterable, Sequence
 from numbers import Number
 from pathlib import Path
@@ -8,16 +7,15 @@ from typing import Any, cast
 
 # noinspection PyPackageRequirements
 import numpy as np
-import pandas as pd
 import pyqtgraph as pg  # type: ignore
 
 # noinspection PyPackageRequirements
 from numpy.typing import NDArray
 from pyqtgraph.GraphicsScene.mouseEvents import MouseClickEvent  # type: ignore
-from pyqtgraph.exporters import ImageExporter
 from qtpy.QtCore import (
     QCoreApplication,
     QPointF,
+    QTimer,
     Qt,
     Slot,
 )
@@ -27,21 +25,25 @@ from qtpy.QtGui import (
     QGuiApplication,
     QPen,
     QScreen,
+    QShowEvent,
 )
 from qtpy.QtWidgets import QDockWidget, QMessageBox, QWidget
 
+from ..catalog_index import CatalogIndex
+from ..catalog_service import CatalogService
+from ..detection import warm_up
+from ..marked_lines import MarkedLines, is_in_sorted
+from ..picking import nearest_point
 from ..plot_data_item import PlotDataItem
 from ..utils import (
     DataMode,
     HeaderWithUnit,
     SpectrometerData,
     copy_to_clipboard,
-    load_data,
-    p_tag,
-    tag,
     the,
 )
 from ..widgets.preferences import Preferences
+from ..widgets.waiting_screen import WaitingScreen
 from .gui.frequency_domain_gui import FrequencyDomainGUI
 
 __all__ = ["FrequencyDomainWindow"]
@@ -71,7 +73,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         self.automatically_found_lines: pg.PlotDataItem = self._canvas.scatterPlot(
             np.empty(0), symbol="o", pxMode=True
         )
-        self.user_found_lines_data: NDArray[np.float64] = np.empty(0)
+        self.user_found_lines_data: MarkedLines = MarkedLines()
 
         self.setup_ui()
         self._setup_colors()
@@ -118,13 +120,14 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                 == PlotDataItem.GAMMA_DATA
             ):
                 self._plot_data.y_data_type = PlotDataItem.GAMMA_DATA
-                self.box_find_lines.set_data_type(PlotDataItem.GAMMA_DATA)
             else:
                 self._plot_data.y_data_type = PlotDataItem.VOLTAGE_DATA
-                self.box_find_lines.set_data_type(PlotDataItem.VOLTAGE_DATA)
+            self.box_find_lines.set_data_type(self._plot_data.y_data_type)
             self.display_gamma_or_voltage()
 
     def setup_ui_actions(self) -> None:
+        CatalogService.instance().catalog_loaded.connect(self.on_catalog_loaded)
+        CatalogService.instance().catalog_failed.connect(self.on_catalog_failed)
         self.toolbar.open_action.triggered.connect(self.on_open_action_triggered)
         self.toolbar.clear_action.triggered.connect(self.on_clear_action_triggered)
         self.toolbar.open_ghost_action.triggered.connect(
@@ -190,6 +193,11 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
 
         self.figure.sceneObj.sigMouseClicked.connect(self.on_plot_clicked)
 
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        # prepare the line search once the window gets drawn
+        QTimer.singleShot(0, warm_up)
+
     def on_xlim_changed(self, xlim: list[float]) -> None:
         min_freq, max_freq = min(xlim), max(xlim)
         self.box_frequency.set_range(min_freq, max_freq)
@@ -215,9 +223,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         if ev.modifiers() == Qt.KeyboardModifier.ShiftModifier:
             for point in points:
                 self.box_find_lines.remove_found_line(point.pos().x())
-                self.user_found_lines_data = self.user_found_lines_data[
-                    self.user_found_lines_data != point.pos().x()
-                ]
+                self.user_found_lines_data.remove(point.pos().x())
                 self.box_found_lines.model.remove_line(point.pos().x())
 
             with the(not self.box_found_lines.model.is_empty) as enabled:
@@ -226,13 +232,9 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                 self.toolbar.clear_trace_action.setEnabled(enabled)
 
         elif ev.modifiers() == Qt.KeyboardModifier.NoModifier:
-            found_lines_frequencies: NDArray[np.float64] = (
-                self.box_found_lines.model.all_data(0)
-            )
-            selected_points: list[int] = [
-                cast(int, np.argmin(np.abs(point.pos().x() - found_lines_frequencies)))
-                for point in points
-            ]
+            selected_points: list[int] = self.box_found_lines.model.nearest_rows(
+                np.array([point.pos().x() for point in points])
+            ).tolist()
             self.box_found_lines.select(selected_points)
 
     @Slot(int)
@@ -241,26 +243,14 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
 
     @Slot(frozenset)
     def on_table_rows_removed(self, frequencies: frozenset[float]) -> None:
-        mask: NDArray[np.bool_] = np.full(
-            self.user_found_lines_data.shape, True, np.bool_
-        )
-        for f in frequencies:
-            mask[self.user_found_lines_data == f] = False
-        self.user_found_lines_data = self.user_found_lines_data[mask]
-        self.user_found_lines.setData(
-            self.user_found_lines_data,
-            self._plot_line.yData[
-                self.box_found_lines.model.frequency_indices(
-                    self._plot_data, self.user_found_lines_data
-                )
-            ],
-        )
+        self.user_found_lines_data.difference_update(frequencies)
+        self.plot_user_found_lines()
 
         for f in frequencies:
             self.box_find_lines.remove_found_line(f)
         self.automatically_found_lines.setData(
             self.box_find_lines.found_lines_freq,
-            self._plot_line.yData[
+            self._plot_data.y_data[
                 self.box_found_lines.model.frequency_indices(
                     self._plot_data, self.box_find_lines.found_lines_freq
                 )
@@ -287,57 +277,22 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         x_span: np.float64 = np.ptp(self._canvas.axes["bottom"]["item"].range)
         y_span: np.float64 = np.ptp(self._canvas.axes["left"]["item"].range)
         point: QPointF = self._canvas.getViewBox().mapSceneToView(pos)
-        with the(self._plot_line.xData) as x, the(self._plot_line.yData) as y:
-            if x is None or not x.size:
-                return
-            distance: NDArray[np.float64] = np.min(
-                np.hypot(
-                    (x - point.x()) / x_span,
-                    (y - point.y()) / y_span,
-                )
+        with the(self._plot_data.x_data) as x, the(self._plot_data.y_data) as y:
+            closest_point_index: int | None = nearest_point(
+                x, y, point.x(), point.y(), x_span, y_span, max_distance=0.01
             )
-            if distance > 0.01:
+            if closest_point_index is None:
                 return
-            closest_point_index: np.int64 = np.argmin(
-                np.hypot(
-                    (x - point.x()) / x_span,
-                    (y - point.y()) / y_span,
-                )
-            )
 
             x_point: float = x[closest_point_index]
-            y_point: float = y[closest_point_index]
 
             # avoid the same point to be marked several times
-            if (
-                self.user_found_lines.xData is not None
-                and self.user_found_lines.yData.size
-                and np.any(
-                    (self.user_found_lines.xData == x_point)
-                    & (self.user_found_lines.yData == y_point)
-                )
-            ):
+            if is_in_sorted(self.box_find_lines.found_lines_freq, x_point):
                 return
-            if (
-                self.automatically_found_lines.xData is not None
-                and self.automatically_found_lines.yData.size
-                and np.any(
-                    (self.automatically_found_lines.xData == x_point)
-                    & (self.automatically_found_lines.yData == y_point)
-                )
-            ):
+            if not self.user_found_lines_data.add(x_point):
                 return
 
-            self.user_found_lines_data = np.append(self.user_found_lines_data, x_point)
-
-            self.user_found_lines.setData(
-                self.user_found_lines_data,
-                y[
-                    self.box_found_lines.model.frequency_indices(
-                        self._plot_data, self.user_found_lines_data
-                    )
-                ],
-            )
+            self.plot_user_found_lines()
 
         self.box_found_lines.model.add_line(self._plot_data, x_point)
         if self.settings.copy_frequency:
@@ -435,75 +390,47 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
             self.load_catalog()
 
     def load_catalog(self) -> None:
+        """Use the catalog of the files set in the preferences, loading it if needed."""
         if frozenset(self.box_found_lines.model.catalog_file_names) == frozenset(
             catalog_file_names := self.settings.catalog_paths
         ):
             return
         if not catalog_file_names:
             return
-        with self.show_loading():
-            label: str
-            if len(catalog_file_names) > 1:
-                label = tag(
-                    "html",
-                    "\n".join(
-                        (
-                            p_tag(self.tr("Loading catalogs:")),
-                            tag(
-                                "ul",
-                                "\n".join(
-                                    tag("li", str(fn)) for fn in catalog_file_names
-                                ),
-                            ),
-                        )
-                    ),
-                )
-            else:
-                label = tag(
-                    "html",
-                    p_tag(
-                        self.tr("Loading a catalog from<br>{}").format(
-                            catalog_file_names[0]
-                        )
-                    ),
-                )
-            try:
-                # noinspection PyPackageRequirements,PyUnusedImports
-                from pycatsearch.catalog import Catalog
-            except ImportError:
+        if importlib.util.find_spec("pycatsearch") is None:
+            self.status_bar.showMessage(
+                self.tr("Unable to load a catalog: Python package missing.")
+            )
+            return
+
+        catalog_service: CatalogService = CatalogService.instance()
+        catalog_index: CatalogIndex | None = catalog_service.catalog(catalog_file_names)
+        if catalog_index is not None:
+            self.box_found_lines.model.catalog_index = catalog_index
+            return
+        self.status_bar.showMessage(self.tr("Loading catalogs…"))
+        catalog_service.load(catalog_file_names)
+
+    @Slot(frozenset, object)
+    def on_catalog_loaded(
+        self, sources: frozenset[Path], catalog_index: object
+    ) -> None:
+        if (
+            isinstance(catalog_index, CatalogIndex)
+            and CatalogService.key(self.settings.catalog_paths) == sources
+        ):
+            self.status_bar.showMessage(self.tr("Catalogs loaded."))
+            self.box_found_lines.model.catalog_index = catalog_index
+
+    @Slot(frozenset, str)
+    def on_catalog_failed(self, sources: frozenset[Path], error: str) -> None:
+        if CatalogService.key(self.settings.catalog_paths) == sources:
+            if error:
                 self.status_bar.showMessage(
-                    self.tr("Unable to load a catalog: Python package missing.")
+                    self.tr("Failed to load a catalog: {0}").format(error)
                 )
             else:
-                from ..widgets.waiting_screen import WaitingScreen
-
-                ws: WaitingScreen[Catalog] = WaitingScreen(
-                    parent=self,
-                    label=label,
-                    target=Catalog,
-                    args=catalog_file_names,
-                    label_alignment=Qt.AlignmentFlag.AlignLeading,
-                )
-                try:
-                    cat: Catalog | None = ws.exec()
-                except Exception as ex:
-                    self.status_bar.showMessage(self.tr("Failed to load a catalog."))
-                    print(ex, file=sys.stderr)
-                else:
-                    if cat is None or cat.is_empty:
-                        if ws.is_cancelled():
-                            self.status_bar.showMessage(
-                                self.tr("Loading has been cancelled.")
-                            )
-                        else:
-                            self.status_bar.showMessage(
-                                self.tr("Failed to load a catalog.")
-                            )
-                    else:
-                        self.status_bar.showMessage(self.tr("Catalogs loaded."))
-                        self.box_found_lines.model.catalog = cat
-                finally:
-                    ws.deleteLater()
+                self.status_bar.showMessage(self.tr("Failed to load a catalog."))
 
     @property
     def line(self) -> PlotDataItem:
@@ -631,22 +558,8 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
 
         self.box_found_lines.model.add_lines(self._plot_data, new_lines)
         # add the new lines to the marked ones
-        self.user_found_lines_data = np.concatenate(
-            (self.user_found_lines_data, new_lines)
-        )
-        # avoid duplicates
-        self.user_found_lines_data = self.user_found_lines_data[
-            np.unique(self.user_found_lines_data, return_index=True)[1]
-        ]
-        # plot the data
-        self.user_found_lines.setData(
-            self.user_found_lines_data,
-            self._plot_line.yData[
-                self.box_found_lines.model.frequency_indices(
-                    self._plot_data, self.user_found_lines_data
-                )
-            ],
-        )
+        self.user_found_lines_data.update(new_lines)
+        self.plot_user_found_lines()
         self.toolbar.copy_trace_action.setEnabled(True)
         self.toolbar.save_trace_action.setEnabled(True)
         self.toolbar.clear_trace_action.setEnabled(True)
@@ -706,6 +619,8 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                 )
 
         def save_xlsx(fn: Path) -> None:
+            import pandas as pd
+
             with pd.ExcelWriter(fn) as writer:
                 df: pd.DataFrame = pd.DataFrame(data)
                 df.to_excel(
@@ -725,6 +640,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         if not (filename := self._save_table_dialog.get_save_filename()):
             return
 
+        self.box_found_lines.model.annotate()
         data: list[list[object]] = [
             [
                 (
@@ -746,6 +662,18 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
             with self.show_loading():
                 supported_formats_callbacks[filename_ext](filename)
 
+    def plot_user_found_lines(self) -> None:
+        # a copy, for the plot keeps the array
+        frequencies: NDArray[np.float64] = self.user_found_lines_data.frequencies
+        self.user_found_lines.setData(
+            frequencies,
+            self._plot_data.y_data[
+                self.box_found_lines.model.frequency_indices(
+                    self._plot_data, frequencies
+                )
+            ],
+        )
+
     @Slot(np.ndarray)
     def on_automatically_found_lines_changed(self, freq: NDArray[np.double]) -> None:
         self.automatically_found_lines.setData(
@@ -759,7 +687,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         self._canvas.replot()
 
         self.box_found_lines.model.set_lines(
-            self._plot_data, self.user_found_lines_data, freq
+            self._plot_data, self.user_found_lines_data.frequencies, freq
         )
         with the(not self.box_found_lines.model.is_empty) as enabled:
             self.toolbar.copy_trace_action.setEnabled(enabled)
@@ -776,7 +704,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         self.box_find_lines.clear_found_lines()
         self.box_find_lines.blockSignals(False)
         self.user_found_lines.clear()
-        self.user_found_lines_data = np.empty(0)
+        self.user_found_lines_data.clear()
         self.box_found_lines.model.clear()
         self.toolbar.copy_trace_action.setEnabled(False)
         self.toolbar.save_trace_action.setEnabled(False)
@@ -868,6 +796,8 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         self.toolbar.load_trace_action.setEnabled(True)
 
     def load_data(self, filename: Path | None = None) -> bool:
+        if self.reading_data:
+            return False
         self.clear_ghost()
         self.clear_found_lines()
 
@@ -876,10 +806,12 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         ):
             return False
 
-        data: SpectrometerData | None = load_data(self, filename)
+        data: SpectrometerData | None = self.read_data(
+            filename, self._plot_line, self._plot_data
+        )
         if data is None:
             return False
-        if self._data_mode == data.mode:
+        if self.accepts_mode(data.mode):
             return self.set_data(data)
 
         # save settings for a new window to pick up
@@ -891,9 +823,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
             w = FrequencyDomainWindow(parent=self.parent(), flags=self.windowFlags())
             r: bool = w.set_data(data)
             if r:
-                if self.box_found_lines.model.catalog is None:
-                    self.load_catalog()
-                w.box_found_lines.model.catalog = self.box_found_lines.model.catalog
+                w.load_catalog()
                 w.show()
                 if self._data_mode == DataMode.unknown:
                     self.close()
@@ -917,6 +847,34 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
 
         return False
 
+    def accepts_mode(self, data_mode: DataMode) -> bool:
+        """Tell whether the data of the mode are to be displayed in this window."""
+        if self._data_mode == DataMode.unknown:  # nothing is loaded
+            return data_mode in FrequencyDomainWindow.supported_modes
+        return self._data_mode == data_mode
+
+    def preview_data(self, line: pg.PlotDataItem, data: SpectrometerData) -> None:
+        if line is self._plot_line:
+            if not self.accepts_mode(data.mode):
+                return
+        elif data.mode != self._data_mode:
+            return
+
+        f: NDArray[np.float64]
+        v: NDArray[np.float64]
+        g: NDArray[np.float64]
+        _, f, g, v, *_ = data
+
+        # display the raw data until the processing is possible,
+        # a few points per pixel being enough for a preview
+        step: int = max(1, f.size // (2 * max(1, self.figure.width())))
+        if self._plot_data.y_data_type == PlotDataItem.GAMMA_DATA and g.size == f.size:
+            line.setData(f[::step], g[::step])
+        else:
+            line.setData(f[::step], v[::step])
+        if line is self._plot_line:
+            self._canvas.getViewBox().autoRange()
+
     def set_data(self, data: SpectrometerData | None) -> bool:
         if data is None:
             return False
@@ -944,17 +902,17 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         self._plot_data.set_data(
             frequency_data=f, gamma_data=g, voltage_data=v, time_data=t
         )
-        self.box_find_lines.set_spectrum(f, v, g, self._data_mode)
         self.configure_interface_after_loading_data(f)
 
         self._plot_data.x_data_type = PlotDataItem.FREQUENCY_DATA
-        self._ghost_data.x_data_type = PlotDataItem.FREQUENCY_DATA
 
         self._plot_line.setData(
             name=str(filename.parent / filename.stem),
         )
 
         self.display_gamma_or_voltage()
+        # whether the jump has changed or not, the lines are to be looked for in the new data
+        self.refresh_line_search()
 
         self.set_x_range(*self.box_frequency.range)
         self.set_y_range(*self.box_voltage.range)
@@ -966,12 +924,16 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         return True
 
     def load_ghost_data(self, filename: Path | None = None) -> bool:
+        if self.reading_data:
+            return False
         if not filename and not (
             filename := self._open_data_dialog.get_open_filename()
         ):
             return False
 
-        data: SpectrometerData | None = load_data(self, filename)
+        data: SpectrometerData | None = self.read_data(
+            filename, self._ghost_line, self._ghost_data
+        )
         if data is None:
             return False
 
@@ -1015,31 +977,43 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
     def on_differentiate_action_toggled(self, on: bool) -> None:
         self._data_mode = DataMode.PSK_WITH_JUMP if on else DataMode.PSK
         self.display_gamma_or_voltage()
+
+    @Slot(str)
+    def on_voltage_box_data_mode_changed(self, mode: str) -> None:
+        self._plot_data.y_data_type = mode
+        self.display_gamma_or_voltage()
+
+    @Slot(float)
+    def on_plot_data_jump_changed(self, jump: float) -> None:
+        super().on_plot_data_jump_changed(jump)
+        self.refresh_line_search()
+
+    def refresh_line_search(self) -> None:
+        """Look for the lines in the data as they are displayed, and take the found lines from them."""
+        # the lines are looked for in the data differentiated with the jump
         self.box_find_lines.set_spectrum(
             self._plot_data.frequency_data,
             self._plot_data.voltage_data,
             self._plot_data.gamma_data,
             self._data_mode,
         )
-        self.box_found_lines.model.refresh(self._plot_data)
+        if self._plot_data:  # something is loaded
+            self.box_found_lines.model.refresh(self._plot_data)
 
     @Slot(str)
-    def on_voltage_box_data_mode_changed(self, mode: str) -> None:
-        self._plot_data.y_data_type = mode
-        self._ghost_data.y_data_type = mode
-        self.box_find_lines.set_data_type(mode)
-        self.display_gamma_or_voltage()
+    def on_plot_data_y_data_type_changed(self, data_type: str) -> None:
+        super().on_plot_data_y_data_type_changed(data_type)
+        self.box_find_lines.set_data_type(data_type)
 
     def display_gamma_or_voltage(self) -> None:
+        # the data and the lines found in them are updated on `jump_changed`
         if self._data_mode == DataMode.PSK_WITH_JUMP:
             self._plot_data.jump = self.settings.jump
-            self._ghost_data.jump = self.settings.jump
         else:
             self._plot_data.jump = np.nan
-            self._ghost_data.jump = np.nan
 
         if self._plot_data:  # something is loaded
-            self._plot_line.setData(self._plot_data.x_data, self._plot_data.y_data)
+            self.plot_visible_data(self._plot_line, self._plot_data)
 
             y_data: NDArray[np.float64] = self._plot_data.y_data
             min_y: np.float64 = np.min(y_data)
@@ -1049,7 +1023,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
             self.on_ylim_changed([min_y, max_y])
 
         if self._ghost_data:  # something is loaded
-            self._ghost_line.setData(self._ghost_data.x_data, self._ghost_data.y_data)
+            self.plot_visible_data(self._ghost_line, self._ghost_data)
 
         if self.box_find_lines.found_lines_freq.size:  # something is marked
             self.automatically_found_lines.setData(
@@ -1060,15 +1034,8 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                     )
                 ],
             )
-        if self.user_found_lines_data.size:  # something is marked
-            self.user_found_lines.setData(
-                self.user_found_lines_data,
-                self._plot_data.y_data[
-                    self.box_found_lines.model.frequency_indices(
-                        self._plot_data, self.user_found_lines_data
-                    )
-                ],
-            )
+        if self.user_found_lines_data:  # something is marked
+            self.plot_user_found_lines()
 
         self.setup_left_axis()
         self.hide_cursors()
@@ -1080,8 +1047,7 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
 
         def save_csv(fn: Path) -> None:
             data: NDArray[np.float64]
-            sep: str = self.settings.csv_separator
-            if self.box_voltage.show_gamma:
+            if show_gamma:
                 data = np.column_stack((x * 1e-6, y))
                 # noinspection PyTypeChecker
                 np.savetxt(
@@ -1136,14 +1102,14 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
             from ..utils import html_to_rtf, tag
 
             table: list[list[str]] = []
-            if self.box_voltage.show_gamma:
+            if show_gamma:
                 table.append(
                     list(
                         map(
                             str,
                             [
-                                self.box_found_lines.model.header[0],
-                                self.box_found_lines.model.header[2],
+                                header[0],
+                                header[2],
                             ],
                         )
                     )
@@ -1156,8 +1122,8 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                         map(
                             str,
                             [
-                                self.box_found_lines.model.header[0],
-                                self.box_found_lines.model.header[1],
+                                header[0],
+                                header[1],
                             ],
                         )
                     )
@@ -1184,10 +1150,12 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                 )
 
         def save_xlsx(fn: Path) -> None:
+            import pandas as pd
+
             data: NDArray[np.float64]
             with pd.ExcelWriter(fn) as writer:
                 df: pd.DataFrame
-                if self.box_voltage.show_gamma:
+                if show_gamma:
                     data = np.column_stack((x * 1e-6, y))
                     df = pd.DataFrame(data)
                     df.to_excel(
@@ -1197,13 +1165,12 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                             map(
                                 str,
                                 [
-                                    self.box_found_lines.model.header[0],
-                                    self.box_found_lines.model.header[2],
+                                    header[0],
+                                    header[2],
                                 ],
                             )
                         ),
-                        sheet_name=self._plot_line.name()
-                        or _translate("workbook", "Sheet1"),
+                        sheet_name=sheet_name,
                     )
                 else:
                     data = np.column_stack((x * 1e-6, y * 1e3))
@@ -1215,13 +1182,12 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
                             map(
                                 str,
                                 [
-                                    self.box_found_lines.model.header[0],
-                                    self.box_found_lines.model.header[1],
+                                    header[0],
+                                    header[1],
                                 ],
                             )
                         ),
-                        sheet_name=self._plot_line.name()
-                        or _translate("workbook", "Sheet1"),
+                        sheet_name=sheet_name,
                     )
 
         supported_formats_callbacks: dict[str, Callable[[Path], None]] = {
@@ -1232,8 +1198,8 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
 
         if not (filename := self._save_table_dialog.get_save_filename()):
             return
-        x: NDArray[np.float64] = self._plot_line.xData
-        y: NDArray[np.float64] = self._plot_line.yData
+        x: NDArray[np.float64] = self._plot_data.x_data
+        y: NDArray[np.float64] = self._plot_data.y_data
         max_mark: float
         min_mark: float
         min_mark, max_mark = self._canvas.axes["bottom"]["item"].range
@@ -1241,20 +1207,38 @@ class FrequencyDomainWindow(FrequencyDomainGUI):
         x = x[good]
         y = y[good]
         del good
+        # the file is written in a separate thread, so the widgets are read beforehand
+        sep: str = self.settings.csv_separator
+        show_gamma: bool = self.box_voltage.show_gamma
+        sheet_name: str = self._plot_line.name() or _translate("workbook", "Sheet1")
+        header: list[str] = list(map(str, self.box_found_lines.model.header))
 
         filename_ext: str = filename.suffix.casefold()
         if filename_ext in supported_formats_callbacks:
-            with self.show_loading():
-                supported_formats_callbacks[filename_ext](filename)
+            waiting_screen: WaitingScreen[None] = WaitingScreen(
+                self,
+                label=self.tr("Saving {0}…").format(filename.name),
+                target=supported_formats_callbacks[filename_ext],
+                args=(filename,),
+                cancellable=False,
+            )
+            try:
+                waiting_screen.exec()
+            finally:
+                waiting_screen.deleteLater()
 
     @Slot()
     def on_copy_figure_triggered(self) -> None:
+        from pyqtgraph.exporters import ImageExporter
+
         exporter: ImageExporter = ImageExporter(self._canvas)
         self.hide_cursors()
         exporter.export(copy=True)
 
     @Slot()
     def on_save_figure_triggered(self) -> None:
+        from pyqtgraph.exporters import ImageExporter
+
         exporter: ImageExporter = ImageExporter(self._canvas)
         if not (filename := self._save_image_dialog.get_save_filename()):
             return
@@ -1,8 +1,9 @@
 import abc
 import re
 import sys
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from contextlib import contextmanager, suppress
+from functools import cached_property
 from pathlib import Path
 from threading import Lock
 from typing import TYPE_CHECKING, Any, Literal, TypeVar, cast
@@ -14,15 +15,16 @@ import pyqtgraph as pg  # type: ignore
 # noinspection PyPackageRequirements
 from numpy.typing import NDArray
 from pyqtgraph import functions as fn
-from pyqtgraph.exporters import ImageExporter
 from qtpy.QtCore import (
     QCoreApplication,
     QEvent,
+    QEventLoop,
     QLibraryInfo,
     QLocale,
     QObject,
     QPointF,
     QRectF,
+    QTimer,
     QTranslator,
     Qt,
     Slot,
@@ -42,6 +44,7 @@ from qtpy.QtWidgets import (
     QApplication,
     QMainWindow,
     QMessageBox,
+    QProgressDialog,
     QStatusBar,
     QWidget,
 )
@@ -49,8 +52,16 @@ from qtpy.QtWidgets import (
 from ... import __version__
 from ...plot_data_item import PlotDataItem
 from ...settings import Settings
-from ...utils import DataMode, find_qm_files, load_icon, the
+from ...utils import (
+    DataMode,
+    SpectrometerData,
+    ask_cell_length,
+    find_qm_files,
+    load_icon,
+    the,
+)
 from ...widgets.file_dialog import OpenFileDialog, SaveFileDialog
+from ...widgets.toolbar import ToolBar
 from ...widgets.valuelabel import ValueLabel
 
 __all__ = ["GUI"]
@@ -64,6 +75,8 @@ class QABCMeta(type(QObject), abc.ABCMeta):
 
 
 class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
+    toolbar: ToolBar
+
     def __init__(
         self,
         parent: QWidget | None = None,
@@ -87,9 +100,21 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
         self._canvas: pg.PlotItem = self.figure.getPlotItem()
 
         self._plot_line: pg.PlotDataItem = self.figure.plot(np.empty(0), name="")
-        self._plot_data: PlotDataItem = PlotDataItem()
+        self._plot_data: PlotDataItem = PlotDataItem(self)
         self._ghost_line: pg.PlotDataItem = self.figure.plot(np.empty(0), name="")
-        self._ghost_data: PlotDataItem = PlotDataItem()
+        self._ghost_data: PlotDataItem = PlotDataItem(self)
+        self._plot_data.jump_changed.connect(self.on_plot_data_jump_changed)
+        self._plot_data.x_data_type_changed.connect(
+            self.on_plot_data_x_data_type_changed
+        )
+        self._plot_data.y_data_type_changed.connect(
+            self.on_plot_data_y_data_type_changed
+        )
+        # the line that displays the data being loaded
+        self._previewed_line: pg.PlotDataItem | None = None
+        # stops loading the data, set while the data are being loaded
+        self._cancel_reading: Callable[[], None] | None = None
+        self._close_when_read: bool = False
 
         self._cursor_x: ValueLabel = ValueLabel(
             self.status_bar, siPrefix=True, decimals=6
@@ -109,7 +134,30 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
 
         self._view_all_action: QAction = QAction()
 
-        self._open_table_dialog: OpenFileDialog = OpenFileDialog(
+        self._mouse_moved_signal_proxy: pg.SignalProxy = pg.SignalProxy(
+            cast(pg.GraphicsScene, self.figure.scene()).sigMouseMoved,
+            rateLimit=10,
+            slot=self.on_mouse_moved,
+        )
+        self._axis_range_changed_signal_proxy: pg.SignalProxy = pg.SignalProxy(
+            self.figure.sigRangeChanged, rateLimit=20, slot=self.on_lim_changed
+        )
+        self._view_resized_signal_proxy: pg.SignalProxy = pg.SignalProxy(
+            self._canvas.getViewBox().sigResized,
+            rateLimit=20,
+            slot=self.on_view_resized,
+        )
+
+        with suppress(AttributeError):
+            # `colorSchemeChanged` exists starting from Qt6
+            QGuiApplication.styleHints().colorSchemeChanged.connect(
+                self.on_color_scheme_changed
+            )
+
+    # the dialogs are created on the first use to show the window sooner
+    @cached_property
+    def _open_table_dialog(self) -> OpenFileDialog:
+        return OpenFileDialog(
             settings=self.settings,
             supported_mimetype_filters=[
                 OpenFileDialog.SupportedMimetypeItem(
@@ -127,7 +175,10 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
             ],
             parent=self,
         )
-        self._open_data_dialog: OpenFileDialog = OpenFileDialog(
+
+    @cached_property
+    def _open_data_dialog(self) -> OpenFileDialog:
+        return OpenFileDialog(
             settings=self.settings,
             supported_name_filters=[
                 OpenFileDialog.SupportedNameFilterItem(
@@ -143,7 +194,10 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
             ],
             parent=self,
         )
-        self._save_table_dialog: SaveFileDialog = SaveFileDialog(
+
+    @cached_property
+    def _save_table_dialog(self) -> SaveFileDialog:
+        return SaveFileDialog(
             settings=self.settings,
             supported_mimetype_filters=[
                 SaveFileDialog.SupportedMimetypeItem(
@@ -161,7 +215,12 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
             ],
             parent=self,
         )
-        self._save_image_dialog: SaveFileDialog = SaveFileDialog(
+
+    @cached_property
+    def _save_image_dialog(self) -> SaveFileDialog:
+        from pyqtgraph.exporters import ImageExporter
+
+        return SaveFileDialog(
             settings=self.settings,
             supported_mimetype_filters=[
                 SaveFileDialog.SupportedMimetypeItem(
@@ -173,27 +232,19 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
             parent=self,
         )
 
-        self._mouse_moved_signal_proxy: pg.SignalProxy = pg.SignalProxy(
-            cast(pg.GraphicsScene, self.figure.scene()).sigMouseMoved,
-            rateLimit=10,
-            slot=self.on_mouse_moved,
-        )
-        self._axis_range_changed_signal_proxy: pg.SignalProxy = pg.SignalProxy(
-            self.figure.sigRangeChanged, rateLimit=20, slot=self.on_lim_changed
-        )
-
-        with suppress(AttributeError):
-            # `colorSchemeChanged` exists starting from Qt6
-            QGuiApplication.styleHints().colorSchemeChanged.connect(
-                self.on_color_scheme_changed
-            )
-
     def event(self, event: QEvent) -> bool:
         if event.type() == QEvent.Type.PaletteChange:
             self._setup_colors()
         return super().event(event)
 
     def closeEvent(self, event: QCloseEvent) -> None:
+        if self._cancel_reading is not None:
+            # the window is needed until the loading stops
+            self._close_when_read = True
+            self._cancel_reading()
+            event.ignore()
+            return
+
         close_code: int
         if self._data_mode == DataMode.unknown:  # nothing is loaded
             close_code = QMessageBox.StandardButton.Yes
@@ -395,6 +446,113 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
             self.setCursor(last_cursor)
             self.setEnabled(True)
 
+    @property
+    def reading_data(self) -> bool:
+        """Whether a file is being loaded by `read_data`."""
+        return self._cancel_reading is not None
+
+    def read_data(
+        self, filename: Path, line: pg.PlotDataItem, plot_data: PlotDataItem
+    ) -> SpectrometerData | None:
+        """Load the data in a separate thread, displaying the data loaded so far.
+
+        The toolbar actions are disabled meanwhile, and closing the window cancels the loading.
+
+        :param filename: The file to load the data from.
+        :param line: The line to display the data loaded so far on.
+        :param plot_data: The data the line displays otherwise.
+        :return: The data or `None` if the file is not supported, another file is being loaded,
+            or the loading has been cancelled.
+        """
+        if self.reading_data:
+            return None
+
+        from ...data_loader import DataLoader
+
+        loader: DataLoader = DataLoader(
+            filename,
+            ask_cell_length=lambda cell_length: ask_cell_length(self, cell_length),
+            # let the loader outlive the window if the loading is cancelled
+            parent=QCoreApplication.instance(),
+        )
+        if not loader.supported:
+            loader.deleteLater()
+            return None
+
+        progress: QProgressDialog = QProgressDialog(self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setWindowTitle(self.windowTitle())
+        progress.setLabelText(self.tr("Loading {}…").format(filename.name))
+        progress.setRange(0, 100)
+        progress.setMinimumDuration(500)
+
+        @Slot(object)
+        def on_data_loaded(data: SpectrometerData) -> None:
+            if not loader.isInterruptionRequested():
+                self.preview_data(line, data)
+
+        @Slot(float)
+        def on_progress_changed(value: float) -> None:
+            if not loader.isInterruptionRequested():
+                progress.setValue(round(value * progress.maximum()))
+
+        loop: QEventLoop = QEventLoop(self)
+
+        @Slot()
+        def cancel() -> None:
+            loader.requestInterruption()
+            loop.quit()
+
+        loader.data_loaded.connect(on_data_loaded)
+        loader.progress_changed.connect(on_progress_changed)
+        loader.finished.connect(loop.quit)
+        progress.canceled.connect(cancel)
+        # the window stays responsive while the progress is not shown yet
+        enabled_actions: list[QAction] = [
+            action for action in self.toolbar.actions() if action.isEnabled()
+        ]
+        for action in enabled_actions:
+            action.setEnabled(False)
+        self._cancel_reading = cancel
+        self._previewed_line = line
+        try:
+            loader.start()
+            loop.exec()
+        finally:
+            self._cancel_reading = None
+            for action in enabled_actions:
+                action.setEnabled(True)
+        progress.reset()
+        progress.deleteLater()
+        if self._close_when_read:
+            self._close_when_read = False
+            QTimer.singleShot(0, self.close)
+
+        # restore the line for the complete data to replace it
+        self._axis_range_changed_signal_proxy.flush()
+        self._previewed_line = None
+        if plot_data:
+            self.plot_visible_data(line, plot_data)
+        else:
+            line.clear()
+
+        if loader.isInterruptionRequested():
+            # the loader is still running, maybe
+            loader.finished.connect(loader.deleteLater)
+            if loader.isFinished():
+                loader.deleteLater()
+            self.status_bar.showMessage(self.tr("Loading has been cancelled."))
+            return None
+        loader.wait()
+        try:
+            return loader.result()
+        finally:
+            loader.deleteLater()
+
+    @abc.abstractmethod
+    def preview_data(self, line: pg.PlotDataItem, data: SpectrometerData) -> None:
+        """Display the data loaded so far."""
+
     def get_config_value(
         self,
         section: str,
@@ -508,7 +666,43 @@ class GUI(QMainWindow, abc.ABC, metaclass=QABCMeta):
             canvas.ctrl.autoAlphaCheck.hide()
         self.figure.sceneObj.contextMenu = None
 
+    def plot_visible_data(self, line: pg.PlotDataItem, data: PlotDataItem) -> None:
+        """Display the data in the visible range at the screen resolution."""
+        view_box: pg.ViewBox = self._canvas.getViewBox()
+        min_x: float
+        max_x: float
+        min_x, max_x = view_box.viewRange()[0]
+        line.setData(*data.visible_data(min_x, max_x, round(view_box.width())))
+
+    # the ghost is displayed the same way as the data;
+    # the caches of the items are dropped by the items themselves
+    @Slot(float)
+    def on_plot_data_jump_changed(self, jump: float) -> None:
+        self._ghost_data.jump = jump
+
+    @Slot(str)
+    def on_plot_data_x_data_type_changed(self, data_type: str) -> None:
+        self._ghost_data.x_data_type = data_type
+
+    @Slot(str)
+    def on_plot_data_y_data_type_changed(self, data_type: str) -> None:
+        self._ghost_data.y_data_type = data_type
+
+    def replot_visible_data(self) -> None:
+        line: pg.PlotDataItem
+        data: PlotDataItem
+        for line, data in (
+            (self._plot_line, self._plot_data),
+            (self._ghost_line, self._ghost_data),
+        ):
+            if data and line is not self._previewed_line:  # something is loaded
+                self.plot_visible_data(line, data)
+
+    def on_view_resized(self, _arg: tuple[pg.ViewBox]) -> None:
+        self.replot_visible_data()
+
     def on_lim_changed(self, arg: tuple[pg.PlotWidget, list[list[float]]]) -> None:
+        self.replot_visible_data()
         if self._ignore_scale_change.locked():
             return
         rect: list[list[float]] = arg[1]
@@ -1,3 +1,4 @@
+from os import cpu_count
 from typing import cast
 
 # noinspection PyPackageRequirements
@@ -6,7 +7,7 @@ import pyqtgraph as pg  # type: ignore
 
 # noinspection PyPackageRequirements
 from numpy.typing import NDArray
-from qtpy.QtCore import QCoreApplication, Qt, Signal, Slot
+from qtpy.QtCore import QCoreApplication, QTimer, Qt, Signal, Slot
 from qtpy.QtWidgets import (
     QDockWidget,
     QFormLayout,
@@ -17,6 +18,7 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
+from ...detection import PeakSelector, resampled_model_signal
 from ...plot_data_item import PlotDataItem
 from ...settings import Settings
 from ...utils import DataMode, resource_path, the
@@ -25,6 +27,9 @@ __all__ = ["FindLinesBox"]
 
 _translate = QCoreApplication.translate
 
+# the time to wait for the search threshold to settle, in milliseconds
+THRESHOLD_DELAY: int = 250
+
 
 class FindLinesBox(QDockWidget):
     lines_found: Signal = Signal(int, name="lines_found")
@@ -61,6 +66,21 @@ class FindLinesBox(QDockWidget):
         self.current_freq: float = np.nan
         self.found_lines_freq: NDArray[np.double] = np.empty(0)
 
+        # the model signal re-scaled to the frequency step
+        self._model_signal_resampled: tuple[float, NDArray[np.double]] | None = None
+        # the data, the frequency step, the data type, and the correlated spectrum
+        self._correlated_spectrum: (
+            tuple[NDArray[np.double], float, str, NDArray[np.double]] | None
+        ) = None
+        # the data the peaks are looked for in, and the peaks prepared to be selected
+        self._peak_selector: tuple[NDArray[np.double], PeakSelector] | None = None
+        # whether to look for the lines again when the threshold changes
+        self._lines_found_automatically: bool = False
+        # look for the lines again only once the threshold stops changing
+        self._threshold_timer: QTimer = QTimer(self)
+        self._threshold_timer.setSingleShot(True)
+        self._threshold_timer.setInterval(THRESHOLD_DELAY)
+
         self.model_signal: NDArray[np.double]
         try:
             self.model_signal = np.fromiter(
@@ -123,6 +143,7 @@ class FindLinesBox(QDockWidget):
 
     def setup_ui_actions(self) -> None:
         self.spin_threshold.valueChanged.connect(self.on_spin_threshold_changed)
+        self._threshold_timer.timeout.connect(self.on_threshold_settled)
         self.button_clear_found_lines.clicked.connect(self.on_clear_found_lines_clicked)
         self.button_find_lines.clicked.connect(self.on_button_find_lines_clicked)
         self.button_prev_found_line.clicked.connect(self.on_prev_found_line_clicked)
@@ -136,10 +157,19 @@ class FindLinesBox(QDockWidget):
     def on_spin_threshold_changed(self, threshold: float) -> None:
         with self.settings.section("lineSearch"):
             self.settings.setValue("threshold", threshold)
+        if self._lines_found_automatically:
+            self._threshold_timer.start()
+
+    @Slot()
+    def on_threshold_settled(self) -> None:
+        if self._lines_found_automatically:
+            self.find_lines()
+            self.found_lines_changed.emit(self.found_lines_freq)
 
     @Slot()
     def on_button_find_lines_clicked(self) -> None:
         self.find_lines()
+        self._lines_found_automatically = True
         self.found_lines_changed.emit(self.found_lines_freq)
 
     @Slot()
@@ -157,6 +187,10 @@ class FindLinesBox(QDockWidget):
         self.v = v
         self.g = g
         self.data_mode = data_mode
+        self._correlated_spectrum = None
+        self._peak_selector = None
+        self._lines_found_automatically = False
+        self._threshold_timer.stop()
         self.button_find_lines.setEnabled(
             bool(self.data_type) and data_mode != DataMode.unknown
         )
@@ -175,6 +209,8 @@ class FindLinesBox(QDockWidget):
             self.found_lines_changed.emit(self.found_lines_freq)
 
     def clear_found_lines(self) -> None:
+        self._lines_found_automatically = False
+        self._threshold_timer.stop()
         self.found_lines_freq = np.empty(0)
         self.button_clear_found_lines.setEnabled(False)
         self.button_next_found_line.setEnabled(False)
@@ -191,9 +227,57 @@ class FindLinesBox(QDockWidget):
             self.found_lines_freq = remaining_frequencies
             self.line_removed.emit(f)
 
-    def find_lines(self) -> NDArray[np.long]:
-        from ...detection import correlation, peaks_positions
+    def resampled_model_signal(self, step: float) -> NDArray[np.double]:
+        """Get the model signal re-scaled to the frequency mesh of the given step."""
+        if (
+            self._model_signal_resampled is not None
+            and self._model_signal_resampled[0] == step
+        ):
+            return self._model_signal_resampled[1]
+        y_model_new: NDArray[np.float64] = resampled_model_signal(
+            self.model_signal, step
+        )
+        self._model_signal_resampled = step, y_model_new
+        return y_model_new
+
+    def correlated_spectrum(
+        self, x: NDArray[np.double], y: NDArray[np.double]
+    ) -> NDArray[np.double]:
+        """Get the spectrum correlated with the model signal.
+
+        The result is kept for the same data, frequency step, and data type,
+        so that only the peaks are looked for again when the threshold changes.
+        """
+        from ...detection import correlation
+
+        step: float = x[1] - x[0]
+        if self._correlated_spectrum is not None:
+            cached_y, cached_step, cached_data_type, correlated = (
+                self._correlated_spectrum
+            )
+            if (
+                cached_y is y
+                and cached_step == step
+                and cached_data_type == self.data_type
+            ):
+                return correlated
+        correlated = correlation(
+            self.resampled_model_signal(step), x, y, workers=cpu_count() or 1
+        )
+        self._correlated_spectrum = y, step, self.data_type, correlated
+        return correlated
+
+    def peak_selector(
+        self, x: NDArray[np.double], y: NDArray[np.double]
+    ) -> PeakSelector:
+        """Get the peaks of `y` prepared to be selected, kept for the same data."""
+        if self._peak_selector is not None and self._peak_selector[0] is y:
+            return self._peak_selector[1]
+        peak_selector: PeakSelector = PeakSelector(x, y, workers=cpu_count() or 1)
+        self._peak_selector = y, peak_selector
+        return peak_selector
 
+    def find_lines(self) -> NDArray[np.long]:
         found_lines_pos: NDArray[np.long] = np.empty(0, dtype=np.long).astype(np.long)
 
         if self.data_mode == DataMode.unknown or self.model_signal.size < 2:
@@ -213,23 +297,11 @@ class FindLinesBox(QDockWidget):
         threshold: float = self.spin_threshold.value()
 
         if self.data_mode == DataMode.FS:
-            # re-scale the signal to the actual frequency mesh
-            # noinspection PyTypeChecker
-            x_model: NDArray[np.float64] = (
-                np.arange(self.model_signal.size, dtype=np.double) * 0.1
-            )
-            # noinspection PyTypeChecker
-            x_model_new: NDArray[np.float64] = np.arange(
-                x_model[0], x_model[-1], x[1] - x[0]
-            )
-            y_model_new: NDArray[np.float64] = np.interp(
-                x_model_new, x_model, self.model_signal
-            )
-            found_lines_pos = peaks_positions(
-                x, correlation(y_model_new, x, y), threshold=1.0 / threshold
-            )
+            found_lines_pos = self.peak_selector(
+                x, self.correlated_spectrum(x, y)
+            ).select(threshold=1.0 / threshold)
         elif self.data_mode in (DataMode.PSK, DataMode.PSK_WITH_JUMP):
-            found_lines_pos = peaks_positions(x, y, threshold=1.0 / threshold)
+            found_lines_pos = self.peak_selector(x, y).select(threshold=1.0 / threshold)
 
         with the(bool(found_lines_pos.size)) as anything:
             self.button_clear_found_lines.setEnabled(anything)
@@ -4,12 +4,10 @@ from typing import cast
 
 # noinspection PyPackageRequirements
 import numpy as np
-import pandas as pd  # type: ignore
 import pyqtgraph as pg  # type: ignore
 
 # noinspection PyPackageRequirements
 from numpy.typing import NDArray
-from pyqtgraph.exporters.ImageExporter import ImageExporter
 from qtpy.QtCore import (
     QCoreApplication,
     Qt,
@@ -24,8 +22,9 @@ from qtpy.QtGui import (
 from qtpy.QtWidgets import QDockWidget, QMessageBox, QWidget
 
 from ..plot_data_item import PlotDataItem
-from ..utils import DataMode, SpectrometerData, load_data, the
+from ..utils import DataMode, SpectrometerData, the
 from ..widgets.preferences import Preferences
+from ..widgets.waiting_screen import WaitingScreen
 from .gui.time_domain_gui import TimeDomainGUI
 
 __all__ = ["TimeDomainWindow"]
@@ -44,6 +43,8 @@ class TimeDomainWindow(TimeDomainGUI):
     ) -> None:
         super().__init__(parent, flags)
 
+        self._plot_data.x_data_type = PlotDataItem.TIME_DATA
+
         self.setup_ui()
         self._setup_colors()
 
@@ -284,6 +285,8 @@ class TimeDomainWindow(TimeDomainGUI):
         self.toolbar.save_figure_action.setEnabled(True)
 
     def load_data(self, filename: Path | None = None) -> bool:
+        if self.reading_data:
+            return False
         self.clear_ghost()
 
         if not filename and not (
@@ -291,10 +294,12 @@ class TimeDomainWindow(TimeDomainGUI):
         ):
             return False
 
-        data: SpectrometerData | None = load_data(self, filename)
+        data: SpectrometerData | None = self.read_data(
+            filename, self._plot_line, self._plot_data
+        )
         if data is None:
             return False
-        if self._data_mode == data.mode:
+        if self.accepts_mode(data.mode):
             return self.set_data(data)
 
         # save settings for a new window to pick up
@@ -330,6 +335,34 @@ class TimeDomainWindow(TimeDomainGUI):
 
         return False
 
+    def accepts_mode(self, data_mode: DataMode) -> bool:
+        """Tell whether the data of the mode are to be displayed in this window."""
+        if self._data_mode == DataMode.unknown:  # nothing is loaded
+            return data_mode in TimeDomainWindow.supported_modes
+        return self._data_mode == data_mode
+
+    def preview_data(self, line: pg.PlotDataItem, data: SpectrometerData) -> None:
+        if line is self._plot_line:
+            if not self.accepts_mode(data.mode):
+                return
+        elif data.mode != self._data_mode:
+            return
+
+        v: NDArray[np.float64]
+        g: NDArray[np.float64]
+        t: NDArray[np.float64]
+        _, _, g, v, t, _ = data
+
+        # display the raw data until the processing is possible,
+        # a few points per pixel being enough for a preview
+        step: int = max(1, t.size // (2 * max(1, self.figure.width())))
+        if self._plot_data.y_data_type == PlotDataItem.GAMMA_DATA and g.size == t.size:
+            line.setData(t[::step], g[::step])
+        else:
+            line.setData(t[::step], v[::step])
+        if line is self._plot_line:
+            self._canvas.getViewBox().autoRange()
+
     def set_data(self, data: SpectrometerData | None) -> bool:
         if data is None:
             return False
@@ -359,9 +392,6 @@ class TimeDomainWindow(TimeDomainGUI):
         )
         self.configure_interface_after_loading_data(t)
 
-        self._plot_data.x_data_type = PlotDataItem.TIME_DATA
-        self._ghost_data.x_data_type = PlotDataItem.TIME_DATA
-
         self._plot_line.setData(
             name=str(filename.parent / filename.stem),
         )
@@ -378,12 +408,16 @@ class TimeDomainWindow(TimeDomainGUI):
         return True
 
     def load_ghost_data(self, filename: Path | None = None) -> bool:
+        if self.reading_data:
+            return False
         if not filename and not (
             filename := self._open_data_dialog.get_open_filename()
         ):
             return False
 
-        data: SpectrometerData | None = load_data(self, filename)
+        data: SpectrometerData | None = self.read_data(
+            filename, self._ghost_line, self._ghost_data
+        )
         if data is None:
             return False
 
@@ -419,15 +453,13 @@ class TimeDomainWindow(TimeDomainGUI):
     @Slot(str)
     def on_voltage_box_data_mode_changed(self, mode: str) -> None:
         self._plot_data.y_data_type = mode
-        self._ghost_data.y_data_type = mode
         self.display_gamma_or_voltage()
 
     def display_gamma_or_voltage(self) -> None:
         self._plot_data.jump = np.nan
-        self._ghost_data.jump = np.nan
 
         if self._plot_data:  # something is loaded
-            self._plot_line.setData(self._plot_data.x_data, self._plot_data.y_data)
+            self.plot_visible_data(self._plot_line, self._plot_data)
 
             y_data: NDArray[np.float64] = self._plot_data.y_data
             min_y: np.float64 = np.min(y_data)
@@ -437,7 +469,7 @@ class TimeDomainWindow(TimeDomainGUI):
             self.on_ylim_changed([min_y, max_y])
 
         if self._ghost_data:  # something is loaded
-            self._ghost_line.setData(self._ghost_data.x_data, self._ghost_data.y_data)
+            self.plot_visible_data(self._ghost_line, self._ghost_data)
 
         self.setup_left_axis()
         self.hide_cursors()
@@ -449,8 +481,7 @@ class TimeDomainWindow(TimeDomainGUI):
 
         def save_csv(fn: Path) -> None:
             data: NDArray[np.float64]
-            sep: str = self.settings.csv_separator
-            if self.box_voltage.show_gamma:
+            if show_gamma:
                 data = np.column_stack((x, y))
                 # noinspection PyTypeChecker
                 np.savetxt(
@@ -505,7 +536,7 @@ class TimeDomainWindow(TimeDomainGUI):
             from ..utils import html_to_rtf, tag
 
             table: list[list[str]] = []
-            if self.box_voltage.show_gamma:
+            if show_gamma:
                 table.append(
                     [
                         _translate("plot axes labels", "Time (s)"),
@@ -543,10 +574,12 @@ class TimeDomainWindow(TimeDomainGUI):
                 )
 
         def save_xlsx(fn: Path) -> None:
+            import pandas as pd  # type: ignore
+
             data: NDArray[np.float64]
             with pd.ExcelWriter(fn) as writer:
                 df: pd.DataFrame
-                if self.box_voltage.show_gamma:
+                if show_gamma:
                     data = np.column_stack((x, y))
                     df = pd.DataFrame(data)
                     df.to_excel(
@@ -556,8 +589,7 @@ class TimeDomainWindow(TimeDomainGUI):
                             _translate("plot axes labels", "Time (s)"),
                             _translate("plot axes labels", "Absorption (cm⁻¹)"),
                         ],
-                        sheet_name=self._plot_line.name()
-                        or _translate("workbook", "Sheet1"),
+                        sheet_name=sheet_name,
                     )
                 else:
                     data = np.column_stack((x, y * 1e3))
@@ -569,8 +601,7 @@ class TimeDomainWindow(TimeDomainGUI):
                             _translate("plot axes labels", "Time (s)"),
                             _translate("plot axes labels", "Voltage (mV)"),
                         ],
-                        sheet_name=self._plot_line.name()
-                        or _translate("workbook", "Sheet1"),
+                        sheet_name=sheet_name,
                     )
 
         supported_formats_callbacks: dict[str, Callable[[Path], None]] = {
@@ -581,8 +612,8 @@ class TimeDomainWindow(TimeDomainGUI):
 
         if not (filename := self._save_table_dialog.get_save_filename()):
             return
-        x: NDArray[np.float64] = self._plot_line.xData
-        y: NDArray[np.float64] = self._plot_line.yData
+        x: NDArray[np.float64] = self._plot_data.x_data
+        y: NDArray[np.float64] = self._plot_data.y_data
         max_mark: float
         min_mark: float
         min_mark, max_mark = self._canvas.axes["bottom"]["item"].range
@@ -590,20 +621,37 @@ class TimeDomainWindow(TimeDomainGUI):
         x = x[good]
         y = y[good]
         del good
+        # the file is written in a separate thread, so the widgets are read beforehand
+        sep: str = self.settings.csv_separator
+        show_gamma: bool = self.box_voltage.show_gamma
+        sheet_name: str = self._plot_line.name() or _translate("workbook", "Sheet1")
 
         filename_ext: str = filename.suffix.casefold()
         if filename_ext in supported_formats_callbacks:
-            with self.show_loading():
-                supported_formats_callbacks[filename_ext](filename)
+            waiting_screen: WaitingScreen[None] = WaitingScreen(
+                self,
+                label=self.tr("Saving {0}…").format(filename.name),
+                target=supported_formats_callbacks[filename_ext],
+                args=(filename,),
+                cancellable=False,
+            )
+            try:
+                waiting_screen.exec()
+            finally:
+                waiting_screen.deleteLater()
 
     @Slot()
     def on_copy_figure_triggered(self) -> None:
+        from pyqtgraph.exporters import ImageExporter
+
         exporter: ImageExporter = ImageExporter(self._canvas)
         self.hide_cursors()
         exporter.export(copy=True)
 
     @Slot()
     def on_save_figure_triggered(self) -> None:
+        from pyqtgraph.exporters import ImageExporter
+
         exporter: ImageExporter = ImageExporter(self._canvas)
         if not (filename := self._save_image_dialog.get_save_filename()):
             return
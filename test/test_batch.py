@@ -0,0 +1,155 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from psk_viewer import data_cache
+from psk_viewer.batch import (
+    DEFAULT_THRESHOLD,
+    FOUND_LINES_SUFFIX,
+    GAMMA_DATA,
+    gui_settings,
+    main,
+)
+
+# the positions of the lines in the spectrum
+LINES: tuple[int, ...] = (10000, 25000, 40000)
+
+
+@pytest.fixture
+def settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    from qtpy.QtCore import QSettings
+
+    path: Path = tmp_path / "config"
+    QSettings.setPath(
+        QSettings.Format.NativeFormat, QSettings.Scope.UserScope, str(path)
+    )
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(path))
+    return path
+
+
+def write_settings(**values: object) -> None:
+    from qtpy.QtCore import QSettings
+
+    settings: QSettings = QSettings("SavSoft", "Spectrometer Viewer")
+    for key, value in values.items():
+        settings.setValue(key.replace("__", "/"), value)
+    settings.sync()
+
+
+def found_lines_count(spectrum: Path, *args: str) -> int:
+    assert main([str(spectrum), "-j", "1", *args]) == 0
+    return np.loadtxt(
+        spectrum.with_name(spectrum.stem + FOUND_LINES_SUFFIX), delimiter="\t", ndmin=2
+    ).shape[0]
+
+
+@pytest.fixture
+def spectrum(tmp_path: Path) -> Path:
+    rng: np.random.Generator = np.random.default_rng(0)
+    x: NDArray[np.float64] = np.arange(50000, dtype=np.float64)
+    voltage: NDArray[np.float64] = rng.normal(scale=0.01, size=x.size)
+    for line in LINES:
+        voltage += 0.5 * np.exp(-(((x - line) / 100.0) ** 2))
+    path: Path = tmp_path / "spectrum.scandat"
+    with path.open("w") as f_out:
+        f_out.write(
+            "*****\n"
+            "F(start) [MHz]:\n118000000.0\n"
+            "F(stept) [MHz]:\n10.0\n"
+            "F(jump) [MHz]:\n600.0\n"
+            "U - shift:\n2.5\n"
+            "Length of Cell:\n100\n"
+            "Finish\n"
+        )
+        f_out.writelines(f"{v:.6f}\t1.0\n" for v in voltage)
+    return path
+
+
+def test_main(
+    settings: Path,
+    spectrum: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setattr(data_cache, "cache_dir", lambda: tmp_path / "cache")
+    broken: Path = tmp_path / "broken.scandat"
+    broken.write_text("*****\n")
+    output_dir: Path = tmp_path / "lines"
+
+    assert main([str(spectrum), "-j", "1", "-o", str(output_dir)]) == 0
+    table: Path = output_dir / (spectrum.stem + FOUND_LINES_SUFFIX)
+    lines: NDArray[np.float64] = np.loadtxt(table, delimiter="\t", ndmin=2)
+    assert lines.shape[1] == 3
+    # the lines are found within their width, in MHz, with the voltage in mV
+    for line in LINES:
+        near: NDArray[np.bool] = np.abs(lines[:, 0] - (118000.0 + line * 0.01)) < 1.0
+        assert np.any(near)
+        assert lines[near, 1].max() > 0.4
+    # the cache of the GUI is left alone
+    assert not (tmp_path / "cache").exists()
+
+    # a broken file fails alone
+    assert main([str(tmp_path), "-s", "comma", "-j", "2"]) == 1
+    out, err = capsys.readouterr()
+    assert str(broken) in err
+    assert str(spectrum) not in err
+    assert "1 of 2 files processed" in out
+    lines = np.loadtxt(
+        spectrum.with_name(spectrum.stem + FOUND_LINES_SUFFIX), delimiter=",", ndmin=2
+    )
+    assert lines.size
+
+
+def test_detection_failure(
+    settings: Path, spectrum: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # the FS spectrum loads, but its frequencies go down
+    broken: Path = tmp_path / "broken.fmd"
+    broken.write_text("FStart [GHz]: 120\nFStop [GHz]: 118\n")
+    broken.with_suffix(".frd").write_text("1.0\n" * 100)
+    for jobs in ("1", "2"):
+        assert main([str(broken), str(spectrum), "-j", jobs]) == 1
+        out, err = capsys.readouterr()
+        assert str(broken) in err
+        assert str(spectrum) not in err
+        assert "1 of 2 files processed" in out
+
+
+def test_gui_settings(settings: Path, spectrum: Path) -> None:
+    assert gui_settings() == (DEFAULT_THRESHOLD, False)
+    write_settings(lineSearch__threshold=1000.0, display__unit=GAMMA_DATA)
+    assert gui_settings() == (1000.0, True)
+    write_settings(lineSearch__threshold="many")
+    assert gui_settings() == (DEFAULT_THRESHOLD, True)
+
+    # the command line overrides the settings
+    default_count: int = found_lines_count(spectrum, "--voltage")
+    write_settings(lineSearch__threshold=1000.0)
+    count: int = found_lines_count(spectrum, "--voltage")
+    assert count != default_count
+    assert found_lines_count(spectrum, "--voltage", "-t", "1000") == count
+    assert found_lines_count(spectrum, "--voltage", "-t", "12") == default_count
+
+
+def test_no_qt_gui(settings: Path, spectrum: Path) -> None:
+    # the settings are read with `QtCore` only;
+    # `qtpy.QtCore` loads `PySide6.QtGui` for its shims, but no widgets
+    code: str = (
+        "import sys\n"
+        "from psk_viewer.batch import main\n"
+        "exit_code = main(sys.argv[1:])\n"
+        "assert not {'qtpy.QtGui', 'qtpy.QtWidgets', 'pyqtgraph'} & set(sys.modules)\n"
+        "assert not any(module.endswith('.QtWidgets') for module in sys.modules)\n"
+        "sys.exit(exit_code)\n"
+    )
+    env: dict[str, str] = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    env["XDG_CACHE_HOME"] = str(spectrum.parent / "cache")
+    subprocess.run(
+        [sys.executable, "-c", code, str(spectrum), "-j", "1"], check=True, env=env
+    )
@@ -0,0 +1,124 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pycatsearch")
+
+from pycatsearch.utils import LINES
+
+from psk_viewer import catalog_cache, data_cache
+from psk_viewer.catalog_cache import cached_catalog, load_catalog
+from psk_viewer.catalog_index import CatalogIndex
+
+
+@pytest.fixture
+def source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # the catalogs are pruned along with the spectra
+    for module in (catalog_cache, data_cache):
+        monkeypatch.setattr(module, "cache_dir", lambda: tmp_path / "cache")
+    rng: np.random.Generator = np.random.default_rng(0)
+    catalog: dict[str, dict[str, object]] = {
+        str(tag): {
+            "speciestag": tag,
+            "name": f"HC{index}N, v7=1",
+            "stoichiometricformula": f"C{index}HN",
+            "degreesoffreedom": index % 3,
+            "lines": [
+                {"frequency": frequency, "intensity": rng.uniform(-8.0, -2.0)}
+                for frequency in np.sort(
+                    np.round(rng.uniform(1e5, 1.2e5, rng.integers(1, 30)), 4)
+                ).tolist()
+            ],
+        }
+        for index, tag in enumerate(range(26501, 26521))
+    }
+    path: Path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"catalog": catalog, "frequency": [[1e5, 1.2e5]]}))
+    return path
+
+
+def assert_equal_catalogs(index: CatalogIndex, other: CatalogIndex) -> None:
+    assert np.array_equal(index.frequencies, other.frequencies)
+    assert np.array_equal(index.intensities, other.intensities)
+    assert np.array_equal(index.entry_ids, other.entry_ids)
+    assert index.sources == other.sources
+    assert len(index.entries) == len(other.entries)
+    for entry, other_entry in zip(index.entries, other.entries, strict=True):
+        for slot in type(entry).__slots__:
+            if slot != LINES:
+                assert getattr(entry, slot) == getattr(other_entry, slot)
+                assert type(getattr(entry, slot)) is type(getattr(other_entry, slot))
+
+
+def test_save_load(source: Path) -> None:
+    assert cached_catalog([source]) is None
+    index: CatalogIndex = load_catalog([source])
+    assert len(index)
+    cached: CatalogIndex | None = cached_catalog([source])
+    assert cached is not None
+    assert_equal_catalogs(index, cached)
+    assert cached.substances(float(index.frequencies[0]), 0.1)
+
+
+def test_source_changed(source: Path) -> None:
+    load_catalog([source])
+    assert cached_catalog([source]) is not None
+
+    stat: os.stat_result = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cached_catalog([source]) is None
+    load_catalog([source])
+    assert cached_catalog([source]) is not None
+
+    # the same time, another size
+    stat = source.stat()
+    with source.open("a") as f_out:
+        f_out.write(" ")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cached_catalog([source]) is None
+
+
+def test_corrupt_cache(source: Path) -> None:
+    index: CatalogIndex = load_catalog([source])
+    cache_files: list[Path] = list(
+        catalog_cache.cache_dir().glob("*" + catalog_cache.CATALOG_SUFFIX)
+    )
+    assert len(cache_files) == 1
+    content: bytes = cache_files[0].read_bytes()
+
+    for corrupt in (
+        content[: len(content) // 2],
+        content[:100],
+        b"",
+        content.replace(b'"speciestag"', b'"speciesbag"', 1),
+        bytes(len(content)),
+    ):
+        cache_files[0].write_bytes(corrupt)
+        assert cached_catalog([source]) is None
+        # the catalog gets parsed and stored again
+        assert_equal_catalogs(load_catalog([source]), index)
+        assert cached_catalog([source]) is not None
+
+
+def test_pruned(source: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    load_catalog([source])
+    cache_file: Path
+    (cache_file,) = catalog_cache.cache_dir().glob("*" + catalog_cache.CATALOG_SUFFIX)
+    # reading the catalog makes it recently used
+    stat: os.stat_result = cache_file.stat()
+    os.utime(cache_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+    assert cached_catalog([source]) is not None
+    assert cache_file.stat().st_mtime_ns > stat.st_mtime_ns - 10_000_000_000
+
+    # the catalogs count in the size of the cache
+    old_file: Path = cache_file.with_name("old" + catalog_cache.CATALOG_SUFFIX)
+    old_file.write_bytes(bytes(stat.st_size))
+    os.utime(old_file, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10_000_000_000))
+    monkeypatch.setattr(data_cache, "CACHE_SIZE_LIMIT", 3 * stat.st_size // 2)
+    cache_file.unlink()
+    load_catalog([source])
+    assert cache_file.exists()
+    assert not old_file.exists()
@@ -0,0 +1,73 @@
+from math import inf
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from psk_viewer.catalog_index import CatalogIndex
+
+
+def legacy_substances(
+    entries: list[SimpleNamespace], frequency: float, max_distance: float
+) -> list[tuple[float, str]]:
+    substances: list[tuple[float, str]] = []
+    for entry in entries:
+        lines: list[SimpleNamespace] = [
+            line
+            for line in entry.lines
+            if frequency - max_distance <= line.frequency <= frequency + max_distance
+        ]
+        if not lines:
+            continue
+        weight: float = sum(
+            (
+                (10.0**line.intensity / (line.frequency - frequency) ** 2)
+                if line.frequency != frequency
+                else inf
+            )
+            for line in lines
+        )
+        substances.append((weight, entry.name))
+    substances.sort(reverse=True, key=lambda s: s[0])
+    return substances
+
+
+def test_catalog_index() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    entries: list[SimpleNamespace] = [
+        SimpleNamespace(
+            name=str(index),
+            lines=[
+                SimpleNamespace(frequency=frequency, intensity=rng.uniform(-8.0, -2.0))
+                for frequency in np.sort(
+                    np.round(rng.uniform(1e5, 2e5, rng.integers(0, 200)), 1)
+                ).tolist()
+            ],
+        )
+        for index in range(100)
+    ]
+    index: CatalogIndex = CatalogIndex(entries)
+    assert len(index) == sum(len(entry.lines) for entry in entries)
+    frequencies: NDArray[np.float64] = np.concatenate(
+        (rng.choice(index.frequencies, 50), np.round(rng.uniform(1e5, 2e5, 50), 1))
+    )
+    all_substances: list[list[tuple[float, Any]]] = index.all_substances(
+        frequencies, 0.6
+    )
+    for frequency, substances in zip(frequencies.tolist(), all_substances, strict=True):
+        expected: list[tuple[float, str]] = legacy_substances(entries, frequency, 0.6)
+        assert substances == index.substances(frequency, 0.6)
+        assert [entry.name for _, entry in substances] == [name for _, name in expected]
+        np.testing.assert_allclose(
+            [weight for weight, _ in substances],
+            [weight for weight, _ in expected],
+            rtol=1e-12,
+        )
+        assert not any(entry.lines for _, entry in substances)
+    assert not CatalogIndex().substances(1e5, 0.6)
+    assert not index.all_substances(np.empty(0), 0.6)
+
+
+if __name__ == "__main__":
+    test_catalog_index()
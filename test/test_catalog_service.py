@@ -0,0 +1,147 @@
+import json
+import os
+import subprocess
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QEventLoop, QTimer
+from qtpy.QtWidgets import QApplication
+
+from psk_viewer import catalog_cache, catalog_service, data_cache
+from psk_viewer.catalog_index import CatalogIndex
+from psk_viewer.catalog_service import CatalogService
+
+
+def write_catalog(path: Path, tags: range) -> Path:
+    path.write_text(
+        json.dumps(
+            {
+                "catalog": {
+                    str(tag): {
+                        "speciestag": tag,
+                        "name": f"HC{tag % 100}N",
+                        "lines": [{"frequency": 1e5 + tag, "intensity": -3.0}],
+                    }
+                    for tag in tags
+                },
+                "frequency": [[1e5, 2e5]],
+            }
+        )
+    )
+    return path
+
+
+@pytest.fixture
+def service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> CatalogService:
+    pytest.importorskip("pycatsearch")
+    app: QApplication = QApplication.instance() or QApplication([])
+    # the catalogs are pruned along with the spectra
+    for module in (catalog_cache, data_cache):
+        monkeypatch.setattr(module, "cache_dir", lambda: tmp_path / "cache")
+    return CatalogService(app)
+
+
+def wait_for(service: CatalogService) -> None:
+    loop: QEventLoop = QEventLoop()
+    service.catalog_loaded.connect(loop.quit)
+    service.catalog_failed.connect(loop.quit)
+    QTimer.singleShot(10000, loop.quit)
+    loop.exec()
+
+
+def test_shared_catalog(
+    service: CatalogService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sources: list[Path] = [
+        write_catalog(tmp_path / "first.json", range(26501, 26511)),
+        write_catalog(tmp_path / "second.json", range(26511, 26521)),
+    ]
+    loads: list[Sequence[Path]] = []
+
+    def load_catalog(files: Sequence[Path]) -> CatalogIndex:
+        loads.append(files)
+        return catalog_cache.load_catalog(files)
+
+    monkeypatch.setattr(catalog_service, "load_catalog", load_catalog)
+
+    # two windows that list the same files in different order
+    catalogs: dict[str, object] = {}
+
+    def window(name: str, files: list[Path]) -> None:
+        def on_catalog_loaded(key: frozenset[Path], catalog_index: object) -> None:
+            if key == CatalogService.key(files):
+                catalogs[name] = catalog_index
+
+        service.catalog_loaded.connect(on_catalog_loaded)
+        if (catalog_index := service.catalog(files)) is not None:
+            catalogs[name] = catalog_index
+        else:
+            service.load(files)
+
+    window("first", sources)
+    window("second", sources[::-1])
+    wait_for(service)
+    assert len(loads) == 1
+    assert catalogs["first"] is catalogs["second"]
+    assert isinstance(catalogs["first"], CatalogIndex)
+    assert len(catalogs["first"].entries) == 20
+    assert len(catalogs["first"].names) == 20
+
+    # a window opened later gets the catalog at once
+    window("third", sources)
+    assert catalogs["third"] is catalogs["first"]
+    assert len(loads) == 1
+
+
+def test_failed_catalog(
+    service: CatalogService, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    source: Path = tmp_path / "catalog.tar"
+    source.write_bytes(b"\0" * 16)
+    failures: list[tuple[frozenset[Path], str]] = []
+    service.catalog_failed.connect(lambda key, error: failures.append((key, error)))
+    service.load([source])
+    wait_for(service)
+    assert len(failures) == 1
+    assert failures[0][0] == CatalogService.key([source])
+    assert failures[0][1]
+    # the window tells of the error, not the service
+    assert not capsys.readouterr().err
+    assert service.catalog([source]) is None
+
+
+def test_quit_while_loading(tmp_path: Path) -> None:
+    code: str = (
+        "import sys\n"
+        "import time\n"
+        "from qtpy.QtCore import QTimer\n"
+        "from qtpy.QtWidgets import QApplication\n"
+        "from psk_viewer import catalog_service\n"
+        "app = QApplication(sys.argv)\n"
+        "loaded = []\n"
+        "def load_catalog(files):\n"
+        "    time.sleep(1.0)\n"
+        "    loaded.append(files)\n"
+        "catalog_service.load_catalog = load_catalog\n"
+        "catalog_service.CatalogService.instance().load(sys.argv[1:])\n"
+        "QTimer.singleShot(100, app.quit)\n"
+        "app.exec()\n"
+        "assert loaded\n"
+    )
+    env: dict[str, str] = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(sys.path),
+        "QT_QPA_PLATFORM": "offscreen",
+    }
+    # the application waits for the catalog instead of aborting
+    subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path / "catalog.json")],
+        check=True,
+        env=env,
+        timeout=60,
+    )
@@ -0,0 +1,196 @@
+import os
+from pathlib import Path
+from time import time_ns
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from psk_viewer import data_cache, data_reader
+from psk_viewer.data_cache import cache_data, cached_data, clear_cache
+from psk_viewer.data_reader import DataMode, PSKData, SpectrometerData, load_data
+
+
+def write_scandat(filename: Path, points: int, seed: int = 0) -> Path:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    with open(filename, "w") as f_out:
+        f_out.write(
+            "*****\n"
+            "F(start) [MHz]:\n118000.0\n"
+            "F(stept) [MHz]:\n0.01\n"
+            "F(jump) [MHz]:\n0.6\n"
+            "U - shift:\n2.5\n"
+            "Length of Cell:\n100\n"
+            "Finish\n"
+        )
+        f_out.writelines(
+            f"{a:.6f}\t{b:.6f}\n"
+            for a, b in zip(
+                rng.normal(size=points), rng.uniform(0.5, 1.5, points), strict=True
+            )
+        )
+        f_out.write("End\n0\n")
+    return filename
+
+
+def set_mtime(filename: Path, mtime_ns: int) -> None:
+    os.utime(filename, ns=(filename.stat().st_atime_ns, mtime_ns))
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path: Path = tmp_path / "cache"
+    monkeypatch.setattr(data_cache, "cache_dir", lambda: path)
+    return path
+
+
+def test_hit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    filename: Path = write_scandat(tmp_path / "scan.scandat", 1000)
+    assert cached_data(filename) is None
+    data: SpectrometerData | None = load_data(filename)
+    assert data is not None and data.mode == DataMode.PSK_WITH_JUMP
+
+    cached: SpectrometerData | None = cached_data(filename)
+    assert cached is not None
+    assert cached.filename == filename
+    assert cached.mode == data.mode
+    for array, cached_array in zip(data[1:5], cached[1:5], strict=True):
+        np.testing.assert_array_equal(cached_array, array)
+        # the empty arrays are not mapped
+        assert not cached_array.size or not cached_array.flags.writeable
+
+    # the file is not parsed again
+    def parse(*_: object) -> PSKData:
+        raise AssertionError("the cached data are ignored")
+
+    monkeypatch.setattr(data_reader, "load_data_scandat", parse)
+    data = load_data(filename)
+    assert data is not None
+    np.testing.assert_array_equal(data.frequency, cached.frequency)
+
+
+def test_invalidation(tmp_path: Path) -> None:
+    filename: Path = write_scandat(tmp_path / "scan.scandat", 1000)
+    load_data(filename)
+    assert cached_data(filename) is not None
+
+    mtime_ns: int = filename.stat().st_mtime_ns
+    set_mtime(filename, mtime_ns + 1_000_000_000)
+    assert cached_data(filename) is None
+    load_data(filename)
+    assert cached_data(filename) is not None
+
+    # the same time, another size
+    mtime_ns = filename.stat().st_mtime_ns
+    write_scandat(filename, 1001)
+    set_mtime(filename, mtime_ns)
+    assert cached_data(filename) is None
+    data: SpectrometerData | None = load_data(filename)
+    assert data is not None and data.frequency.size == 1001
+
+    filename.unlink()
+    assert cached_data(filename) is None
+
+
+def test_invalidation_of_pairs(tmp_path: Path) -> None:
+    filename: Path = tmp_path / "scan.csv"
+    filename.write_text(
+        "".join(
+            f"{i}\t{118000.0 + i * 0.01:.2f}\t{i % 7}\t0\t1e-6\n" for i in range(100)
+        )
+    )
+    conf: Path = filename.with_suffix(".conf")
+    conf.write_text("Frequency trend\nF(jump) [MHz]: 0.6\n")
+    load_data(filename)
+    assert cached_data(filename) is not None
+    # the data of the `.csv` file depend on the `.conf` file, too
+    set_mtime(conf, conf.stat().st_mtime_ns + 1_000_000_000)
+    assert cached_data(filename) is None
+
+
+def test_corrupt_cache(tmp_path: Path, cache: Path) -> None:
+    filename: Path = write_scandat(tmp_path / "scan.scandat", 1000)
+    load_data(filename)
+    cache_files: list[Path] = list(cache.iterdir())
+    assert len(cache_files) == 1
+    content: bytes = cache_files[0].read_bytes()
+    for corrupt in (content[: len(content) // 2], content[:100], b"", bytes(100)):
+        cache_files[0].write_bytes(corrupt)
+        assert cached_data(filename) is None
+        data: SpectrometerData | None = load_data(filename)
+        assert data is not None and data.frequency.size == 1000
+
+
+def test_unknown_data_not_cached(tmp_path: Path, cache: Path) -> None:
+    cache_data(SpectrometerData(write_scandat(tmp_path / "scan.scandat", 10)))
+    assert not cache.exists() or not any(cache.iterdir())
+
+
+def test_pruning(tmp_path: Path, cache: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    filenames: list[Path] = [
+        write_scandat(tmp_path / f"scan{index}.scandat", 1000, seed=index)
+        for index in range(4)
+    ]
+    for filename in filenames[:3]:
+        load_data(filename)
+    entry_size: int = data_cache._cache_file(filenames[0]).stat().st_size
+    # room for three entries and a half
+    monkeypatch.setattr(data_cache, "CACHE_SIZE_LIMIT", 7 * entry_size // 2)
+    # the first file is used last
+    past: int = time_ns() - 10_000_000_000
+    for order, filename in enumerate((filenames[1], filenames[2], filenames[0])):
+        set_mtime(data_cache._cache_file(filename), past + order * 1_000_000_000)
+
+    # the least recently used entry goes first
+    load_data(filenames[3])
+    assert sorted(cache.iterdir()) == sorted(
+        data_cache._cache_file(filename)
+        for filename in filenames
+        if filename != filenames[1]
+    )
+
+    # reading an entry makes it recently used
+    assert cached_data(filenames[2]) is not None
+    set_mtime(data_cache._cache_file(filenames[3]), past)
+    load_data(filenames[1])
+    assert cached_data(filenames[3]) is None
+    assert all(cached_data(filename) is not None for filename in filenames[:3])
+
+    clear_cache()
+    assert not any(cache.iterdir())
+
+
+def test_catalogs_counted(
+    tmp_path: Path, cache: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    filename: Path = write_scandat(tmp_path / "scan.scandat", 1000)
+    cache.mkdir(parents=True)
+    catalogs: list[Path] = [cache / f"{index}.catalog" for index in range(2)]
+    for catalog in catalogs:
+        catalog.write_bytes(bytes(100_000))
+    past: int = time_ns() - 10_000_000_000
+    set_mtime(catalogs[0], past)
+    set_mtime(catalogs[1], past + 1_000_000_000)
+    # room for the spectrum and a catalog, but not for two catalogs
+    monkeypatch.setattr(data_cache, "CACHE_SIZE_LIMIT", 150_000)
+    load_data(filename)
+    assert sorted(cache.iterdir()) == sorted(
+        [data_cache._cache_file(filename), catalogs[1]]
+    )
+
+    clear_cache()
+    assert not any(cache.iterdir())
+
+
+def test_large_arrays_round_trip(tmp_path: Path) -> None:
+    filename: Path = write_scandat(tmp_path / "scan.scandat", 10)
+    size: int = 100_000
+    arrays: list[NDArray[np.float64]] = [
+        np.random.default_rng(index).normal(size=size) for index in range(3)
+    ]
+    cache_data(SpectrometerData(filename, *arrays, np.empty(0), DataMode.PSK_WITH_JUMP))
+    cached: SpectrometerData | None = cached_data(filename)
+    assert cached is not None
+    for array, cached_array in zip(arrays, cached[1:4], strict=True):
+        np.testing.assert_array_equal(cached_array, array)
+    assert cached.time.size == 0
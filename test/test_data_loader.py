@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QEventLoop, QTimer
+from qtpy.QtWidgets import QApplication
+
+from psk_viewer import data_cache
+from psk_viewer.data_loader import DataLoader
+from psk_viewer.data_reader import SpectrometerData, load_data
+
+
+def load(filename: Path) -> DataLoader:
+    QApplication.instance() or QApplication([])
+    loader: DataLoader = DataLoader(filename, ask_cell_length=lambda length: length)
+    assert loader.supported
+    loop: QEventLoop = QEventLoop()
+    loader.finished.connect(loop.quit)
+    QTimer.singleShot(10000, loop.quit)
+    loader.start()
+    loop.exec()
+    assert loader.wait(1000)
+    return loader
+
+
+def test_result(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(data_cache, "cache_dir", lambda: tmp_path / "cache")
+    filename: Path = tmp_path / "scan.scandat"
+    filename.write_text(
+        "*****\n"
+        "F(start) [MHz]:\n118000.0\n"
+        "F(stept) [MHz]:\n0.01\n"
+        "F(jump) [MHz]:\n0.6\n"
+        "U - shift:\n2.5\n"
+        "Length of Cell:\n100\n"
+        "Finish\n" + "".join(f"{i % 7}\t1.0\n" for i in range(100)) + "End\n0\n"
+    )
+    data: SpectrometerData | None = load(filename).result()
+    expected: SpectrometerData | None = load_data(filename)
+    assert data is not None and expected is not None
+    assert data.frequency.size == 100
+    for array, expected_array in zip(data[1:5], expected[1:5], strict=True):
+        np.testing.assert_array_equal(array, expected_array)
+
+    # the errors of reading a broken file get to the caller
+    filename = tmp_path / "broken.scandat"
+    filename.write_text("*****\n")
+    with pytest.raises(LookupError):
+        load(filename).result()
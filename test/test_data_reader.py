@@ -0,0 +1,329 @@
+from collections import deque
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from psk_viewer import data_reader
+from psk_viewer.data_reader import (
+    DataMode,
+    PSKData,
+    SpectrometerData,
+    XValues,
+    load_data_csv,
+    load_data_scandat,
+    stream_data,
+)
+
+
+def legacy_load_data_scandat(
+    filename: Path,
+) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], float]:
+    def value_after(key: str) -> float:
+        return float(
+            lines[
+                lines.index(next(filter(lambda line: line.startswith(key), lines))) + 1
+            ]
+        )
+
+    with open(filename) as f_in:
+        lines: list[str] = f_in.readlines()
+
+    if lines[0].startswith("*****"):
+        min_frequency = value_after("F(start) [MHz]:") * 1e3
+        frequency_step = value_after("F(stept) [MHz]:") * 1e3
+        frequency_jump = value_after("F(jump) [MHz]:") * 1e3
+        bias_offset = value_after("U - shift:")
+        cell_length = value_after("Length of Cell:")
+        lines = lines[
+            lines.index(next(filter(lambda line: line.startswith("Finish"), lines)))
+            + 1 : -2
+        ]
+        y = np.array([float(line.split()[0]) for line in lines]) * 1e-3
+        bias = np.array([bias_offset - float(line.split()[1]) for line in lines])
+    elif lines[0].startswith("   Spectrometer(PhSw)-2014   "):
+        min_frequency = float(lines[14]) * 1e3
+        frequency_step = float(lines[16]) * 1e3
+        frequency_jump = float(lines[2]) * 1e3
+        cell_length = float(lines[25])
+        bias_offset = float(lines[26])
+        lines = lines[32:]
+        if lines[-1] == "0":
+            lines = lines[:-2]
+        y = np.array([float(line) for line in lines[::2]]) * 1e-3
+        bias = np.array([bias_offset - float(line) for line in lines[1::2]])
+    elif lines[0].startswith("   Spectrometer(PhSw)   "):
+        min_frequency = float(lines[12]) * 1e3
+        frequency_step = float(lines[14]) * 1e3
+        frequency_jump = float(lines[2]) * 1e3
+        cell_length = float(lines[23])
+        bias_offset = float(lines[24])
+        lines = lines[30:]
+        if lines[-1].split()[-1] == "0":
+            lines = lines[:-1]
+        y = np.array([float(line.split()[0]) for line in lines]) * 1e-3
+        bias = np.array([bias_offset - float(line.split()[1]) for line in lines])
+    else:
+        min_frequency = float(lines[13]) * 1e3
+        frequency_step = float(lines[15]) * 1e3
+        frequency_jump = float(lines[2]) * 1e3
+        cell_length = float(lines[24])
+        bias_offset = float(lines[25])
+        lines = lines[31:]
+        y = np.array([float(line) for line in lines[::2]]) * 1e-3
+        bias = np.array([bias_offset - float(line) for line in lines[1::2]])
+    x = np.arange(y.size, dtype=float) * frequency_step + min_frequency
+    return x, y, y / bias / cell_length / 5.0, frequency_jump
+
+
+def legacy_load_data_csv(filename: Path) -> PSKData:
+    def time_to_seconds(s: str) -> float:
+        r: float = 0.0
+        for p in s.split(":"):
+            r = r * 60.0 + float(p)
+        return r
+
+    with open(filename.with_suffix(".conf")) as f_in:
+        lines: list[str] = f_in.readlines()
+        mode: XValues = (
+            XValues.frequency
+            if "frequency trend" in lines[0].casefold()
+            else XValues.time
+        )
+        frequency_jump: float = (
+            float(
+                next(
+                    filter(lambda line: line.startswith("F(jump) [MHz]:"), lines)
+                ).split()[-1]
+            )
+            * 1e3
+        )
+    with open(filename.with_suffix(".csv")) as f_in:
+        lines = f_in.readlines()
+    header: list[str] = lines[0].split() if not lines[0][0].isdigit() else []
+    if header:
+
+        def column(prefix: str) -> int:
+            return header.index(
+                next(filter(lambda title: title.casefold().startswith(prefix), header))
+            )
+
+        time_column = column("time")
+        frequency_column = column("frequency")
+        voltage_column = column("amplitude")
+        absorption_column = column("gamma")
+    else:
+        frequency_column = 1
+        voltage_column = 2
+        absorption_column = 4
+        time_column = -1
+    words: list[list[str]] = [
+        line.split()
+        for line in filter(lambda line: line[0].isdigit(), lines[bool(header) :])
+    ]
+    return PSKData(
+        frequency=np.array([float(line[frequency_column]) for line in words]) * 1e6,
+        voltage=np.array([float(line[voltage_column]) for line in words]) * 1e-3,
+        absorption=np.array([float(line[absorption_column]) for line in words]),
+        time=np.array([time_to_seconds(line[time_column]) for line in words]),
+        jump=frequency_jump,
+        mode=mode,
+    )
+
+
+def header_lines(count: int, values: dict[int, str]) -> list[str]:
+    return [values.get(index, f"parameter {index}") for index in range(count)]
+
+
+def write_stars(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    with open(filename, "w") as f_out:
+        f_out.write("*****\n")
+        f_out.writelines(
+            f"{key}\n{value}\n"
+            for key, value in (
+                ("F(start) [MHz]:", "118000.0"),
+                ("F(stept) [MHz]:", "0.01"),
+                ("F(jump) [MHz]:", "0.6"),
+                ("U - shift:", "2.5"),
+                ("Length of Cell:", "100"),
+            )
+        )
+        f_out.write("Finish\n")
+        f_out.writelines(f"{a:.6f}\t{b:.6f}\n" for a, b in zip(y, bias, strict=True))
+        f_out.write("End\n0\n")
+
+
+def write_2014(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    lines: list[str] = header_lines(
+        32,
+        {
+            0: "   Spectrometer(PhSw)-2014   ",
+            2: "0.6",
+            14: "118000.0",
+            16: "0.01",
+            25: "100",
+            26: "2.5",
+        },
+    )
+    for a, b in zip(y, bias, strict=True):
+        lines.extend((f"{a:.6f}", f"{b:.6f}"))
+    lines.extend(("1.0", "0"))
+    filename.write_text("\n".join(lines))
+
+
+def write_phsw(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    lines: list[str] = header_lines(
+        30,
+        {
+            0: "   Spectrometer(PhSw)   ",
+            2: "0.6",
+            12: "118000.0",
+            14: "0.01",
+            23: "100",
+            24: "2.5",
+        },
+    )
+    lines.extend(f"{a:.6f} {b:.6f}" for a, b in zip(y, bias, strict=True))
+    lines.append("1.0 0")
+    filename.write_text("\n".join(lines) + "\n")
+
+
+def write_legacy(
+    filename: Path, y: NDArray[np.float64], bias: NDArray[np.float64]
+) -> None:
+    lines: list[str] = header_lines(
+        31,
+        {
+            0: "   Spectrometer   ",
+            2: "0.6",
+            13: "118000.0",
+            15: "0.01",
+            24: "100",
+            25: "2.5",
+        },
+    )
+    for a, b in zip(y, bias, strict=True):
+        lines.extend((f"{a:.6f}", f"{b:.6f}"))
+    filename.write_text("\n".join(lines) + "\n")
+
+
+@pytest.mark.parametrize("writer", [write_stars, write_2014, write_phsw, write_legacy])
+@pytest.mark.parametrize("chunk_size", [97, 4096, data_reader.DATA_CHUNK_SIZE])
+def test_scandat(
+    writer: Callable[[Path, NDArray[np.float64], NDArray[np.float64]], None],
+    chunk_size: int,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # small blocks split the rows, and the values of a row, between them
+    monkeypatch.setattr(data_reader, "DATA_CHUNK_SIZE", chunk_size)
+    rng: np.random.Generator = np.random.default_rng(0)
+    y: NDArray[np.float64] = rng.normal(size=5000) * 100.0
+    bias: NDArray[np.float64] = rng.uniform(0.5, 1.5, size=y.size)
+    filename: Path = tmp_path / "scan.scandat"
+    writer(filename, y, bias)
+
+    expected: tuple[
+        NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], float
+    ] = legacy_load_data_scandat(filename)
+    actual: PSKData = load_data_scandat(filename)
+    assert actual.frequency.size == y.size
+    np.testing.assert_array_equal(actual.frequency, expected[0])
+    np.testing.assert_array_equal(actual.voltage, expected[1])
+    np.testing.assert_array_equal(actual.absorption, expected[2])
+    assert actual.jump == expected[3]
+
+    snapshots: Iterator[tuple[SpectrometerData, float]] | None = stream_data(
+        filename, use_cache=False
+    )
+    assert snapshots is not None
+    streamed: SpectrometerData = deque(snapshots, maxlen=1)[0][0]
+    _, f, g, v, _, data_mode = streamed
+    assert data_mode == DataMode.PSK_WITH_JUMP
+    np.testing.assert_array_equal(f, expected[0])
+    np.testing.assert_array_equal(v, expected[1])
+    np.testing.assert_array_equal(g, expected[2])
+
+
+def test_scandat_cell_length(tmp_path: Path) -> None:
+    filename: Path = tmp_path / "scan.scandat"
+    write_stars(filename, np.ones(10), np.ones(10))
+    filename.write_text(filename.read_text().replace("Cell:\n100\n", "Cell:\n0\n"))
+    with pytest.raises(ValueError, match="cell length"):
+        load_data_scandat(filename)
+    asked: list[float] = []
+
+    def ask_cell_length(cell_length: float) -> float:
+        asked.append(cell_length)
+        return 50.0
+
+    data: PSKData = load_data_scandat(filename, ask_cell_length)
+    assert asked == [0.0]
+    np.testing.assert_array_equal(
+        data.absorption, data.voltage / (2.5 - 1.0) / 50.0 / 5.0
+    )
+
+
+@pytest.mark.parametrize("with_header", [True, False])
+@pytest.mark.parametrize("trend", ["Frequency trend", "Time trend"])
+@pytest.mark.parametrize("chunk_size", [97, data_reader.DATA_CHUNK_SIZE])
+def test_csv(
+    with_header: bool,
+    trend: str,
+    chunk_size: int,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(data_reader, "DATA_CHUNK_SIZE", chunk_size)
+    rng: np.random.Generator = np.random.default_rng(0)
+    rows: int = 3000
+    seconds: NDArray[np.float64] = np.cumsum(rng.uniform(0.0, 2.0, rows)) + 3590.0
+    times: list[str] = [
+        f"{int(t // 3600):02d}:{int(t // 60 % 60):02d}:{t % 60:06.3f}" for t in seconds
+    ]
+    frequency: NDArray[np.float64] = 118000.0 + 0.01 * np.arange(rows)
+    voltage: NDArray[np.float64] = rng.normal(size=rows) * 100.0
+    other: NDArray[np.float64] = rng.normal(size=rows)
+    absorption: NDArray[np.float64] = rng.normal(size=rows) * 1e-6
+
+    filename: Path = tmp_path / "scan.csv"
+    lines: list[str] = []
+    if with_header:
+        lines.append("Time\tFrequency\tAmplitude\tBias\tGamma")
+        lines.extend(
+            f"{t}\t{f:.3f}\t{v:.6f}\t{o:.6f}\t{g:.6e}"
+            for t, f, v, o, g in zip(
+                times, frequency, voltage, other, absorption, strict=True
+            )
+        )
+    else:
+        lines.extend(
+            f"{i}\t{f:.3f}\t{v:.6f}\t{o:.6f}\t{g:.6e}\t{t}"
+            for i, t, f, v, o, g in zip(
+                range(rows), times, frequency, voltage, other, absorption, strict=True
+            )
+        )
+    # the lines that are not data get skipped
+    lines.insert(rows // 3, "--- paused ---")
+    filename.write_text("\n".join(lines) + "\n")
+    filename.with_suffix(".conf").write_text(
+        f"{trend}\nsome settings\nF(jump) [MHz]: 0.6\n"
+    )
+
+    expected: PSKData = legacy_load_data_csv(filename)
+    actual: PSKData = load_data_csv(filename)
+    assert actual.frequency.size == rows
+    np.testing.assert_array_equal(actual.frequency, expected.frequency)
+    np.testing.assert_array_equal(actual.voltage, expected.voltage)
+    np.testing.assert_array_equal(actual.absorption, expected.absorption)
+    np.testing.assert_array_equal(actual.time, expected.time)
+    assert actual.jump == expected.jump
+    assert actual.mode == expected.mode
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from psk_viewer.detection import (
+    MIN_SEGMENT_SIZE,
+    PeakSelector,
+    correlation,
+    island_maxima,
+    peaks_positions,
+    remove_spikes,
+    rolling_std,
+)
+
+
+def legacy_island_maxima(
+    data: NDArray[np.float64], islands: NDArray[np.int64]
+) -> NDArray[np.int64]:
+    return np.array(
+        [
+            i[0] + np.argmax(data[i[0] : i[1]])
+            for i in islands
+            if (np.argmax(data[i[0] : i[1]]) not in (0, i[1] - i[0]))
+        ],
+        dtype=np.int64,
+    )
+
+
+def test_island_maxima() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    for _ in range(200):
+        size: int = int(rng.integers(2, 2000))
+        data: NDArray[np.float64] = rng.normal(size=size)
+        # make ties and NaNs
+        data[rng.integers(0, size, size // 4)] = np.round(data[: size // 4])
+        data[rng.integers(0, size, size // 100)] = np.nan
+        match: NDArray[np.bool] = rng.random(size) > rng.random()
+        match = remove_spikes(match, iterations=int(rng.integers(0, 3)))
+        match[0] = match[-1] = False
+        islands: NDArray[np.int64] = np.argwhere(np.diff(match)).reshape(-1, 2)
+
+        np.testing.assert_array_equal(
+            island_maxima(data, islands), legacy_island_maxima(data, islands)
+        )
+
+
+def test_rolling_std() -> None:
+    rng: np.random.Generator = np.random.default_rng(2)
+    for size, window in (
+        (10, 0),
+        (10, 1),
+        (10, 2),
+        (10, 3),
+        (10, 10),
+        (10, 11),
+    ) + tuple(
+        (int(rng.integers(2, 5000)), int(rng.integers(2, 500))) for _ in range(50)
+    ):
+        data: NDArray[np.float64] = 1e3 + rng.normal(size=size)
+        data[rng.integers(0, size, size // 100)] = np.nan
+        expected: NDArray[np.float64] = (
+            pd.Series(data).rolling(window, center=True).std().to_numpy()
+        )
+        for compensated in (False, True):
+            np.testing.assert_allclose(
+                rolling_std(data, window, compensated=compensated),
+                expected,
+                rtol=1e-9,
+            )
+
+
+def test_peaks_positions() -> None:
+    rng: np.random.Generator = np.random.default_rng(1)
+    x: NDArray[np.float64] = np.arange(100_000) * 10e3
+    y: NDArray[np.float64] = rng.normal(size=x.size)
+    for center in rng.uniform(x[0], x[-1], 30):
+        y += rng.uniform(1.0, 10.0) * np.exp(-(((x - center) / 1e6) ** 2))
+    for threshold in (1.0, 0.1, 0.0046228, 1e-4):
+        peaks: NDArray[np.int64] = peaks_positions(x, y, threshold=threshold)
+        assert peaks.dtype == np.int64
+        assert np.all(np.diff(peaks) > 0)
+        assert np.all(y[peaks] >= y[peaks - 1])
+
+
+def test_segmented_detection() -> None:
+    rng: np.random.Generator = np.random.default_rng(3)
+    x: NDArray[np.float64] = np.arange(4 * MIN_SEGMENT_SIZE + 123) * 10e3
+    y: NDArray[np.float64] = rng.normal(size=x.size)
+    for center in rng.uniform(x[0], x[-1], 30):
+        y += rng.uniform(1.0, 10.0) * np.exp(-(((x - center) / 1e6) ** 2))
+    model_y: NDArray[np.float64] = np.sin(np.linspace(0.0, 6.0, 2000)) * np.hanning(
+        2000
+    )
+    serial_correlation: NDArray[np.float64] = correlation(model_y, x, y)
+    np.testing.assert_array_equal(
+        correlation(model_y, x, y, workers=3), serial_correlation
+    )
+    for data in (y, serial_correlation):
+        serial: PeakSelector = PeakSelector(x, data)
+        segmented: PeakSelector = PeakSelector(x, data, workers=4)
+        for threshold in (1.0, 0.1, 0.0046228, 1e-4):
+            np.testing.assert_array_equal(
+                segmented.select(threshold), serial.select(threshold)
+            )
+        assert serial.select().size
+    y[rng.integers(0, x.size, 10)] = np.nan
+    for compensated in (False, True):
+        np.testing.assert_array_equal(
+            rolling_std(y, 260, compensated=compensated, workers=4),
+            rolling_std(y, 260, compensated=compensated),
+        )
+
+
+def test_segmented_rolling_std() -> None:
+    rng: np.random.Generator = np.random.default_rng(4)
+    data: NDArray[np.float64] = 1e3 + rng.normal(size=2 * MIN_SEGMENT_SIZE + 77)
+    data[rng.integers(0, data.size, 100)] = np.nan
+    np.testing.assert_allclose(
+        rolling_std(data, 1001, workers=2),
+        pd.Series(data).rolling(1001, center=True).std().to_numpy(),
+        rtol=1e-9,
+    )
+
+
+if __name__ == "__main__":
+    test_island_maxima()
+    test_rolling_std()
+    test_peaks_positions()
+    test_segmented_detection()
+    test_segmented_rolling_std()
@@ -0,0 +1,56 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QEventLoop, QSettings, QTimer
+from qtpy.QtWidgets import QApplication
+
+from psk_viewer.plot_data_item import PlotDataItem
+from psk_viewer.settings import Settings
+from psk_viewer.utils import DataMode
+from psk_viewer.window.gui.find_lines_box import THRESHOLD_DELAY, FindLinesBox
+
+
+def test_threshold_debounced(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    app: QApplication = QApplication.instance() or QApplication([])
+    QSettings.setPath(
+        QSettings.Format.NativeFormat, QSettings.Scope.UserScope, str(tmp_path)
+    )
+    box: FindLinesBox = FindLinesBox(Settings("test", "test", app))
+    box.setup_ui_actions()
+    box.load_config()
+    if not box.model_signal.size:
+        pytest.skip("no model signal")
+    rng: np.random.Generator = np.random.default_rng(0)
+    f: np.ndarray = 118e9 + np.arange(10000) * 1e4
+    box.set_data_type(PlotDataItem.VOLTAGE_DATA)
+    box.set_spectrum(f, rng.normal(size=f.size), None, DataMode.PSK_WITH_JUMP)
+    box.on_button_find_lines_clicked()
+
+    searches: list[int] = []
+    find_lines = box.find_lines
+
+    def counted_find_lines() -> np.ndarray:
+        searches.append(1)
+        return find_lines()
+
+    monkeypatch.setattr(box, "find_lines", counted_find_lines)
+    # dragging the threshold looks for the lines once it stops
+    for threshold in range(2, 12):
+        box.spin_threshold.setValue(float(threshold))
+    assert not searches
+    loop: QEventLoop = QEventLoop()
+    QTimer.singleShot(THRESHOLD_DELAY * 2, loop.quit)
+    loop.exec()
+    assert len(searches) == 1
+
+    # no search is left pending for another spectrum
+    box.spin_threshold.setValue(3.0)
+    box.set_spectrum(f, rng.normal(size=f.size), None, DataMode.PSK_WITH_JUMP)
+    QTimer.singleShot(THRESHOLD_DELAY * 2, loop.quit)
+    loop.exec()
+    assert len(searches) == 1
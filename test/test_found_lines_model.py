@@ -0,0 +1,123 @@
+import os
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+from numpy.typing import NDArray
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QEvent, QEventLoop, QModelIndex, QTimer, Qt
+from qtpy.QtWidgets import QApplication
+
+from psk_viewer.catalog_annotator import CatalogAnnotator
+from psk_viewer.catalog_index import CatalogIndex
+from psk_viewer.widgets.found_lines_model import FoundLinesModel
+
+
+def test_annotation() -> None:
+    app: QApplication = QApplication.instance() or QApplication([])
+    rng: np.random.Generator = np.random.default_rng(0)
+    entries: list[SimpleNamespace] = [
+        SimpleNamespace(
+            name=str(index),
+            lines=[
+                SimpleNamespace(frequency=frequency, intensity=rng.uniform(-8.0, -2.0))
+                for frequency in np.sort(
+                    np.round(rng.uniform(1e5, 1.01e5, rng.integers(1, 50)), 1)
+                ).tolist()
+            ],
+        )
+        for index in range(100)
+    ]
+    catalog_index: CatalogIndex = CatalogIndex(entries)
+    catalog_index.names = [entry.name for entry in catalog_index.entries]
+    # the lines of the catalog and a few off them, in MHz
+    frequencies: NDArray[np.float64] = np.concatenate(
+        (
+            rng.choice(catalog_index.frequencies, 150),
+            np.round(rng.uniform(1e5, 1.01e5, 50), 1),
+        )
+    )
+
+    model: FoundLinesModel = FoundLinesModel()
+    model.catalog_index = catalog_index
+    model.set_data(
+        np.column_stack((frequencies * 1e6, rng.normal(size=(frequencies.size, 2))))
+    )
+    column: int = model.data_column_count
+    rows: range = range(model.rowCount())
+    assert rows
+
+    # the view asks for these all the time, and they do not need the catalog
+    for row in rows:
+        assert model.data(model.index(row, column), Qt.ItemDataRole.FontRole) is None
+    assert not model._annotator.isRunning()
+
+    annotated_rows: set[int] = set()
+    annotator_threads: set[threading.Thread] = set()
+    loop: QEventLoop = QEventLoop()
+
+    def on_data_changed(top_left: QModelIndex, bottom_right: QModelIndex) -> None:
+        annotator_threads.add(threading.current_thread())
+        annotated_rows.update(range(top_left.row(), bottom_right.row() + 1))
+        if annotated_rows.issuperset(rows):
+            loop.quit()
+
+    model.dataChanged.connect(on_data_changed)
+    for row in rows:
+        assert model.data(model.index(row, column)) == FoundLinesModel.PLACEHOLDER
+    QTimer.singleShot(5000, loop.quit)
+    loop.exec()
+    assert annotated_rows.issuperset(rows)
+    # the matches are stored in the thread of the model
+    assert annotator_threads == {threading.main_thread()}
+
+    for row in rows:
+        substances: list[tuple[float, object]] = catalog_index.substances(
+            frequencies[row], model.df * 1e-6
+        )
+        if substances:
+            assert model.data(model.index(row, column)) == substances[0][1].name
+        assert model.data(model.index(row, column), Qt.ItemDataRole.BackgroundRole) == [
+            (entry.name, entry) for _, entry in substances
+        ]
+
+    # deleting the model stops the thread along with it
+    annotator: CatalogAnnotator = model._annotator
+    assert annotator.isRunning()
+    stopped: list[bool] = []
+    annotator.finished.connect(
+        lambda: stopped.append(True), Qt.ConnectionType.DirectConnection
+    )
+    model.deleteLater()
+    del model
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    assert stopped
+
+
+def test_remove_line() -> None:
+    QApplication.instance() or QApplication([])
+    rng: np.random.Generator = np.random.default_rng(1)
+    frequencies: NDArray[np.float64] = rng.integers(0, 30, 100).astype(float) * 1e6
+    model: FoundLinesModel = FoundLinesModel()
+    model.set_data(
+        np.column_stack((frequencies, rng.normal(size=(frequencies.size, 2))))
+    )
+    removed: list[frozenset[float]] = []
+    model.frequencies_removed.connect(removed.append)
+
+    for frequency in rng.permutation(np.unique(frequencies))[:20]:
+        # look the rows up between the removals
+        model.nearest_rows(frequencies[:5])
+        model.remove_line(frequency)
+        frequencies = frequencies[frequencies != frequency]
+        assert np.array_equal(model.all_data(0), frequencies)
+        # the order of the rows kept through the removals is that of the rows left
+        sorted_frequencies: NDArray[np.float64] = np.sort(frequencies)
+        assert np.array_equal(
+            frequencies[model.nearest_rows(sorted_frequencies)], sorted_frequencies
+        )
+    assert set().union(*removed).isdisjoint(frequencies)
+    model.remove_line(-1.0)
+    assert np.array_equal(model.all_data(0), frequencies)
@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QSettings
+from qtpy.QtWidgets import QApplication
+
+from psk_viewer.utils import DataMode, SpectrometerData
+from psk_viewer.window.frequency_domain_window import FrequencyDomainWindow
+
+
+def spectrum(filename: Path, seed: int) -> SpectrometerData:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    f: np.ndarray = 118e9 + np.arange(10000) * 1e4
+    return SpectrometerData(
+        filename,
+        f,
+        rng.normal(size=f.size),
+        rng.normal(size=f.size),
+        np.empty(0),
+        DataMode.PSK_WITH_JUMP,
+    )
+
+
+def test_lines_looked_for_in_displayed_data(tmp_path: Path) -> None:
+    app: QApplication = QApplication.instance() or QApplication([])
+    QSettings.setPath(
+        QSettings.Format.NativeFormat, QSettings.Scope.UserScope, str(tmp_path)
+    )
+    window: FrequencyDomainWindow = FrequencyDomainWindow()
+    try:
+        # the second file leaves the jump as it is
+        for seed in range(2):
+            assert window.set_data(spectrum(tmp_path / f"scan{seed}.scandat", seed))
+            assert not np.isnan(window._plot_data.jump)
+            np.testing.assert_array_equal(
+                window.box_find_lines.v, window._plot_data.voltage_data
+            )
+            np.testing.assert_array_equal(
+                window.box_find_lines.f, window._plot_data.frequency_data
+            )
+    finally:
+        window.deleteLater()
+        app.processEvents()
@@ -0,0 +1,57 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from psk_viewer.marked_lines import MarkedLines
+
+
+def test_marked_lines() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    marked_lines: MarkedLines = MarkedLines(rng.integers(0, 100, 20).astype(float))
+    expected: set[float] = set(marked_lines.frequencies.tolist())
+    assert len(marked_lines) == len(expected)
+    for _ in range(500):
+        frequencies: NDArray[np.float64] = rng.integers(0, 100, 10).astype(float)
+        match int(rng.integers(0, 5)):
+            case 0:
+                assert marked_lines.add(frequencies[0]) == (
+                    frequencies[0] not in expected
+                )
+                expected.add(frequencies[0])
+            case 1:
+                assert marked_lines.remove(frequencies[0]) == (
+                    frequencies[0] in expected
+                )
+                expected.discard(frequencies[0])
+            case 2:
+                assert marked_lines.update(frequencies).tolist() == sorted(
+                    set(frequencies) - expected
+                )
+                expected.update(frequencies)
+            case 3:
+                assert marked_lines.difference_update(
+                    frozenset(frequencies)
+                ).tolist() == sorted(set(frequencies) & expected)
+                expected.difference_update(frequencies)
+            case 4:
+                assert (frequencies[0] in marked_lines) == (frequencies[0] in expected)
+        assert marked_lines.frequencies.tolist() == sorted(expected)
+    marked_lines.clear()
+    assert not marked_lines
+    assert not marked_lines.update([]).size
+    assert not marked_lines.difference_update([1.0]).size
+
+
+def test_frequencies_kept() -> None:
+    marked_lines: MarkedLines = MarkedLines([1.0, 2.0, 3.0])
+    frequencies: NDArray[np.float64] = marked_lines.frequencies
+    # the changes do not affect the frequencies got before
+    marked_lines.remove(1.0)
+    marked_lines.add(0.5)
+    marked_lines.update([4.0, 5.0])
+    assert frequencies.tolist() == [1.0, 2.0, 3.0]
+    assert marked_lines.frequencies.tolist() == [0.5, 2.0, 3.0, 4.0, 5.0]
+
+
+if __name__ == "__main__":
+    test_marked_lines()
+    test_frequencies_kept()
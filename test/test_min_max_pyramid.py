@@ -0,0 +1,73 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from psk_viewer.min_max_pyramid import MinMaxPyramid
+
+
+def brute_force_extremes(
+    y: NDArray[np.float64], start: int, stop: int, width: int
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    bins: NDArray[np.float64] = y[start:stop].reshape(-1, width)
+    return bins.min(axis=1), bins.max(axis=1)
+
+
+def test_visible_data() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    size: int = MinMaxPyramid.FACTOR**8
+    x: NDArray[np.float64] = np.arange(size, dtype=np.float64)
+    y: NDArray[np.float64] = rng.normal(size=size)
+    # narrow peaks that must not be lost at any zoom
+    y[rng.choice(size, 20, replace=False)] = rng.choice([-1.0, 1.0], 20) * 100.0
+    pyramid: MinMaxPyramid = MinMaxPyramid(x, y)
+    assert len(pyramid) == size
+
+    pixel: int
+    for pixel in (MinMaxPyramid.FACTOR**2, MinMaxPyramid.FACTOR**4):
+        for first_pixel, pixels in ((0, size // pixel), (3, 40)):
+            start: int = first_pixel * pixel
+            stop: int = start + pixels * pixel
+            visible_x: NDArray[np.float64]
+            visible_y: NDArray[np.float64]
+            visible_x, visible_y = pyramid.visible_data(x[start], x[stop - 1], pixels)
+            assert visible_x.size <= 2 * MinMaxPyramid.FACTOR * (pixels + 1) + 4
+            # every pixel displays the lowest and the highest points in it
+            in_view: NDArray[np.bool_] = (x[start] <= visible_x) & (
+                visible_x <= x[stop - 1]
+            )
+            pixel_of_point: NDArray[np.intp] = (
+                visible_x[in_view].astype(np.intp) - start
+            ) // pixel
+            lowest: NDArray[np.float64] = np.full(pixels, np.inf)
+            highest: NDArray[np.float64] = np.full(pixels, -np.inf)
+            np.minimum.at(lowest, pixel_of_point, visible_y[in_view])
+            np.maximum.at(highest, pixel_of_point, visible_y[in_view])
+            expected_lowest: NDArray[np.float64]
+            expected_highest: NDArray[np.float64]
+            expected_lowest, expected_highest = brute_force_extremes(
+                y, start, stop, pixel
+            )
+            assert np.array_equal(lowest, expected_lowest)
+            assert np.array_equal(highest, expected_highest)
+            # the bounds of the whole curve are kept for the view to fit them
+            assert visible_x[0] == x[0] and visible_x[-1] == x[-1]
+            assert visible_y.min() == y.min() and visible_y.max() == y.max()
+
+    # too few points to reduce
+    visible_x, visible_y = pyramid.visible_data(x[10], x[20], 100)
+    assert np.array_equal(visible_x[(visible_x >= 10) & (visible_x <= 20)], x[10:21])
+
+
+def test_missing_data() -> None:
+    x: NDArray[np.float64] = np.arange(1000, dtype=np.float64)
+    y: NDArray[np.float64] = np.sin(x)
+    y[::7] = np.nan
+    visible_y: NDArray[np.float64] = MinMaxPyramid(x, y).visible_data(0.0, 50.0, 5)[1]
+    assert np.nanmin(visible_y) == np.nanmin(y)
+    assert np.nanmax(visible_y) == np.nanmax(y)
+
+    y = np.full_like(x, np.nan)
+    visible_x: NDArray[np.float64] = MinMaxPyramid(x, y).visible_data(0.0, 50.0, 5)[0]
+    assert visible_x[0] == x[0] and visible_x[-1] == x[-1]
+    assert (
+        MinMaxPyramid(np.empty(0), np.empty(0)).visible_data(0.0, 1.0, 5)[0].size == 0
+    )
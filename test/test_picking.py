@@ -0,0 +1,40 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from psk_viewer.picking import nearest_indices, nearest_point
+
+
+def test_nearest_indices() -> None:
+    rng: np.random.Generator = np.random.default_rng(0)
+    for _ in range(200):
+        sorted_values: NDArray[np.float64] = np.sort(
+            rng.integers(0, 50, rng.integers(1, 20))
+        ).astype(np.float64)
+        values: NDArray[np.float64] = rng.integers(-5, 55, 30).astype(np.float64)
+        np.testing.assert_array_equal(
+            nearest_indices(sorted_values, values),
+            [np.argmin(np.abs(sorted_values - value)) for value in values],
+        )
+
+
+def test_nearest_point() -> None:
+    rng: np.random.Generator = np.random.default_rng(1)
+    x: NDArray[np.float64] = np.arange(1000.0)
+    y: NDArray[np.float64] = rng.normal(size=x.size)
+    y[500] = np.nan
+    for point_x, point_y in zip(
+        rng.uniform(0.0, 1000.0, 200), rng.normal(size=200), strict=True
+    ):
+        distance: NDArray[np.float64] = np.hypot(
+            (x - point_x) / 1000.0, (y - point_y) / 5.0
+        )
+        distance[np.isnan(distance)] = np.inf
+        closest: int = int(np.argmin(distance))
+        assert nearest_point(x, y, point_x, point_y, 1000.0, 5.0, 0.01) == (
+            closest if distance[closest] <= 0.01 else None
+        )
+
+
+if __name__ == "__main__":
+    test_nearest_indices()
+    test_nearest_point()
@@ -0,0 +1,131 @@
+import os
+import subprocess
+import sys
+import threading
+from collections.abc import Iterator
+from time import sleep
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qtpy.QtCore import QTimer
+from qtpy.QtWidgets import QApplication, QWidget
+
+from psk_viewer.widgets import waiting_screen
+from psk_viewer.widgets.waiting_screen import WaitingScreen
+
+
+@pytest.fixture(scope="module")
+def window() -> Iterator[QWidget]:
+    app: QApplication = QApplication.instance() or QApplication([])
+    w: QWidget = QWidget()
+    w.show()
+    yield w
+    w.close()
+    app.processEvents()
+
+
+def test_result(window: QWidget) -> None:
+    ws: WaitingScreen[int] = WaitingScreen(
+        window, label="", target=divmod, args=(7,), kwargs={"b": 2}
+    )
+    with pytest.raises(TypeError):
+        # `divmod` takes no keywords
+        ws.exec()
+    ws = WaitingScreen(window, label="", target=divmod, args=(7, 2))
+    assert ws.exec() == (3, 1)
+    assert not ws.is_cancelled()
+
+
+def test_error(window: QWidget) -> None:
+    def fail() -> None:
+        raise ValueError("failed")
+
+    ws: WaitingScreen[None] = WaitingScreen(window, label="", target=fail)
+    with pytest.raises(ValueError, match="failed"):
+        ws.exec()
+
+
+def test_generator_cancelled(window: QWidget) -> None:
+    yielded: threading.Event = threading.Event()
+    closed: threading.Event = threading.Event()
+    resumed: list[int] = []
+
+    def count() -> Iterator[tuple[int, float]]:
+        try:
+            for i in range(1000):
+                resumed.append(i)
+                yield i, i / 1000
+                yielded.set()
+                sleep(0.001)
+        finally:
+            closed.set()
+
+    ws: WaitingScreen[int] = WaitingScreen(window, label="", target=count)
+
+    def cancel() -> None:
+        if yielded.is_set():
+            ws.stop()
+        else:
+            QTimer.singleShot(1, cancel)
+
+    QTimer.singleShot(0, cancel)
+    assert ws.exec() is None
+    assert ws.is_cancelled()
+    # the generator stops at the next `yield`, long before the end
+    assert closed.wait(5.0)
+    assert len(resumed) < 1000
+
+
+def test_abandoned_threads_capped(window: QWidget) -> None:
+    release: threading.Event = threading.Event()
+    running: list[int] = []
+    lock: threading.Lock = threading.Lock()
+    most_running: list[int] = [0]
+
+    def block() -> None:
+        with lock:
+            running.append(0)
+            most_running[0] = max(most_running[0], len(running))
+        release.wait(5.0)
+        with lock:
+            running.pop()
+
+    for _ in range(waiting_screen.MAX_ABANDONED_THREADS + 2):
+        ws: WaitingScreen[None] = WaitingScreen(window, label="", target=block)
+        QTimer.singleShot(10, ws.stop)
+        assert ws.exec() is None
+    # the cancelled functions still run, but no more of them than allowed
+    assert most_running[0] <= waiting_screen.MAX_ABANDONED_THREADS
+
+    release.set()
+    ws = WaitingScreen(window, label="", target=len, args=("abc",))
+    assert ws.exec() == 3
+
+
+def test_quit_while_abandoned() -> None:
+    code: str = (
+        "import sys\n"
+        "import time\n"
+        "from qtpy.QtCore import QTimer\n"
+        "from qtpy.QtWidgets import QApplication, QWidget\n"
+        "from psk_viewer.widgets.waiting_screen import WaitingScreen\n"
+        "app = QApplication(sys.argv)\n"
+        "window = QWidget()\n"
+        "window.show()\n"
+        "def cancel_and_quit():\n"
+        "    ws = WaitingScreen(window, label='', target=time.sleep, args=(1.0,))\n"
+        "    QTimer.singleShot(50, ws.stop)\n"
+        "    assert ws.exec() is None\n"
+        "    app.quit()\n"
+        "QTimer.singleShot(0, cancel_and_quit)\n"
+        "app.exec()\n"
+    )
+    env: dict[str, str] = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(sys.path),
+        "QT_QPA_PLATFORM": "offscreen",
+    }
+    # the application waits for the cancelled function instead of aborting
+    subprocess.run([sys.executable, "-c", code], check=True, env=env, timeout=60)